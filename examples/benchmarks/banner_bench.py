@@ -0,0 +1,76 @@
+"""Micro-benchmark: BannerGrabber vs. one-port-at-a-time banner reads.
+
+A local server sends an SSH-style banner 50 ms after each connection, like
+a remote service one network round trip away. The sequential grabber waits
+out every delay in turn; BannerGrabber keeps up to 1000 connections open.
+
+Run from the repository root:
+
+    python examples/benchmarks/banner_bench.py
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+from netengine.networking import BannerGrabber
+from netengine.utils import Logger, LogLevel
+
+DELAY = 0.05
+BANNER = b"SSH-2.0-OpenSSH_9.6\r\n"
+
+
+def start_server() -> int:
+    """Run the delayed-banner server on its own loop; return its port."""
+    started = threading.Event()
+    ports = []
+
+    async def speak(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await asyncio.sleep(DELAY)
+        writer.write(BANNER)
+        await writer.drain()
+        # Stay open like a real service; the client hangs up.
+        await reader.read()
+        writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(speak, "127.0.0.1", 0, backlog=4096)
+        ports.append(server.sockets[0].getsockname()[1])
+        started.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    started.wait()
+    return ports[0]
+
+
+def sequential(port: int, count: int) -> float:
+    """The old extension's approach: connect, recv, close, next port."""
+    start = time.perf_counter()
+    for _ in range(count):
+        sock = socket.create_connection(("127.0.0.1", port), timeout=2.0)
+        sock.settimeout(1.0)
+        assert sock.recv(1024) == BANNER
+        sock.close()
+    return count / (time.perf_counter() - start)
+
+
+def concurrent(port: int, count: int) -> float:
+    grabber = BannerGrabber(concurrency=1000)
+    start = time.perf_counter()
+    grabbed = sum(result.banner == BANNER for result in grabber.grab([("127.0.0.1", port)] * count))
+    rate = count / (time.perf_counter() - start)
+    assert grabbed == count, grabbed
+    return rate
+
+
+def main():
+    Logger.set_level(LogLevel.WARNING)
+    port = start_server()
+    print(f"sequential:    {sequential(port, 100):8.0f} banners/s")
+    print(f"BannerGrabber: {concurrent(port, 20000):8.0f} banners/s")
+
+
+if __name__ == "__main__":
+    main()
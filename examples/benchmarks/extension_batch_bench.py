@@ -0,0 +1,75 @@
+"""Micro-benchmark: execute_extension() vs. execute_extension_batch().
+
+A synthetic extension spends a fixed latency per target, the way a
+connect or a DNS query does. It loops over its targets like the example
+extensions, so execute_extension() is sequential; execute_extension_batch()
+fans the same list out over the engine's threads, and over an event loop
+for the variant that implements execute_async().
+
+Run from the repository root:
+
+    python examples/benchmarks/extension_batch_bench.py
+"""
+
+import asyncio
+import time
+
+from netengine.core import Config, NetworkEngine
+from netengine.extensions import BaseExtension
+from netengine.utils import Logger, LogLevel
+
+TARGETS = 400
+LATENCY = 0.01
+
+
+class LatencyExtension(BaseExtension):
+    """Waits LATENCY per target and reports it as up."""
+
+    max_concurrency = 100
+
+    def __init__(self):
+        super().__init__("Latency", "1.0.0")
+
+    def execute(self, targets: list, label: str = "up") -> dict:
+        results = {}
+        for target in targets:
+            time.sleep(LATENCY)
+            results[target] = label
+        return results
+
+
+class AsyncLatencyExtension(LatencyExtension):
+    """Same, with a native coroutine."""
+
+    max_concurrency = 400
+
+    async def execute_async(self, targets: list, label: str = "up") -> dict:
+        await asyncio.sleep(LATENCY * len(targets))
+        return {target: label for target in targets}
+
+
+def timed(label: str, func, *args) -> dict:
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    print(f"  {label:<28} {seconds:7.2f} s  {len(result) / seconds:8.0f} targets/s")
+    return result
+
+
+def main():
+    Logger.set_level(LogLevel.WARNING)
+    targets = [f"10.0.{n // 256}.{n % 256}" for n in range(TARGETS)]
+    with NetworkEngine(Config(max_threads=20)) as engine:
+        engine.extensions["latency"] = LatencyExtension()
+        engine.extensions["async"] = AsyncLatencyExtension()
+        print(f"{TARGETS} targets, {LATENCY * 1000:.0f} ms each:")
+        expected = timed("execute_extension", engine.execute_extension, "latency", targets)
+        batched = timed("batch (100 threads)", engine.execute_extension_batch, "latency", targets)
+        engine.config.extension_concurrency["latency"] = 20
+        timed("batch (20 threads)", engine.execute_extension_batch, "latency", targets)
+        coroutines = timed("batch (execute_async)", engine.execute_extension_batch, "async", targets)
+        assert list(batched.items()) == list(expected.items()) == list(coroutines.items())
+
+
+if __name__ == "__main__":
+    main()
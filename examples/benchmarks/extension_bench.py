@@ -0,0 +1,97 @@
+"""Micro-benchmark: eager extension loading vs. lazy discovery.
+
+Generates a directory of synthetic extensions and times, each in a fresh
+interpreter, how long it takes until one extension has run:
+
+- eager: ExtensionLoader.load() every file, as load_extension() used to
+- cold: discover() with no manifest (every file parsed), then require one
+- warm: discover() from the manifest written by the cold run, then require one
+
+Run from the repository root:
+
+    python examples/benchmarks/extension_bench.py [count]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+TEMPLATE = '''"""Synthetic extension {index}."""
+
+import json
+import re
+from netengine.extensions.base import BaseExtension
+
+PATTERN = re.compile(r"[a-z]+{index}")
+TABLE = {{n: n * n for n in range(2000)}}
+
+
+class Synthetic{index}Extension(BaseExtension):
+    """Synthetic extension {index}."""
+
+    def __init__(self):
+        """Initialize extension."""
+        super().__init__("Synthetic{index}", "1.{index}.0")
+
+    def execute(self, text=""):
+        """Count pattern matches."""
+        return json.dumps({{"matches": len(PATTERN.findall(text))}})
+'''
+
+RUN = """
+import os, sys, time
+start = time.perf_counter()
+from netengine.extensions import ExtensionLoader
+from netengine.utils import Logger, LogLevel
+Logger.set_level(LogLevel.WARNING)
+mode, directory, manifest = sys.argv[1:4]
+loader = ExtensionLoader(paths=[directory], manifest_path=manifest)
+if mode == "eager":
+    for entry in sorted(os.listdir(directory)):
+        if entry.endswith(".py"):
+            loader.load(entry[:-3], os.path.join(directory, entry))
+    count = len(loader.loaded)
+else:
+    count = len(loader.discover())
+loader.require("ext_00").execute("abc00 def00")
+print(count, (time.perf_counter() - start) * 1000)
+"""
+
+
+def run(mode: str, directory: str, manifest: str) -> str:
+    """Time one mode in a fresh interpreter (best of 5)."""
+    best = None
+    for _ in range(5):
+        if mode == "cold" and os.path.exists(manifest):
+            os.remove(manifest)
+        out = subprocess.run(
+            [sys.executable, "-c", RUN, mode, directory, manifest],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=os.getcwd()),
+        ).stdout.split()
+        count, ms = int(out[0]), float(out[1])
+        best = ms if best is None else min(best, ms)
+    return f"  {mode:<6} {best:8.1f} ms  ({count} extensions indexed or loaded)"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+    with tempfile.TemporaryDirectory() as root:
+        directory = os.path.join(root, "extensions")
+        os.mkdir(directory)
+        for index in range(count):
+            with open(os.path.join(directory, f"ext_{index:02d}.py"), "w") as f:
+                f.write(TEMPLATE.format(index=index))
+        manifest = os.path.join(root, "extensions.json")
+        # Compile once so every mode starts with __pycache__ populated.
+        run("eager", directory, manifest)
+        print(f"time to first execute with {count} extensions:")
+        for mode in ("eager", "cold", "warm"):
+            print(run(mode, directory, manifest))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Micro-benchmark: streaming HTTPResponseParser over a socketpair.
+
+Streams large Content-Length and chunked responses through
+HTTPResponseParser.stream() and reports throughput and the process's peak
+memory, which stays flat however large the body is. ResponseParser's
+whole-response parse_http() is timed on a smaller body for comparison.
+
+Run from the repository root (POSIX, for the peak-memory figure):
+
+    python examples/benchmarks/http_parser_bench.py
+"""
+
+import resource
+import socket
+import threading
+import time
+
+from netengine.utils import Logger, LogLevel
+from netengine.web import HTTPResponseParser, ResponseParser
+
+STREAM_BYTES = 1024 * 1024 * 1024
+BLOCK = b"x" * 65536
+
+
+def peak_mib() -> float:
+    """Peak resident memory of this process so far (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def serve_length(sock: socket.socket):
+    sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % STREAM_BYTES)
+    for _ in range(STREAM_BYTES // len(BLOCK)):
+        sock.sendall(BLOCK)
+
+
+def serve_chunked(sock: socket.socket):
+    sock.sendall(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+    chunk = b"%x\r\n" % len(BLOCK) + BLOCK + b"\r\n"
+    for _ in range(STREAM_BYTES // len(BLOCK)):
+        sock.sendall(chunk)
+    sock.sendall(b"0\r\n\r\n")
+
+
+def stream(server) -> None:
+    """Parse one streamed response and print its rate."""
+    left, right = socket.socketpair()
+    writer = threading.Thread(target=server, args=(left,))
+    writer.start()
+    parser = HTTPResponseParser()
+    start = time.perf_counter()
+    received = 0
+    for chunk in parser.stream(right):
+        received += len(chunk)
+    seconds = time.perf_counter() - start
+    writer.join()
+    left.close()
+    right.close()
+    assert parser.complete and received == STREAM_BYTES
+    print(
+        f"  {server.__name__:<14} {received / 2**20 / seconds:8.0f} MiB/s"
+        f"  (peak RSS {peak_mib():.0f} MiB for a {STREAM_BYTES / 2**20:.0f} MiB body)"
+    )
+
+
+def whole_response():
+    """parse_http() on a 64 MiB response held in memory."""
+    body = b"x" * (64 * 1024 * 1024)
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+    text = response.decode("latin-1")
+    parser = ResponseParser()
+    for label, data in (("bytes", response), ("str", text)):
+        start = time.perf_counter()
+        parser.parse_http(data)
+        seconds = time.perf_counter() - start
+        print(f"  parse_http({label}) {len(body) / 2**20 / seconds:8.0f} MiB/s")
+
+
+def main():
+    Logger.set_level(LogLevel.WARNING)
+    print("streaming:")
+    stream(serve_length)
+    stream(serve_chunked)
+    print("whole response:")
+    whole_response()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark: staged batch runs vs. a streaming Pipeline.
+
+Four stages with simulated per-item latency (a resolve, a ping, a
+fan-out port scan and a banner grab) process the same input twice:
+
+- staged: each stage maps over the complete output of the previous one
+  on its own thread pool, like separate CLI runs with lists in between
+- pipeline: the same stages and worker counts connected by bounded queues
+
+Reported: total time, time to the first final result, and the most items
+ever waiting in any queue.
+
+Run from the repository root:
+
+    python examples/benchmarks/pipeline_bench.py
+"""
+
+import time
+
+from netengine.core import Pipeline, ThreadManager
+from netengine.utils import Logger, LogLevel
+
+HOSTS = 500
+
+
+def resolve(host):
+    time.sleep(0.004)
+    return host
+
+
+def ping(host):
+    time.sleep(0.008)
+    return host if host % 4 else None
+
+
+def scan(host):
+    time.sleep(0.01)
+    return [(host, port) for port in (22, 80, 443)]
+
+
+def grab(target):
+    time.sleep(0.006)
+    return f"{target[0]}:{target[1]} banner"
+
+
+STAGES = [("resolve", resolve, 8, False), ("ping", ping, 16, False), ("scan", scan, 16, True), ("banner", grab, 24, False)]
+
+
+def staged():
+    start = time.perf_counter()
+    items = list(range(HOSTS))
+    for _, func, workers, fanout in STAGES:
+        with ThreadManager(workers) as manager:
+            results = manager.map_tasks(func, items)
+        items = [value for result in results if result is not None for value in (result if fanout else [result])]
+    seconds = time.perf_counter() - start
+    return len(items), seconds, seconds, len(items)
+
+
+def pipelined():
+    pipeline = Pipeline(queue_size=64)
+    for name, func, workers, fanout in STAGES:
+        pipeline.add(name, func, workers=workers, fanout=fanout)
+    deepest = 0
+
+    def watch(stats):
+        nonlocal deepest
+        deepest = max([deepest] + [stage.queue_depth for stage in stats])
+
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in pipeline.run(range(HOSTS), progress=watch, interval=0.05):
+        count += 1
+        first = first or time.perf_counter() - start
+    return count, time.perf_counter() - start, first, deepest
+
+
+def main():
+    Logger.set_level(LogLevel.WARNING)
+    print(f"{HOSTS} hosts, 4 stages:")
+    for label, run in (("staged", staged), ("pipeline", pipelined)):
+        count, seconds, first, deepest = run()
+        print(
+            f"  {label:<9} {count} results in {seconds:5.2f} s, first after {first:5.2f} s,"
+            f" at most {deepest} items buffered"
+        )
+
+
+if __name__ == "__main__":
+    main()
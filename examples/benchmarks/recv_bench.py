@@ -0,0 +1,73 @@
+"""Micro-benchmark: recv() vs. pooled recv_into over a socketpair.
+
+Run from the repository root:
+
+    python examples/benchmarks/recv_bench.py
+"""
+
+import socket
+import threading
+import time
+
+from netengine.utils import BufferPool
+
+TOTAL = 256 * 1024 * 1024
+
+
+def feed(sock: socket.socket, chunk: int):
+    """Write TOTAL bytes in chunk-sized pieces."""
+    payload = b"x" * chunk
+    for _ in range(TOTAL // chunk):
+        sock.sendall(payload)
+
+
+def with_recv(sock: socket.socket, chunk: int, pool: BufferPool):
+    """A new bytes object per read."""
+    received = 0
+    while received < TOTAL:
+        received += len(sock.recv(chunk))
+
+
+def with_lease_per_read(sock: socket.socket, chunk: int, pool: BufferPool):
+    """A pooled buffer leased and released around every read."""
+    received = 0
+    while received < TOTAL:
+        buffer = pool.recv_into(sock, chunk)
+        received += buffer.length
+        buffer.release()
+
+
+def with_one_lease(sock: socket.socket, chunk: int, pool: BufferPool):
+    """One pooled buffer refilled in place, as a streaming reader would."""
+    received = 0
+    with pool.acquire() as buffer:
+        while received < TOTAL:
+            received += buffer.recv_into(sock, chunk)
+
+
+def run(reader, chunk: int, pool: BufferPool) -> float:
+    """Seconds for reader to receive TOTAL bytes."""
+    left, right = socket.socketpair()
+    writer = threading.Thread(target=feed, args=(left, chunk))
+    writer.start()
+    start = time.perf_counter()
+    reader(right, chunk, pool)
+    seconds = time.perf_counter() - start
+    writer.join()
+    left.close()
+    right.close()
+    return seconds
+
+
+def main():
+    for chunk in (4096, 65536):
+        pool = BufferPool(buffer_size=chunk)
+        print(f"{chunk}-byte reads:")
+        for reader in (with_recv, with_lease_per_read, with_one_lease):
+            seconds = min(run(reader, chunk, pool) for _ in range(3))
+            print(f"  {reader.__name__:<22} {TOTAL / 2**20 / seconds:8.0f} MiB/s")
+        print(f"  buffers allocated: {pool.allocated}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark: UDPEndpoint with sendmmsg/recvmmsg vs. a sendto/recvfrom loop.
+
+Run from the repository root (Linux, for the mmsg path):
+
+    python examples/benchmarks/udp_batch_bench.py
+"""
+
+import time
+
+from netengine.networking import UDPEndpoint
+
+TOTAL = 200000
+CHUNK = 1000
+
+
+def send_rate(use_mmsg: bool, size: int) -> float:
+    """Datagrams per second sent to a socket that drains them."""
+    with UDPEndpoint(bind=("127.0.0.1", 0)) as sink, UDPEndpoint(use_mmsg=use_mmsg) as source:
+        batch = [(b"x" * size, sink.sock.getsockname())] * CHUNK
+        seconds = 0.0
+        for _ in range(TOTAL // CHUNK):
+            start = time.perf_counter()
+            source.send_batch(batch)
+            seconds += time.perf_counter() - start
+            while sink.recv_batch():
+                pass
+        print(f"    syscalls: {source.stats.syscalls}")
+        return TOTAL / seconds
+
+
+def recv_rate(use_mmsg: bool, size: int) -> float:
+    """Datagrams per second received, CHUNK datagrams queued at a time."""
+    with UDPEndpoint(bind=("127.0.0.1", 0), use_mmsg=use_mmsg) as sink, UDPEndpoint() as source:
+        batch = [(b"x" * size, sink.sock.getsockname())] * CHUNK
+        seconds = 0.0
+        for _ in range(TOTAL // CHUNK):
+            source.send_batch(batch)
+            start = time.perf_counter()
+            received = 0
+            while received < CHUNK:
+                datagrams = sink.recv_batch(0.5)
+                if not datagrams:
+                    break
+                received += len(datagrams)
+            seconds += time.perf_counter() - start
+        print(f"    syscalls: {sink.stats.syscalls}, received: {sink.stats.received}")
+        return sink.stats.received / seconds
+
+
+def main():
+    for size in (64, 1400):
+        print(f"{size}-byte datagrams:")
+        for name, measure in (("send", send_rate), ("recv", recv_rate)):
+            for use_mmsg in (True, False):
+                label = "mmsg" if use_mmsg else "loop"
+                print(f"  {name} {label}: {measure(use_mmsg, size):10.0f} pps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Micro-benchmark: WebSocketHandler against a local echo server.
+
+Checks round trips of every length class (7-bit, 16-bit and 64-bit
+lengths, fragmented messages, pings), then measures one-way message
+throughput from a server that streams frames to the client.
+
+Run from the repository root:
+
+    python examples/benchmarks/websocket_bench.py
+"""
+
+import os
+import socket
+import threading
+import time
+
+from netengine.utils import Logger, LogLevel
+from netengine.web import WebSocketHandler
+from netengine.web.websocket_frames import (
+    OP_BINARY,
+    OP_CLOSE,
+    OP_CONTINUATION,
+    OP_PING,
+    OP_PONG,
+    FrameParser,
+    encode_frame,
+    mask,
+)
+from netengine.web.websocket_handler import accept_key
+
+STREAM_BYTES = 256 * 1024 * 1024
+
+
+def serve(conn: socket.socket):
+    """Echo messages back; "stream <count> <size>" requests a burst of frames."""
+    request = b""
+    while b"\r\n\r\n" not in request:
+        request += conn.recv(4096)
+    key = next(line.split(b":", 1)[1].strip() for line in request.split(b"\r\n") if line.lower().startswith(b"sec-websocket-key"))
+    conn.sendall(
+        b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept_key(key.decode()).encode() + b"\r\n\r\n"
+    )
+    parser = FrameParser(expect_masked=True)
+    fragments = []
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            break
+        for frame in parser.feed(data):
+            if frame.opcode == OP_CLOSE:
+                conn.sendall(encode_frame(OP_CLOSE, frame.payload, masked=False))
+                conn.close()
+                return
+            if frame.opcode == OP_PING:
+                conn.sendall(encode_frame(OP_PONG, frame.payload, masked=False))
+                continue
+            fragments.append(frame)
+            if not frame.fin:
+                continue
+            opcode = fragments[0].opcode
+            payload = b"".join(fragment.payload for fragment in fragments)
+            fragments = []
+            if payload.startswith(b"stream "):
+                _, count, size = payload.split()
+                burst = encode_frame(OP_BINARY, b"m" * int(size), masked=False) * 64
+                for _ in range(int(count) // 64):
+                    conn.sendall(burst)
+                continue
+            # Echo fragmented messages fragmented again, in 1000-byte frames.
+            if len(payload) > 1000:
+                chunks = [payload[i : i + 1000] for i in range(0, len(payload), 1000)]
+                conn.sendall(
+                    b"".join(
+                        encode_frame(opcode if i == 0 else OP_CONTINUATION, chunk, fin=i == len(chunks) - 1, masked=False)
+                        for i, chunk in enumerate(chunks)
+                    )
+                )
+            else:
+                conn.sendall(encode_frame(opcode, payload, masked=False))
+
+
+def start_server() -> int:
+    """Start the echo server; return its port."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def accept():
+        while True:
+            conn, _ = listener.accept()
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def check(port: int):
+    """Round-trip every length class and control frame."""
+    ws = WebSocketHandler()
+    ws.connect(f"ws://127.0.0.1:{port}/echo")
+    for size in (0, 1, 125, 126, 127, 65535, 65536, 70000, 3 * 1024 * 1024 + 3):
+        payload = os.urandom(size)
+        ws.send(payload)
+        assert ws.receive() == payload, size
+        ws.send(payload, fragment_size=4096)
+        assert ws.receive() == payload, size
+    ws.send("héllo wörld")
+    assert ws.receive() == "héllo wörld"
+    ws.ping(b"hi")
+    ws.send("after ping")
+    assert ws.receive() == "after ping" and ws.last_pong is not None
+    key = os.urandom(4)
+    for size in range(0, 4200, 7):
+        payload = os.urandom(size)
+        assert mask(mask(payload, key), key) == payload
+        assert mask(payload, key) == bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    ws.close()
+    assert ws.close_code == 1000
+    print("round trips ok")
+
+
+def throughput(port: int, size: int):
+    """Messages and MB per second received from the streaming server."""
+    ws = WebSocketHandler()
+    ws.connect("127.0.0.1", port)
+    count = max(64, STREAM_BYTES // max(size, 1) // 64 * 64)
+    ws.send(f"stream {count} {size}")
+    start = time.perf_counter()
+    received = 0
+    for _ in range(count):
+        received += len(ws.receive())
+    seconds = time.perf_counter() - start
+    ws.close()
+    print(f"  {size:>7}-byte messages: {count / seconds:10.0f} msg/s {received / seconds / 2**20:8.1f} MiB/s")
+
+
+def main():
+    Logger.set_level(LogLevel.WARNING)
+    port = start_server()
+    check(port)
+    print("server -> client stream:")
+    for size in (64, 1024, 16384, 1024 * 1024):
+        throughput(port, size)
+
+
+if __name__ == "__main__":
+    main()
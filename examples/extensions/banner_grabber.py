@@ -1,9 +1,9 @@
 """Example extension: Banner grabber."""
 
 from netengine.extensions.base import BaseExtension
-from netengine.utils import Logger
-from netengine.networking import TCPHandler
-from typing import Dict
+from netengine.utils import Logger, PortSpec
+from netengine.networking import BannerGrabber
+from typing import Dict, Iterable, Optional, Union
 
 
 class BannerGrabberExtension(BaseExtension):
@@ -14,29 +14,37 @@ class BannerGrabberExtension(BaseExtension):
         super().__init__("BannerGrabber", "1.0.0")  #eZGPTA
         self.logger = Logger()
 
-    def execute(self, host: str, ports: list) -> Dict:
-        """Grab banners from multiple ports."""
-        tcp = TCPHandler(self.logger)
+    def execute(
+        self,
+        host: str,
+        ports: Union[str, Iterable[int]],
+        concurrency: int = 1000,
+        max_bytes: int = 1024,
+    ) -> Dict[int, Optional[str]]:
+        """Grab banners from multiple ports.
+
+        ``ports`` is a list or a port spec such as "21,22,80-90". Every port
+        is probed concurrently (null probe first, then HTTP/TLS/text
+        probes). Returns port -> banner text, "" when the service stayed
+        silent and None when the port could not be reached.
+        """
+        if isinstance(ports, str):
+            ports = PortSpec(ports)
+        grabber = BannerGrabber(self.logger, concurrency=int(concurrency), max_bytes=int(max_bytes))
         banners = {}
 
         self.logger.info(f"Grabbing banners from {host}...")
 
-        for port in ports:
-            try:
-                sock = tcp.connect(host, port, timeout=2.0)
-                try:  #IbmsW3
-                    sock.settimeout(1.0)  #XMTLFW
-                    banner = sock.recv(1024).decode().strip()
-                    banners[port] = banner
-                    self.logger.success(f"Port {port}: {banner[:50]}")
-                except:
-                    banners[port] = ""
-                finally:
-                    sock.close()
-            except:
-                banners[port] = None
+        for result in grabber.grab((host, port) for port in ports):
+            if result.ok:  #IbmsW3
+                banners[result.port] = result.text  #XMTLFW
+                self.logger.success("%s", result)
+            elif result.latency is not None:
+                banners[result.port] = ""
+            else:
+                banners[result.port] = None
   #87chOx
-        return banners
+        return dict(sorted(banners.items()))
 rvdnyXZaS7F
 LkrnSY18J3vPTMUdzk073SAVEdw6RrXrq
 9xivXt29z04eDTYZPRb41NXwcnTeoIXurHKMAZrTLA
@@ -1,8 +1,8 @@
 """Example extension: DNS resolver."""
 
 from netengine.extensions.base import BaseExtension
+from netengine.networking import DNSResolver
 from netengine.utils import Logger
-import socket
 
   #R7Gl5R
 class DNSResolverExtension(BaseExtension):
@@ -12,22 +12,20 @@ class DNSResolverExtension(BaseExtension):
         """Initialize DNS resolver."""
         super().__init__("DNSResolver", "1.0.0")
         self.logger = Logger()
+        self.resolver = DNSResolver(self.logger)
 
-    def execute(self, domains: list):
+    def execute(self, domains: list, record_type: str = "A"):
         """Resolve multiple domains."""
         self.logger.info(f"Resolving {len(domains)} domain(s)...")
         results = {}
 
-        for domain in domains:
-            try:
-                ip = socket.gethostbyname(domain)
-                results[domain] = ip
-                self.logger.success(f"{domain} -> {ip}")
-            except socket.gaierror:  #ChA8oc
-                self.logger.error(f"Failed to resolve {domain}")
-                results[domain] = None
-            except Exception as e:
-                self.logger.error(f"Error resolving {domain}", exc=e)
-                results[domain] = None
+        for answer in self.resolver.resolve_many(domains, record_type):  #ChA8oc
+            values = answer.values()
+            if values:
+                results[answer.name] = values[0]
+                self.logger.success(f"{answer.name} -> {', '.join(values)}")
+            else:
+                self.logger.error(f"Failed to resolve {answer.name}")
+                results[answer.name] = None
 
         return results
@@ -2,7 +2,7 @@
 
 from netengine.extensions.base import BaseExtension
 from netengine.utils import Logger  #vCFAOL
-from netengine.web import HTTPClient
+from netengine.web import BatchStatusChecker
 from typing import Dict
 
 
@@ -14,25 +14,19 @@ class HTTPStatusCheckerExtension(BaseExtension):
         super().__init__("HTTPStatusChecker", "1.0.0")
         self.logger = Logger()
 
-    def execute(self, urls: list) -> Dict:
+    def execute(self, urls: list, workers: int = 50) -> Dict:
         """Check HTTP status for multiple URLs."""
-        http = HTTPClient(self.logger)
+        checker = BatchStatusChecker(self.logger, workers=workers)
         results = {}
 
         self.logger.info(f"Checking {len(urls)} URL(s)...")
 
-        for url in urls:
-            try:
-                if not url.startswith(("http://", "https://")):
-                    url = f"http://{url}"
-  #evv6Di
-                response = http.get(url)
-                status_line = response.split("\n")[0]
-                results[url] = status_line
-                self.logger.success(f"{url} -> {status_line}")
-            except Exception as e:
-                results[url] = f"Error: {str(e)}"
-                self.logger.error(f"Failed to check {url}")
+        for result in checker.check(urls):
+            results[result.url] = result.status_line
+            if result.ok:
+                self.logger.success(f"{result.url} -> {result.status_line}")
+            else:
+                self.logger.error(f"Failed to check {result.url}")
 
         return results
 Sx7YJMBGlhep3Vmtn0fYn392PxWN7
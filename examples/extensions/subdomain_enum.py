@@ -1,8 +1,8 @@
 """Example extension: Subdomain enumerator."""
 
 from netengine.extensions.base import BaseExtension
+from netengine.networking import SubdomainEnumerator, read_wordlist
 from netengine.utils import Logger
-import socket
 
 
 class SubdomainEnumeratorExtension(BaseExtension):
@@ -28,21 +28,44 @@ class SubdomainEnumeratorExtension(BaseExtension):
             "git",
         ]
 
-    def execute(self, domain: str, custom_subdomains: list = None) -> list:
-        """Enumerate subdomains."""
-        subdomains = custom_subdomains or self.common_subdomains
+    def execute(
+        self,
+        domain: str,
+        custom_subdomains: list = None,
+        wordlist: str = None,
+        output: str = None,
+        concurrency: int = 1000,
+    ) -> list:
+        """Enumerate subdomains.
+
+        Labels come from ``wordlist`` (read lazily) when given, otherwise from
+        ``custom_subdomains`` or the built-in list. Hits are appended to
+        ``output`` as they are found.
+        """
+        if wordlist:
+            words = read_wordlist(wordlist)
+        else:
+            words = custom_subdomains or self.common_subdomains
+        enumerator = SubdomainEnumerator(
+            self.logger,
+            concurrency=concurrency,
+            on_progress=lambda stats: self.logger.info(f"Progress: {stats}"),
+        )
         found = []
 
         self.logger.info(f"Enumerating subdomains for {domain}...")
 
-        for subdomain in subdomains:
-            fqdn = f"{subdomain}.{domain}"
-            try:
-                ip = socket.gethostbyname(fqdn)
-                found.append({"subdomain": fqdn, "ip": ip})
-                self.logger.success(f"Found: {fqdn} ({ip})")
-            except:
-                pass
+        out = open(output, "a") if output else None
+        try:
+            for result in enumerator.enumerate(domain, words):
+                found.append({"subdomain": result.name, "ip": result.addresses[0]})
+                self.logger.success(f"Found: {result.name} ({result.addresses[0]})")
+                if out:
+                    out.write(f"{result.name},{','.join(result.addresses)}\n")
+                    out.flush()
+        finally:
+            if out:
+                out.close()
 
-        self.logger.success(f"Found {len(found)} subdomains")
+        self.logger.success(f"Found {len(found)} subdomains ({enumerator.stats})")
         return found
@@ -0,0 +1,43 @@
+"""Example: CPU-bound work on the process pool."""
+
+import functools
+import json
+import os
+import re
+
+from netengine.core import Config, NetworkEngine, ProcessManager, SharedBuffer
+from netengine.utils.advanced_packets import AdvancedPacketBuilder
+
+
+def checksum_slice(job):
+    """Checksum one slice of a shared buffer (runs in a worker process)."""
+    buffer, start, end = job
+    return AdvancedPacketBuilder._checksum(bytes(buffer.buf[start:end]))
+
+
+if __name__ == "__main__":
+    # 1. Checksums over a large payload: workers map the same shared memory
+    #    instead of receiving a copy of the data with every task.
+    payload = os.urandom(4 * 1024 * 1024)
+    with SharedBuffer.from_bytes(payload) as shared, ProcessManager() as manager:
+        step = 64 * 1024
+        jobs = [(shared, offset, offset + step) for offset in range(0, len(payload), step)]
+        checksums = manager.map_tasks(checksum_slice, jobs)
+        print(f"Checksummed {len(checksums)} slices")
+
+    # 2. Regex extraction and JSON parsing, chosen per workload by Config.
+    config = Config(execution_mode="hybrid")
+    with NetworkEngine(config) as engine:
+        bodies = [f"<a href='http://host{i}.example/'>link</a>" * 50 for i in range(1000)]
+        find_links = functools.partial(re.findall, r"href='([^']+)'")
+        links = engine.manager_for("regex").map_tasks(find_links, bodies)
+        print(f"Extracted {sum(len(found) for found in links)} links")
+
+        # Pipeline stages declare their workload and get the same pool.
+        pipeline = engine.pipeline().add("links", find_links, workers=os.cpu_count() or 1, workload="regex")
+        print(f"Pipeline extracted {sum(len(found) for found in pipeline.run(bodies))} links")
+
+        documents = [json.dumps({"id": i, "ports": list(range(100))}) for i in range(1000)]
+        for result in engine.manager_for("json").imap(json.loads, documents, chunksize=100):
+            if not result.ok:
+                print(f"Bad document: {result.error}")
@@ -0,0 +1,76 @@
+"""Example: resolve -> ping -> port scan -> banner grab -> HTTP probe as one pipeline.
+
+Every stage runs at once: hosts are pinged while others are still being
+resolved, and banners are grabbed from the first open ports while the
+scan continues. Per-stage progress is printed every second.
+
+    python examples/pipeline_example.py example.com scanme.nmap.org
+
+The ping stage needs an ICMP socket (root, or net.ipv4.ping_group_range).
+"""
+
+import sys
+
+from netengine.core import NetworkEngine, Config
+from netengine.networking import AsyncTCPScanner, BannerGrabber, DNSResolver, PingSweeper
+from netengine.web import BatchStatusChecker
+from netengine.utils import Logger, LogLevel
+
+PORTS = [21, 22, 25, 53, 80, 110, 143, 443, 445, 993, 995, 3306, 3389, 5432, 6379, 8000, 8080, 8443]
+HTTP_PORTS = {80: "http", 8000: "http", 8080: "http", 443: "https", 8443: "https"}
+
+logger = Logger()
+resolver = DNSResolver(logger)
+sweeper = PingSweeper(logger, timeout=1.0)
+scanner = AsyncTCPScanner(logger, concurrency=500, timeout=1.5)
+grabber = BannerGrabber(logger, concurrency=200, wait=1.0)
+checker = BatchStatusChecker(logger, timeout=5.0)
+
+
+def resolve(names):
+    """Batch of names -> addresses."""
+    return [answer.values()[0] for answer in resolver.resolve_many(names) if answer.values()]
+
+
+def ping(addresses):
+    """Batch of addresses -> the ones that answered."""
+    return [stats.address for stats in sweeper.sweep(addresses) if stats.alive]
+
+
+def scan(addresses):
+    """Batch of addresses -> open (address, port) pairs."""
+    targets = ((address, port) for address in addresses for port in PORTS)
+    return [(result.host, result.port) for result in scanner.scan(targets) if result.is_open]
+
+
+def grab(targets):
+    """Batch of open ports -> banner results."""
+    return list(grabber.grab(targets))
+
+
+def probe(banner):
+    """HTTP status for web ports; other banners pass through as they are."""
+    scheme = HTTP_PORTS.get(banner.port)
+    if scheme is None:
+        return str(banner)
+    result = checker.check_one(f"{scheme}://{banner.host}:{banner.port}/")
+    return f"{banner.host}:{banner.port} [{scheme}] {result.status_line}"
+
+
+def show(stats):
+    print("\n".join(str(stage) for stage in stats), file=sys.stderr)
+
+
+Logger.set_level(LogLevel.WARNING)
+hosts = sys.argv[1:] or ["localhost"]
+with NetworkEngine(Config()) as engine:
+    pipeline = (
+        engine.pipeline(queue_size=500)
+        .add("resolve", resolve, batch=100)
+        .add("ping", ping, batch=256)
+        .add("scan", scan, batch=16)
+        .add("banner", grab, batch=64)
+        .add("http", probe, workers=20)
+    )
+    for line in pipeline.run(hosts, progress=show):
+        print(line)
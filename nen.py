@@ -4,18 +4,35 @@ NetEngine (nen.py) - Unified Networking Toolkit
 All-in-one tool for network operations, packet crafting, and custom extensions
 """
 
+from __future__ import annotations
+
 import argparse
+import itertools
 import sys
 import signal
 import os
-from typing import Optional, List, Dict, Any
-
-# Core imports
-from netengine.core import NetworkEngine, Config, ThreadManager
-from netengine.networking import TCPHandler, UDPHandler, ICMPHandler, SocketHandler
-from netengine.web import HTTPClient, WebSocketHandler, ResponseParser
-from netengine.utils import Logger, ProxyChainsManager, PacketBuilder  #k409Li
-from netengine.utils.advanced_packets import AdvancedPacketBuilder
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+# Core imports. Handlers are imported by the operations that use them, so
+# a single command only loads its own part of the package.
+from netengine.core import Config
+from netengine.utils import Logger  #k409Li
+from netengine.utils import LogLevel
+
+if TYPE_CHECKING:
+    from netengine.core import NetworkEngine
+    from netengine.networking import (
+        ProbeResult,
+        PingStats,
+        ScanResult,
+        BannerResult,
+        DNSAnswer,
+        SubdomainResult,
+    )
+    from netengine.web import StatusResult
+    from netengine.utils import TargetSpec, PortSpec
+    from netengine.extensions import ExtensionInfo
 
 
 class NetEngine:
@@ -25,9 +42,18 @@ class NetEngine:
         """Initialize NetEngine."""
         self.logger = Logger(verbose=verbose, log_file=log_file)
         self.config = Config(verbose=verbose, log_file=log_file)
-        self.engine = NetworkEngine(self.config)
+        self._engine: Optional[NetworkEngine] = None
         self._setup_signals()
 
+    @property
+    def engine(self) -> NetworkEngine:
+        """The NetworkEngine, created on first use."""
+        if self._engine is None:
+            from netengine.core import NetworkEngine
+
+            self._engine = NetworkEngine(self.config)
+        return self._engine
+
     def _setup_signals(self):
         """Setup signal handlers."""
         signal.signal(signal.SIGINT, self._handle_interrupt)
@@ -35,13 +61,15 @@ class NetEngine:
     def _handle_interrupt(self, signum, frame):
         """Handle Ctrl+C gracefully."""
         self.logger.warning("\n\nOperation cancelled by user")
-        self.engine.shutdown()
+        self.shutdown()
         sys.exit(0)
 
     # ==================== TCP Operations ====================
 
     def tcp_connect(self, host: str, port: int, timeout: float = 10.0) -> bool:
         """Connect to TCP server."""
+        from netengine.networking import TCPHandler
+
         try:
             tcp = TCPHandler(self.logger)
             sock = tcp.connect(host, port, timeout=timeout)
@@ -50,33 +78,133 @@ class NetEngine:
         except Exception:
             return False
 
-    def tcp_scan(self, host: str, ports: List[int], timeout: float = 2.0) -> List[int]:
-        """Scan TCP ports."""
-        tcp = TCPHandler(self.logger)
-        open_ports = []
+    def tcp_scan(
+        self,
+        host: str,
+        ports: Iterable[int],
+        timeout: float = 2.0,
+        mode: str = "async",
+        concurrency: int = 1000,
+        rate_limit: float = 0.0,
+    ) -> List[int]:
+        """Scan TCP ports on a single host."""
+        from netengine.utils import TargetSpec
+
+        results = self.tcp_sweep(
+            TargetSpec([host], ports),
+            timeout=timeout,
+            mode=mode,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+        )
+        return results.get(host, [])
+
+    def tcp_sweep(
+        self,
+        targets: TargetSpec,
+        timeout: float = 2.0,
+        mode: str = "async",
+        concurrency: int = 1000,
+        rate_limit: float = 0.0,
+    ) -> Dict[str, List[int]]:
+        """Scan TCP ports across many hosts.
+
+        Targets are pulled lazily from the TargetSpec. ``mode`` selects the
+        asyncio engine ("async") or the blocking fallback ("sequential").
+        """
+        open_ports: Dict[str, List[int]] = {}
+        for result in self.tcp_scan_stream(targets, timeout, mode, concurrency, rate_limit):
+            if result.is_open:
+                open_ports.setdefault(result.host, []).append(result.port)
+
+        for host, ports in open_ports.items():
+            ports.sort()
+            self.logger.success(f"Found {len(ports)} open ports on {host}: {ports}")
+        if not open_ports:
+            self.logger.success("Found 0 open ports")
+        return open_ports
+
+    def tcp_scan_stream(
+        self,
+        targets: TargetSpec,
+        timeout: float = 2.0,
+        mode: str = "async",
+        concurrency: int = 1000,
+        rate_limit: float = 0.0,
+    ) -> Iterator[ScanResult]:
+        """Scan TCP ports across many hosts, yielding every probe result as it completes."""
+        self.logger.info(
+            f"Scanning {targets.host_count} host(s) for {targets.port_count} ports..."
+        )
+
+        if mode == "sequential":
+            results = self._tcp_scan_sequential(targets, timeout)
+        else:
+            from netengine.networking import AsyncTCPScanner
 
-        self.logger.info(f"Scanning {host} for {len(ports)} ports...")
+            scanner = AsyncTCPScanner(
+                self.logger, concurrency=concurrency, timeout=timeout, rate_limit=rate_limit
+            )
+            results = scanner.scan(targets)
+
+        for result in results:
+            if result.is_open:
+                self.logger.success("%s:%d open", result.host, result.port)
+            else:
+                self.logger.debug("%s:%d %s", result.host, result.port, result.state)
+            yield result
+
+    def banner_grab(
+        self,
+        targets: Iterable[Tuple[str, int]],
+        concurrency: int = 1000,
+        timeout: float = 2.0,
+        wait: float = 2.0,
+        max_bytes: int = 1024,
+    ) -> Iterator[BannerResult]:
+        """Grab banners from (host, port) targets, yielding results as they arrive."""
+        from netengine.networking import BannerGrabber
+
+        grabber = BannerGrabber(
+            self.logger, concurrency=concurrency, timeout=timeout, wait=wait, max_bytes=max_bytes
+        )
+        for result in grabber.grab(targets):
+            if result.ok:
+                self.logger.success("%s", result)
+            else:
+                self.logger.debug("%s", result)
+            yield result
+
+    def _tcp_scan_sequential(
+        self, targets: Iterable[Tuple[str, int]], timeout: float
+    ) -> Iterator[ScanResult]:
+        """Scan targets one at a time with blocking connects."""
+        from netengine.networking import TCPHandler, ScanResult
 
-        for port in ports:
+        tcp = TCPHandler(self.logger)
+
+        for host, port in targets:
             try:
                 sock = tcp.connect(host, port, timeout=timeout)
-                open_ports.append(port)
                 sock.close()
-            except:
-                pass
-
-        self.logger.success(f"Found {len(open_ports)} open ports: {open_ports}")
-        return open_ports
+                yield ScanResult(host, port, "open")
+            except ConnectionRefusedError:
+                yield ScanResult(host, port, "closed")
+            except Exception as e:
+                yield ScanResult(host, port, "filtered", error=str(e))
 
     def tcp_send(self, host: str, port: int, data: str, timeout: float = 10.0) -> str:
         """Send data via TCP and receive response."""
+        from netengine.networking import TCPHandler
+
         try:
             tcp = TCPHandler(self.logger)
             sock = tcp.connect(host, port, timeout=timeout)
             sock.sendall(data.encode())
-            response = sock.recv(4096).decode()
+            with tcp.receive_into(sock) as response:
+                text = response.decode()
             sock.close()
-            return response
+            return text
         except Exception as e:
             self.logger.error(f"TCP send failed", exc=e)
             return ""
@@ -85,20 +213,47 @@ class NetEngine:
 
     def udp_send(self, host: str, port: int, data: str, timeout: float = 5.0):
         """Send UDP packet."""
+        from netengine.networking import UDPHandler
+
         try:
             udp = UDPHandler(self.logger)
             sock = udp.send(host, port, data.encode(), timeout=timeout)
-            response, addr = udp.receive(sock)
-            self.logger.success(f"UDP response from {addr[0]}:{addr[1]}")
-            return response.decode()
+            with udp.receive_into(sock) as response:
+                addr = response.address
+                self.logger.success(f"UDP response from {addr[0]}:{addr[1]}")
+                return response.decode()
         except Exception as e:
             self.logger.error(f"UDP send failed", exc=e)
             return ""
 
+    def udp_probe(
+        self,
+        hosts: Iterable[str],
+        service: str = "dns",
+        port: Optional[int] = None,
+        timeout: float = 2.0,
+        rate: float = 0.0,
+        include_timeouts: bool = False,
+    ) -> Iterator[ProbeResult]:
+        """Send a discovery probe (dns, ntp or snmp) to many hosts over one socket."""
+        from netengine.networking import UDPEndpoint
+        from netengine.networking.udp_batch import PROBES as UDP_PROBES
+
+        default_port, payload, key = UDP_PROBES[service]
+        probes = (((host, port or default_port), payload) for host in hosts)
+        with UDPEndpoint(self.logger) as endpoint:
+            for result in endpoint.probe(probes, timeout=timeout, rate=rate, key=key, include_timeouts=include_timeouts):
+                if result.answered:
+                    self.logger.success("%s:%d answered in %.2fms", result.address[0], result.address[1], result.rtt * 1000)
+                yield result
+            self.logger.info("UDP probe: %s", endpoint.stats)
+
     # ==================== ICMP Operations ====================
 
     def icmp_ping(self, host: str, timeout: float = 5.0) -> Optional[float]:
         """Ping host with ICMP."""
+        from netengine.networking import ICMPHandler
+
         try:
             icmp = ICMPHandler(self.logger)
             return icmp.ping(host, timeout=timeout)
@@ -109,10 +264,34 @@ class NetEngine:
             self.logger.error(f"Ping failed", exc=e)
             return None
 
+    def icmp_sweep(
+        self,
+        hosts: Iterable[str],
+        count: int = 1,
+        timeout: float = 1.0,
+        interval: float = 1.0,
+        rate: float = 0.0,
+    ) -> Iterator[PingStats]:
+        """Ping many hosts over one ICMP socket, yielding per-host stats."""
+        from netengine.networking import PingSweeper
+
+        try:
+            with PingSweeper(self.logger, count=count, timeout=timeout, interval=interval, rate=rate) as sweeper:
+                for stats in sweeper.sweep(hosts):
+                    if stats.alive:
+                        self.logger.success("%s", stats)
+                    else:
+                        self.logger.debug("%s", stats)
+                    yield stats
+        except PermissionError:
+            self.logger.error("ICMP requires root/sudo privileges (or net.ipv4.ping_group_range)")
+
     # ==================== HTTP/Web Operations ====================
 
     def http_get(self, url: str, headers: Optional[Dict] = None) -> str:
         """Perform HTTP GET request."""
+        from netengine.web import HTTPClient
+
         try:
             http = HTTPClient(self.logger)
             return http.get(url, headers=headers)
@@ -122,6 +301,8 @@ class NetEngine:
 
     def http_post(self, url: str, data: str, headers: Optional[Dict] = None) -> str:
         """Perform HTTP POST request."""
+        from netengine.web import HTTPClient
+
         try:
             http = HTTPClient(self.logger)
             return http.post(url, data=data.encode(), headers=headers)
@@ -132,38 +313,80 @@ class NetEngine:
     def http_check_status(self, urls: List[str]) -> Dict:
         """Check HTTP status for multiple URLs."""
         results = {}
-        http = HTTPClient(self.logger)
-
-        for url in urls:
-            try:
-                if not url.startswith(("http://", "https://")):
-                    url = f"http://{url}"
-                response = http.get(url)
-                status = response.split("\n")[0]
-                results[url] = status
-                self.logger.success(f"{url} -> {status}")
-            except Exception as e:
-                results[url] = f"Error: {str(e)}"
-
+        for result in self.http_status_stream(urls):
+            results[result.url] = result.status_line
         return results
 
+    def http_status_stream(
+        self,
+        urls: Iterable[str],
+        workers: int = 50,
+        per_host: int = 6,
+        timeout: float = 10.0,
+    ) -> Iterator[StatusResult]:
+        """Check HTTP status for many URLs concurrently, yielding as results arrive."""
+        from netengine.web import BatchStatusChecker
+
+        checker = BatchStatusChecker(
+            self.logger, workers=workers, per_host=per_host, timeout=timeout
+        )
+        for result in checker.check(urls):
+            if result.ok:
+                self.logger.success(f"{result.url} -> {result.status_line}")
+            else:
+                self.logger.error(f"Failed to check {result.url}: {result.error}")
+            yield result
+
     # ==================== DNS Operations ====================
   #oQKOI0
-    def dns_resolve(self, domains: List[str]) -> Dict:
+    def dns_resolve(self, domains: List[str], record_type: str = "A") -> Dict:
         """Resolve domain names to IPs."""
-        import socket
+        results = {domain.strip().rstrip("."): None for domain in domains}
+        for answer in self.dns_resolve_stream(domains, record_type):
+            values = answer.values()
+            if values:
+                results[answer.name] = values[0]
+        return results
 
-        results = {}
-        for domain in domains:
-            try:
-                ip = socket.gethostbyname(domain)
-                results[domain] = ip
-                self.logger.success(f"{domain} -> {ip}")
-            except socket.gaierror:
-                self.logger.error(f"Failed to resolve {domain}")
-                results[domain] = None
+    def dns_resolve_stream(self, domains: Iterable[str], record_type: str = "A") -> Iterator[DNSAnswer]:
+        """Resolve domain names concurrently, yielding answers as they arrive."""
+        from netengine.networking import DNSResolver
 
-        return results
+        resolver = DNSResolver(self.logger)
+        for answer in resolver.resolve_many(domains, record_type):
+            values = answer.values()
+            if values:
+                self.logger.success(f"{answer.name} -> {', '.join(values)}")
+            else:
+                self.logger.error(f"Failed to resolve {answer.name} ({answer.error or answer.rcode})")
+            yield answer
+
+    def subdomain_enum(
+        self,
+        domains: List[str],
+        words: Iterable[str],
+        concurrency: int = 1000,
+        record_type: str = "A",
+        progress_interval: float = 0.0,
+    ) -> Iterator[SubdomainResult]:
+        """Enumerate word.domain candidates, yielding hits as they resolve.
+
+        With ``progress_interval`` set, a progress line is logged that often
+        (in seconds).
+        """
+        from netengine.networking import SubdomainEnumerator
+
+        enumerator = SubdomainEnumerator(
+            self.logger,
+            concurrency=concurrency,
+            rtype=record_type,
+            on_progress=(lambda stats: self.logger.info(f"Progress: {stats}")) if progress_interval else None,
+            progress_interval=progress_interval,
+        )
+        for result in enumerator.enumerate(domains, words):
+            self.logger.success(f"{result.name} -> {', '.join(result.addresses)}")
+            yield result
+        self.logger.info(f"Done in {enumerator.stats.elapsed:.1f}s: {enumerator.stats}")
 
     # ==================== Packet Operations ====================
 
@@ -171,6 +394,8 @@ class NetEngine:
         self, src_ip: str, dst_ip: str, src_port: int, dst_port: int
     ) -> bytes:
         """Craft TCP SYN packet."""
+        from netengine.utils.advanced_packets import AdvancedPacketBuilder
+
         try:
             builder = AdvancedPacketBuilder(self.logger)
             packet = builder.build_syn_packet(src_ip, dst_ip, src_port, dst_port)
@@ -182,6 +407,8 @@ class NetEngine:
 
     def craft_dns_query(self, domain: str, record_type: str = "A") -> bytes:
         """Craft DNS query packet."""
+        from netengine.utils.advanced_packets import AdvancedPacketBuilder
+
         try:
             builder = AdvancedPacketBuilder(self.logger)
             packet = builder.build_dns_query(domain, record_type)
@@ -194,7 +421,7 @@ class NetEngine:
     # ==================== Extension Operations ====================
 
     def load_extension(self, name: str, path: str) -> bool:
-        """Load custom extension."""
+        """Register custom extension (imported on first execute)."""
         try:
             self.engine.load_extension(name, path)
             return True
@@ -203,21 +430,31 @@ class NetEngine:
             return False
 
     def execute_extension(self, name: str, *args, **kwargs) -> Any:
-        """Execute loaded extension."""
+        """Execute extension, loading it on first use."""
         try:
             return self.engine.execute_extension(name, *args, **kwargs)
         except Exception as e:
             self.logger.error(f"Extension execution failed", exc=e)
             return None
 
-    def list_extensions(self) -> List[str]:
-        """List loaded extensions."""
-        return list(self.engine.extensions.keys())
+    def execute_extension_batch(self, name: str, items: Iterable[Any], *args, **kwargs) -> Any:
+        """Execute extension over a target list, fanned out concurrently."""
+        try:
+            return self.engine.execute_extension_batch(name, items, *args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Extension execution failed", exc=e)
+            return None
+
+    def list_extensions(self) -> List[ExtensionInfo]:
+        """List available extensions (discovered or registered), without importing them."""
+        return sorted(self.engine.available_extensions().values(), key=lambda info: info.name)
 
     # ==================== Threading Operations ====================
 
     def parallel_execute(self, func, items: List, max_workers: int = 5) -> List:
         """Execute function in parallel on items."""
+        from netengine.core import ThreadManager
+
         manager = ThreadManager(max_workers=max_workers)
         results = manager.map_tasks(func, items)
         manager.shutdown()
@@ -227,16 +464,22 @@ class NetEngine:
 
     def parse_http_response(self, response: str) -> Dict:
         """Parse HTTP response."""
+        from netengine.web import ResponseParser
+
         parser = ResponseParser(self.logger)
         return parser.parse_http(response)
 
     def extract_pattern(self, text: str, pattern: str) -> List:
         """Extract pattern from text."""
+        from netengine.web import ResponseParser
+
         parser = ResponseParser(self.logger)
         return parser.find_pattern(text, pattern)
 
     def parse_json(self, response: str) -> Dict:
         """Parse JSON response."""
+        from netengine.web import ResponseParser
+
         parser = ResponseParser(self.logger)
         return parser.parse_json(response)
 
@@ -252,14 +495,26 @@ class NetEngine:
 
     def shutdown(self):
         """Shutdown engine."""
-        self.engine.shutdown()
+        if self._engine is not None:
+            self._engine.shutdown()
+        self.logger.flush()
 
 
 # ==================== CLI Interface ====================
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create argument parser."""
+def create_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Create argument parser.
+
+    With ``command``, only that subcommand's parser is built (and only its
+    choices imported); unknown commands get the full parser, for help and
+    error messages.
+    """
+    from netengine.utils.result_sink import FORMATS
+
+    def wanted(name: str) -> bool:
+        return command is None or name == command
+
     parser = argparse.ArgumentParser(  #9TUbtG
         description="NetEngine (nen.py) - Unified Networking Toolkit",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -274,98 +529,226 @@ Examples:
     )
 
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only log warnings and errors")
     parser.add_argument("--log", type=str, help="Log file path")
 
+    # Shared by every subcommand: stream results in a machine-readable format
+    output_args = argparse.ArgumentParser(add_help=False)
+    output_args.add_argument(
+        "--output", "-o", help="Write results to this file as they are produced ('-' for stdout)"
+    )
+    output_args.add_argument(
+        "--format", choices=FORMATS, help="Output format (default: from --output extension, else jsonl)"
+    )
+
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
     # TCP commands
-    tcp_connect = subparsers.add_parser("tcp-connect", help="Connect to TCP server")
-    tcp_connect.add_argument("host")
-    tcp_connect.add_argument("port", type=int)
-    tcp_connect.add_argument("--timeout", type=float, default=10.0)
-
-    tcp_scan = subparsers.add_parser("tcp-scan", help="Scan TCP ports")
-    tcp_scan.add_argument("host")
-    tcp_scan.add_argument("ports", help="Ports (comma-separated or range)")
-    tcp_scan.add_argument("--timeout", type=float, default=2.0)
-
-    tcp_send = subparsers.add_parser("tcp-send", help="Send data via TCP")
-    tcp_send.add_argument("host")
-    tcp_send.add_argument("port", type=int)
-    tcp_send.add_argument("data")
+    if wanted("tcp-connect"):
+        tcp_connect = subparsers.add_parser("tcp-connect", help="Connect to TCP server", parents=[output_args])
+        tcp_connect.add_argument("host")
+        tcp_connect.add_argument("port", type=int)
+        tcp_connect.add_argument("--timeout", type=float, default=10.0)
+
+    if wanted("tcp-scan"):
+        tcp_scan = subparsers.add_parser("tcp-scan", help="Scan TCP ports", parents=[output_args])
+        tcp_scan.add_argument("host", help="Targets (host, IP, CIDR or range; comma-separated)")
+        tcp_scan.add_argument("ports", help="Ports (comma-separated or range)")
+        tcp_scan.add_argument("--exclude", help="Hosts to skip (same syntax as targets)")
+        tcp_scan.add_argument("--exclude-ports", help="Ports to skip")
+        tcp_scan.add_argument(
+            "--randomize", action="store_true", help="Probe targets in random order"
+        )
+        tcp_scan.add_argument("--timeout", type=float, default=2.0)
+        tcp_scan.add_argument(
+            "--mode",
+            choices=["async", "sequential"],
+            default="async",
+            help="Scan engine (default: async)",
+        )
+        tcp_scan.add_argument(
+            "--concurrency", type=int, default=1000, help="Maximum connects in flight"
+        )
+        tcp_scan.add_argument(
+            "--rate", type=float, default=0.0, help="Max connections per second per host"
+        )
+
+    if wanted("banner-grab"):
+        banner_grab = subparsers.add_parser("banner-grab", help="Grab service banners", parents=[output_args])
+        banner_grab.add_argument("host", help="Targets (host, IP, CIDR or range; comma-separated)")
+        banner_grab.add_argument("ports", help="Ports (comma-separated or range)")
+        banner_grab.add_argument("--exclude", help="Hosts to skip (same syntax as targets)")
+        banner_grab.add_argument("--timeout", type=float, default=2.0, help="Connect timeout")
+        banner_grab.add_argument("--wait", type=float, default=2.0, help="Seconds to wait for a banner before probing")
+        banner_grab.add_argument("--max-bytes", type=int, default=1024, help="Bytes kept per banner")
+        banner_grab.add_argument("--concurrency", type=int, default=1000, help="Maximum connections in flight")
+
+    if wanted("tcp-send"):
+        tcp_send = subparsers.add_parser("tcp-send", help="Send data via TCP", parents=[output_args])
+        tcp_send.add_argument("host")
+        tcp_send.add_argument("port", type=int)
+        tcp_send.add_argument("data")
 
     # UDP commands
-    udp_send = subparsers.add_parser("udp-send", help="Send UDP packet")
-    udp_send.add_argument("host")
-    udp_send.add_argument("port", type=int)
-    udp_send.add_argument("data")
+    if wanted("udp-send"):
+        udp_send = subparsers.add_parser("udp-send", help="Send UDP packet", parents=[output_args])
+        udp_send.add_argument("host")
+        udp_send.add_argument("port", type=int)
+        udp_send.add_argument("data")
+
+    if wanted("udp-probe"):
+        udp_probe = subparsers.add_parser("udp-probe", help="Probe many hosts for a UDP service", parents=[output_args])
+        udp_probe.add_argument("hosts", help="Targets (host, IP, CIDR or range; comma-separated)")
+        udp_probe.add_argument("--exclude", help="Hosts to skip (same syntax as targets)")
+        from netengine.networking.udp_batch import PROBES as UDP_PROBES
+
+        udp_probe.add_argument("--service", "-s", choices=sorted(UDP_PROBES), default="dns", help="Probe to send")
+        udp_probe.add_argument("--port", "-p", type=int, help="Override the service port")
+        udp_probe.add_argument("--timeout", type=float, default=2.0, help="Seconds to wait for each reply")
+        udp_probe.add_argument("--rate", type=float, default=0.0, help="Max probes per second")
+        udp_probe.add_argument("--all", action="store_true", help="Also report hosts that did not reply")
 
     # ICMP commands
-    icmp_ping = subparsers.add_parser("icmp-ping", help="Ping host")
-    icmp_ping.add_argument("host")
+    if wanted("icmp-ping"):
+        icmp_ping = subparsers.add_parser("icmp-ping", help="Ping host", parents=[output_args])
+        icmp_ping.add_argument("host")
+
+    if wanted("icmp-sweep"):
+        icmp_sweep = subparsers.add_parser("icmp-sweep", help="Ping many hosts concurrently", parents=[output_args])
+        icmp_sweep.add_argument("hosts", help="Targets (host, IP, CIDR or range; comma-separated)")
+        icmp_sweep.add_argument("--exclude", help="Hosts to skip (same syntax as targets)")
+        icmp_sweep.add_argument("--count", "-c", type=positive_int, default=1, help="Echo requests per host")
+        icmp_sweep.add_argument("--timeout", type=float, default=1.0, help="Seconds to wait for each reply")
+        icmp_sweep.add_argument("--interval", "-i", type=float, default=1.0, help="Seconds between a host's probes")
+        icmp_sweep.add_argument("--rate", type=float, default=0.0, help="Max probes per second overall")
+        icmp_sweep.add_argument("--all", action="store_true", help="Also report hosts that did not reply")
 
     # HTTP commands
-    http_get = subparsers.add_parser("http-get", help="HTTP GET request")
-    http_get.add_argument("url")
-
-    http_post = subparsers.add_parser("http-post", help="HTTP POST request")
-    http_post.add_argument("url")
-    http_post.add_argument("data")
-
-    http_status = subparsers.add_parser("http-status", help="Check HTTP status")
-    http_status.add_argument("urls", nargs="+")
+    if wanted("http-get"):
+        http_get = subparsers.add_parser("http-get", help="HTTP GET request", parents=[output_args])
+        http_get.add_argument("url")
+
+    if wanted("http-post"):
+        http_post = subparsers.add_parser("http-post", help="HTTP POST request", parents=[output_args])
+        http_post.add_argument("url")
+        http_post.add_argument("data")
+
+    if wanted("http-status"):
+        http_status = subparsers.add_parser("http-status", help="Check HTTP status", parents=[output_args])
+        http_status.add_argument("urls", nargs="*")
+        http_status.add_argument("--file", "-f", help="File with one URL per line")
+        http_status.add_argument("--workers", type=int, default=50, help="Concurrent checks")
+        http_status.add_argument(
+            "--per-host", type=int, default=6, help="Max connections per host"
+        )
+        http_status.add_argument("--timeout", type=float, default=10.0)
 
     # DNS commands
-    dns_resolve = subparsers.add_parser("dns-resolve", help="Resolve domains")
-    dns_resolve.add_argument("domains", nargs="+")
+    if wanted("dns-resolve"):
+        dns_resolve = subparsers.add_parser("dns-resolve", help="Resolve domains", parents=[output_args])
+        dns_resolve.add_argument("domains", nargs="+")
+        dns_resolve.add_argument("--type", default="A", help="Record type (A, AAAA, CNAME, MX, TXT)")
+
+    if wanted("dns-enum"):
+        dns_enum = subparsers.add_parser("dns-enum", help="Enumerate subdomains from a wordlist", parents=[output_args])
+        dns_enum.add_argument("domains", nargs="+")
+        dns_enum.add_argument("--wordlist", "-w", required=True, help="File with one label per line")
+        dns_enum.add_argument("--concurrency", "-c", type=int, default=1000, help="Queries in flight")
+        dns_enum.add_argument("--type", default="A", help="Record type (A or AAAA)")
+        dns_enum.add_argument("--progress", type=float, default=5.0, help="Seconds between progress lines")
 
     # Packet commands
-    craft_syn = subparsers.add_parser("craft-syn", help="Craft SYN packet")
-    craft_syn.add_argument("src_ip")
-    craft_syn.add_argument("dst_ip")
-    craft_syn.add_argument("src_port", type=int)
-    craft_syn.add_argument("dst_port", type=int)
-
-    craft_dns = subparsers.add_parser("craft-dns", help="Craft DNS query")
-    craft_dns.add_argument("domain")
-    craft_dns.add_argument("--type", default="A")
+    if wanted("craft-syn"):
+        craft_syn = subparsers.add_parser("craft-syn", help="Craft SYN packet", parents=[output_args])
+        craft_syn.add_argument("src_ip")
+        craft_syn.add_argument("dst_ip")
+        craft_syn.add_argument("src_port", type=int)
+        craft_syn.add_argument("dst_port", type=int)
+
+    if wanted("craft-dns"):
+        craft_dns = subparsers.add_parser("craft-dns", help="Craft DNS query", parents=[output_args])
+        craft_dns.add_argument("domain")
+        craft_dns.add_argument("--type", default="A")
 
     # Extension commands
-    ext_load = subparsers.add_parser("ext-load", help="Load extension")
-    ext_load.add_argument("name")
-    ext_load.add_argument("path")
+    if wanted("ext-load"):
+        ext_load = subparsers.add_parser("ext-load", help="Load extension", parents=[output_args])
+        ext_load.add_argument("name")
+        ext_load.add_argument("path")
 
-    ext_list = subparsers.add_parser("ext-list", help="List extensions")
+    if wanted("ext-list"):
+        ext_list = subparsers.add_parser("ext-list", help="List extensions", parents=[output_args])
 
-    ext_exec = subparsers.add_parser("ext-exec", help="Execute extension")
-    ext_exec.add_argument("name")
-    ext_exec.add_argument("args", nargs=argparse.REMAINDER)
+    if wanted("ext-exec"):
+        ext_exec = subparsers.add_parser("ext-exec", help="Execute extension", parents=[output_args])
+        ext_exec.add_argument("name")
+        ext_exec.add_argument("args", nargs=argparse.REMAINDER)
 
+    if command is not None and command not in subparsers.choices:
+        return create_parser()
     return parser
 
 
-def parse_ports(ports_str: str) -> List[int]:
+def requested_command(argv: List[str]) -> Optional[str]:
+    """The subcommand named in argv, found without parsing it (None if absent)."""
+    args = iter(argv)
+    for arg in args:
+        if arg == "--log":
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """Lazily read non-empty, non-comment lines from a file."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def parse_ports(ports_str: str) -> PortSpec:
     """Parse port specification."""
-    ports = []
-    for part in ports_str.split(","):
-        part = part.strip()
-        if "-" in part:
-            start, end = map(int, part.split("-"))
-            ports.extend(range(start, end + 1))
-        else:
-            ports.append(int(part))
-    return ports
+    from netengine.utils import PortSpec
+
+    return PortSpec(ports_str)
 
 
 def main():
     """Main entry point."""
-    parser = create_parser()
+    parser = create_parser(requested_command(sys.argv[1:]))
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
+    sink = None
+    if args.output:
+        from netengine.utils import open_sink
+
+        try:
+            sink = open_sink(args.output, args.format)
+        except (ImportError, OSError, ValueError) as e:
+            parser.error(str(e))
+        if args.output == "-":
+            # Records own stdout; human-readable output moves to stderr.
+            sys.stdout = sys.stderr
+    emit = sink.write if sink else (lambda result: None)
+
+    if args.quiet:
+        Logger.set_level(LogLevel.WARNING)
+
     # Initialize NetEngine
     ne = NetEngine(verbose=args.verbose, log_file=args.log)
     ne.logger.banner("NetEngine v1.0")
@@ -377,82 +760,209 @@ def main():
             ne.logger.success("Connection successful") if result else ne.logger.error(
                 "Connection failed"
             )
+            emit({"host": args.host, "port": args.port, "connected": result})
 
         elif args.command == "tcp-scan":
-            ports = parse_ports(args.ports)
-            open_ports = ne.tcp_scan(args.host, ports, args.timeout)
+            from netengine.utils import TargetSpec
+
+            targets = TargetSpec(
+                args.host,
+                args.ports,
+                exclude_hosts=args.exclude,
+                exclude_ports=args.exclude_ports,
+                randomize=args.randomize,
+            )
+            if sink:
+                for result in ne.tcp_scan_stream(
+                    targets,
+                    args.timeout,
+                    mode=args.mode,
+                    concurrency=args.concurrency,
+                    rate_limit=args.rate,
+                ):
+                    if result.is_open:
+                        emit(result)
+            else:
+                open_ports = ne.tcp_sweep(
+                    targets,
+                    args.timeout,
+                    mode=args.mode,
+                    concurrency=args.concurrency,
+                    rate_limit=args.rate,
+                )
+
+        elif args.command == "banner-grab":
+            from netengine.utils import TargetSpec
+
+            targets = TargetSpec(args.host, args.ports, exclude_hosts=args.exclude)
+            for result in ne.banner_grab(
+                targets,
+                concurrency=args.concurrency,
+                timeout=args.timeout,
+                wait=args.wait,
+                max_bytes=args.max_bytes,
+            ):
+                if result.ok:
+                    print(result, flush=True)
+                    emit(
+                        {
+                            "host": result.host,
+                            "port": result.port,
+                            "service": result.service,
+                            "probe": result.probe,
+                            "banner": result.text,
+                        }
+                    )
 
         elif args.command == "tcp-send":
             response = ne.tcp_send(args.host, args.port, args.data)
             print(response)
+            emit({"host": args.host, "port": args.port, "response": response})
 
         # UDP Commands
         elif args.command == "udp-send":
             response = ne.udp_send(args.host, args.port, args.data)
             print(response)
+            emit({"host": args.host, "port": args.port, "response": response})
+
+        elif args.command == "udp-probe":
+            from netengine.utils import HostSpec
+
+            for result in ne.udp_probe(
+                HostSpec(args.hosts, exclude=args.exclude),
+                service=args.service,
+                port=args.port,
+                timeout=args.timeout,
+                rate=args.rate,
+                include_timeouts=args.all,
+            ):
+                host, port = result.address
+                rtt = result.rtt * 1000 if result.answered else None
+                print(f"{host}:{port} " + (f"{len(result.response)} bytes in {rtt:.2f}ms" if result.answered else "no reply"), flush=True)
+                emit({"host": host, "port": port, "answered": result.answered, "bytes": len(result.response or b""), "rtt_ms": rtt})
 
         # ICMP Commands
         elif args.command == "icmp-ping":
             result = ne.icmp_ping(args.host)
             if result:
                 ne.logger.success(f"Response time: {result*1000:.2f}ms")
+            emit({"host": args.host, "rtt": result})
+
+        elif args.command == "icmp-sweep":
+            from netengine.utils import HostSpec
+
+            alive = 0
+            for stats in ne.icmp_sweep(
+                HostSpec(args.hosts, exclude=args.exclude),
+                count=args.count,
+                timeout=args.timeout,
+                interval=args.interval,
+                rate=args.rate,
+            ):
+                alive += stats.alive
+                if stats.alive or args.all:
+                    print(stats, flush=True)
+                    emit(
+                        {
+                            "host": stats.host,
+                            "sent": stats.sent,
+                            "received": stats.received,
+                            "loss": stats.loss,
+                            "min_ms": stats.min,
+                            "avg_ms": stats.avg,
+                            "max_ms": stats.max,
+                            "jitter_ms": stats.jitter,
+                        }
+                    )
+            ne.logger.info("%d hosts up", alive)
 
         # HTTP Commands
         elif args.command == "http-get":
             response = ne.http_get(args.url)
             print(response[:500])
+            emit({"url": args.url, "body": response})
 
         elif args.command == "http-post":
             response = ne.http_post(args.url, args.data)
             print(response[:500])
+            emit({"url": args.url, "body": response})
 
         elif args.command == "http-status":
-            results = ne.http_check_status(args.urls)
-            for url, status in results.items():
-                print(f"{url}: {status}")
+            urls: Iterable[str] = args.urls
+            if args.file:
+                urls = itertools.chain(urls, read_lines(args.file))
+            for result in ne.http_status_stream(
+                urls, workers=args.workers, per_host=args.per_host, timeout=args.timeout
+            ):
+                print(f"{result.url}: {result.status_line}", flush=True)
+                emit(result)
 
         # DNS Commands
         elif args.command == "dns-resolve":
-            results = ne.dns_resolve(args.domains)
-            headers = ["Domain", "IP Address"]
-            rows = [[d, results[d]] for d in args.domains]
-            ne.print_table(headers, rows)
+            if sink:
+                for answer in ne.dns_resolve_stream(args.domains, args.type):
+                    emit(
+                        {
+                            "name": answer.name,
+                            "type": answer.rtype,
+                            "rcode": answer.rcode,
+                            "values": answer.values(),
+                            "error": answer.error,
+                        }
+                    )
+            else:
+                results = ne.dns_resolve(args.domains, args.type)
+                headers = ["Domain", "IP Address" if args.type in ("A", "AAAA") else args.type]
+                rows = [[d, ip] for d, ip in results.items()]
+                ne.print_table(headers, rows)
+
+        elif args.command == "dns-enum":
+            from netengine.networking import read_wordlist
+
+            for result in ne.subdomain_enum(
+                args.domains,
+                read_wordlist(args.wordlist),
+                concurrency=args.concurrency,
+                record_type=args.type,
+                progress_interval=args.progress,
+            ):
+                print(f"{result.name}: {', '.join(result.addresses)}", flush=True)
+                emit(result)
 
         # Packet Commands
         elif args.command == "craft-syn":
             packet = ne.craft_syn_packet(args.src_ip, args.dst_ip, args.src_port, args.dst_port)
             print(f"Packet size: {len(packet)} bytes")
             print(f"Hex: {packet.hex()[:100]}...")
+            emit({"size": len(packet), "packet": packet})
 
         elif args.command == "craft-dns":
             packet = ne.craft_dns_query(args.domain, args.type)
             print(f"Packet size: {len(packet)} bytes")
             print(f"Hex: {packet.hex()[:100]}...")
+            emit({"size": len(packet), "packet": packet})
 
         # Extension Commands
         elif args.command == "ext-load":
             success = ne.load_extension(args.name, args.path)
             if success:
-                ne.logger.success(f"Extension '{args.name}' loaded")
+                ne.logger.success(f"Extension '{args.name}' registered")
+            emit({"name": args.name, "loaded": success})
 
         elif args.command == "ext-list":
             exts = ne.list_extensions()
             if exts:
-                ne.logger.info(f"Loaded extensions ({len(exts)}):")
+                ne.logger.info(f"Available extensions ({len(exts)}):")
                 for ext in exts:
                     print(f"  • {ext}")
+                    emit(asdict(ext))
             else:
-                ne.logger.warning("No extensions loaded")
+                ne.logger.warning("No extensions found")
 
         elif args.command == "ext-exec":
-            if len(args.args) < 1:
-                ne.logger.error("Extension name required")
-                return
-
-            ext_name = args.args[0]
-            ext_args = args.args[1:]
-            result = ne.execute_extension(ext_name, *ext_args)
+            result = ne.execute_extension(args.name, *args.args)
             print(f"Result: {result}")
+            emit({"extension": args.name, "result": result})
 
     except KeyboardInterrupt:
         ne.logger.warning("Interrupted by user")
@@ -460,6 +970,8 @@ def main():
         ne.logger.error(f"Error", exc=e)
     finally:
         ne.shutdown()
+        if sink:
+            sink.close()
 
 
 if __name__ == "__main__":
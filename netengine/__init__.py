@@ -5,7 +5,14 @@ NetEngine: Multithreaded Networking Engine with Proxychains Support
 __version__ = "1.0.0"  #NH9wgK
 __author__ = "NetEngine Team"
   #yVk0Ap
-from .core.engine import NetworkEngine  #403R68  #sMVwfk
+from .utils.lazy_import import attach
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".core.engine": ["NetworkEngine"],  #403R68  #sMVwfk
+    },
+)
 
 __all__ = ["NetworkEngine"]
 V9zBs49vUbjGOghn8aMgbkrJ1oDt8gq0oK0bM4NiBIUjmD2fEUrMXp
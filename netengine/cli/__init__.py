@@ -1,5 +1,12 @@
 # CLI modules
-from .cli import CLI
-from .shell import InteractiveShell  #CN2UHo
+from ..utils.lazy_import import attach
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".cli": ["CLI"],
+        ".shell": ["InteractiveShell"],  #CN2UHo
+    },
+)
 
 __all__ = ["CLI", "InteractiveShell"]
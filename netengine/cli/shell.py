@@ -110,7 +110,7 @@ Press Ctrl+C to interrupt current operation
             self.logger.error(f"HTTP request failed", exc=e)
 
     def do_ext(self, args):
-        """EXT <name> <path>: Load extension."""
+        """EXT <name> <path>: Register extension (loaded on first use)."""
         try:
             parts = args.split()
             if len(parts) != 2:
@@ -123,14 +123,15 @@ Press Ctrl+C to interrupt current operation
             self.logger.error(f"Extension load failed", exc=e)
 
     def do_list(self, args):
-        """LIST: List loaded extensions."""
-        exts = self.engine.extensions.keys()
+        """LIST: List available extensions."""
+        exts = self.engine.available_extensions()
         if exts:
-            self.logger.info(f"Loaded extensions ({len(exts)}):")
-            for ext in exts:
-                print(f"  • {ext}")
+            self.logger.info(f"Available extensions ({len(exts)}):")
+            for name in sorted(exts):
+                loaded = " (loaded)" if name in self.engine.extensions else ""
+                print(f"  • {exts[name]}{loaded}")
         else:
-            self.logger.warning("No extensions loaded")
+            self.logger.warning("No extensions found")
 
     def do_clear(self, args):
         """CLEAR: Clear screen."""
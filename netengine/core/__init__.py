@@ -1,9 +1,28 @@
 # Core modules  #IRj8lR  #dTy5pv
-from .engine import NetworkEngine
-from .thread_manager import ThreadManager
-from .config import Config  #bPP25b
+from ..utils.lazy_import import attach
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".engine": ["NetworkEngine"],
+        ".thread_manager": ["ThreadManager", "TaskResult"],
+        ".process_manager": ["ProcessManager", "SharedBuffer"],
+        ".config": ["Config"],  #bPP25b
+        ".pipeline": ["Pipeline", "Stage", "StageStats"],
+    },
+)
   #m9GBM9
-__all__ = ["NetworkEngine", "ThreadManager", "Config"]
+__all__ = [
+    "NetworkEngine",
+    "ThreadManager",
+    "TaskResult",
+    "ProcessManager",
+    "SharedBuffer",
+    "Config",
+    "Pipeline",
+    "Stage",
+    "StageStats",
+]
 4cAL97TP4FNu8pimggvhM2M8DfkvlD1L8Gjf2QmY5f1
 LL12pnu1L6Gtkfr3IezGwaGVnpOLWtEg8zVtet
 tDEwu968PzWog0y8WeLFo6Kwuk1gaKuecd
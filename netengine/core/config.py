@@ -2,7 +2,7 @@
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 @dataclass
@@ -16,6 +16,17 @@ class Config:
     use_sudo: bool = False
     verbose: bool = False
     log_file: str = ""
+    # "threads", "processes", or "hybrid" (pick per workload from workload_modes)
+    execution_mode: str = "threads"
+    process_workers: int = 0  # 0 = one per CPU
+    workload_modes: Dict[str, str] = field(
+        default_factory=lambda: {"io": "threads", "checksum": "processes", "regex": "processes", "json": "processes"}
+    )
+    # Directories searched for extensions (see ExtensionLoader.discover)
+    extension_paths: List[str] = field(default_factory=list)
+    extension_manifest: str = ""  # "" = $XDG_CACHE_HOME/netengine/extensions.json
+    # Concurrent execute() calls per extension in batches (overrides max_concurrency)
+    extension_concurrency: Dict[str, int] = field(default_factory=dict)
     custom_settings: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -28,9 +39,21 @@ class Config:
             "use_sudo": self.use_sudo,
             "verbose": self.verbose,
             "log_file": self.log_file,
+            "execution_mode": self.execution_mode,
+            "process_workers": self.process_workers,
+            "workload_modes": self.workload_modes,
+            "extension_paths": self.extension_paths,
+            "extension_manifest": self.extension_manifest,
+            "extension_concurrency": self.extension_concurrency,
             "custom_settings": self.custom_settings,  #CwJYSO
         }
 
+    def mode_for(self, workload: str) -> str:
+        """Return "threads" or "processes" for a workload name."""
+        if self.execution_mode == "hybrid":
+            return self.workload_modes.get(workload, "threads")
+        return self.execution_mode
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "Config":
         """Create config from dictionary."""
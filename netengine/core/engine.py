@@ -1,11 +1,23 @@
 """Main NetworkEngine orchestrator."""
 
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional, Tuple
 from .config import Config
 from .thread_manager import ThreadManager
+from .pipeline import Pipeline
 from ..utils.logger import Logger
+from ..extensions.base import BaseExtension
 from ..extensions.loader import ExtensionLoader
 
+if TYPE_CHECKING:
+    from .process_manager import ProcessManager
+
+Call = Tuple[Tuple[Any, ...], Dict[str, Any]]
+
+
+def _overrides(ext: BaseExtension, method: str) -> bool:
+    """True if ext's class replaces BaseExtension's default for method."""
+    return getattr(type(ext), method) is not getattr(BaseExtension, method)
+
 
 class NetworkEngine:  #6e517a  #a55h1V
     """Main network engine orchestrator."""
@@ -14,26 +26,161 @@ class NetworkEngine:  #6e517a  #a55h1V
         """Initialize network engine."""
         self.config = config or Config()
         self.thread_manager = ThreadManager(max_workers=self.config.max_threads)
+        self.process_manager: Optional["ProcessManager"] = None
         self.logger = Logger(verbose=self.config.verbose)
-        self.extension_loader = ExtensionLoader(self.logger)
+        self.extension_loader = ExtensionLoader(
+            self.logger, self.config.extension_paths, self.config.extension_manifest or None
+        )
         self.extensions: Dict[str, Any] = {}
 
     def load_extension(self, name: str, path: str):
-        """Load a user-defined extension."""
-        ext = self.extension_loader.load(name, path)  #l10ATk
-        self.extensions[name] = ext
-        self.logger.info(f"Extension loaded: {name}")
+        """Register a user-defined extension; it is imported on first execute."""
+        info = self.extension_loader.register(name, path)  #l10ATk
+        self.extensions.pop(name, None)
+        self.extension_loader.unload(name)
+        self.logger.info(f"Extension registered: {info}")
+
+    def get_extension(self, name: str) -> BaseExtension:
+        """Return an extension instance, loading it the first time it is used."""
+        ext = self.extensions.get(name)
+        if ext is None:
+            ext = self.extensions[name] = self.extension_loader.require(name)
+        return ext
 
     def execute_extension(self, name: str, *args, **kwargs) -> Any:
-        """Execute a loaded extension."""
-        if name not in self.extensions:
-            raise ValueError(f"Extension '{name}' not loaded")
-        ext = self.extensions[name]
-        return ext.execute(*args, **kwargs)
+        """Execute an extension, loading it the first time it is used."""
+        return self.get_extension(name).execute(*args, **kwargs)
+
+    async def execute_extension_async(self, name: str, *args, **kwargs) -> Any:
+        """Execute an extension from a running event loop (see BaseExtension.execute_async)."""
+        return await self.get_extension(name).execute_async(*args, **kwargs)
+
+    def execute_extension_batch(self, name: str, items: Iterable[Any], *args, **kwargs) -> Any:
+        """Execute an extension over a target list, fanned out concurrently.
+
+        ``items`` takes the place of execute()'s target-list parameter (see
+        BaseExtension.batch_arg) and args/kwargs fill the others. Each call
+        gets ``batch_size`` targets, at most extension_limit(name) calls run
+        at once (on the thread pool, or on an event loop for extensions that
+        implement execute_async()), and the results are merged in target
+        order by merge_results(). An extension that overrides execute_batch()
+        is handed the whole list instead. The first call to fail raises.
+
+        From code running on an event loop, await
+        execute_extension_batch_async() instead.
+        """
+        ext = self.get_extension(name)
+        if _overrides(ext, "execute_batch"):
+            return ext.execute_batch(items, *args, **kwargs)
+        calls = ext.batch_calls(list(items), args, kwargs, max(1, ext.batch_size))
+        limit = self.extension_limit(name)
+        if _overrides(ext, "execute_async"):
+            import asyncio
+            from ..utils.aio import run_sync
+
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                results = run_sync(self._fan_out_async(ext, calls, limit))
+            else:
+                raise RuntimeError(
+                    f"execute_extension_batch({name!r}) cannot run inside a running event loop; "
+                    "await execute_extension_batch_async() instead"
+                )
+        else:
+            results = self._fan_out_threads(ext, calls, limit)
+        return ext.merge_results(results)
+
+    async def execute_extension_batch_async(self, name: str, items: Iterable[Any], *args, **kwargs) -> Any:
+        """Coroutine form of execute_extension_batch(), for callers on an event loop.
+
+        Extensions with execute_async() run as coroutines on the caller's
+        loop; the others are fanned out over the thread pool as usual,
+        without blocking the loop.
+        """
+        import asyncio
+        import functools
+
+        ext = self.get_extension(name)
+        loop = asyncio.get_running_loop()
+        if _overrides(ext, "execute_batch"):
+            return await loop.run_in_executor(None, functools.partial(ext.execute_batch, items, *args, **kwargs))
+        calls = ext.batch_calls(list(items), args, kwargs, max(1, ext.batch_size))
+        limit = self.extension_limit(name)
+        if _overrides(ext, "execute_async"):
+            results = await self._fan_out_async(ext, calls, limit)
+        else:
+            results = await loop.run_in_executor(None, self._fan_out_threads, ext, calls, limit)
+        return ext.merge_results(results)
+
+    def extension_limit(self, name: str) -> int:
+        """Concurrent calls allowed for an extension's batches.
+
+        Config.extension_concurrency wins over the extension's own
+        max_concurrency; the default is the engine's thread count.
+        """
+        return max(
+            1,
+            self.config.extension_concurrency.get(name)
+            or self.get_extension(name).max_concurrency
+            or self.config.max_threads,
+        )
+
+    def _fan_out_threads(self, ext: BaseExtension, calls: List[Call], limit: int) -> List[Any]:
+        """Run the calls on the thread pool (a larger one if limit needs it)."""
+        manager = self.thread_manager if limit <= self.thread_manager.max_workers else ThreadManager(limit)
+        results = manager.imap(lambda call: ext.execute(*call[0], **call[1]), calls, window=limit)
+        try:
+            values = []
+            for result in results:
+                if result.error is not None:
+                    raise result.error
+                values.append(result.value)
+            return values
+        finally:
+            results.close()
+            if manager is not self.thread_manager:
+                manager.shutdown()
+
+    async def _fan_out_async(self, ext: BaseExtension, calls: List[Call], limit: int) -> List[Any]:
+        """Run the calls as coroutines, at most limit at a time."""
+        from ..utils.aio import bounded_as_completed
+
+        async def run(indexed: Tuple[int, Call]) -> Tuple[int, Any]:
+            index, (call_args, call_kwargs) = indexed
+            return index, await ext.execute_async(*call_args, **call_kwargs)
+
+        values: List[Any] = [None] * len(calls)
+        async for index, value in bounded_as_completed(run, enumerate(calls), limit):
+            values[index] = value
+        return values
+
+    def available_extensions(self) -> Dict[str, Any]:
+        """Extensions that can be executed, by name (see ExtensionLoader.available)."""
+        return self.extension_loader.available()
+
+    def pipeline(self, queue_size: int = 1000) -> Pipeline:
+        """New streaming pipeline whose stages can also name this engine's extensions."""
+        return Pipeline(self.logger, queue_size, engine=self)
+
+    def manager_for(self, workload: str = "io") -> ThreadManager:
+        """Return the pool configured for a workload (see Config.mode_for).
+
+        The process pool is only started the first time a workload needs it.
+        """
+        if self.config.mode_for(workload) != "processes":
+            return self.thread_manager
+        if self.process_manager is None:
+            from .process_manager import ProcessManager
+
+            self.process_manager = ProcessManager(self.config.process_workers or None)
+        return self.process_manager
 
     def shutdown(self):
         """Shutdown engine."""
         self.thread_manager.shutdown()  #E9xZmv
+        if self.process_manager is not None:
+            self.process_manager.shutdown()
         self.logger.info("Engine shutdown complete")
 
     def __enter__(self):
@@ -0,0 +1,390 @@
+"""Streaming multi-stage pipelines."""
+
+import functools
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Union
+from ..utils.logger import Logger
+
+if TYPE_CHECKING:
+    from .engine import NetworkEngine
+    from .thread_manager import ThreadManager
+
+# End-of-stream marker passed down the queues, one per downstream worker.
+_END = object()
+# Returned by Pipeline._get() when nothing arrived in time.
+_NOTHING = object()
+# How often blocked workers check whether the pipeline was stopped.
+_POLL = 0.1
+
+
+def _in_pool(manager: "ThreadManager", func: Callable[[Any], Any], fanout: bool, call: Any) -> Any:
+    """Make one stage call in manager's pool and wait for the result."""
+    return manager.submit_task(_listed, func, fanout, call).result()
+
+
+def _listed(func: Callable[[Any], Any], fanout: bool, call: Any) -> Any:
+    """func(call), with fanout results collected so they can be sent back."""
+    result = func(call)
+    return list(result or ()) if fanout else result
+
+
+@dataclass
+class StageStats:
+    """Snapshot of one stage's progress."""
+
+    name: str
+    workers: int
+    received: int = 0
+    emitted: int = 0
+    errors: int = 0
+    active: int = 0
+    queue_depth: int = 0
+    queue_size: int = 0
+    elapsed: float = 0.0
+    # Items received per second since the stage's previous snapshot.
+    rate: float = 0.0
+    done: bool = False
+    last_error: Optional[str] = None
+
+    @property
+    def average_rate(self) -> float:
+        """Items processed per second since the pipeline started."""
+        return self.received / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """One-line summary."""
+        state = "done" if self.done else f"busy {self.active}/{self.workers}"
+        return (
+            f"{self.name:<12} in {self.received:>8} out {self.emitted:>8} err {self.errors:>5}"
+            f"  queue {self.queue_depth:>5}/{self.queue_size:<5} {state:<10} {self.rate:9.1f}/s"
+        )
+
+
+class Stage:
+    """One step of a Pipeline: func run over the stage's input by its own worker threads.
+
+    ``func`` maps an item to a result; None drops the item. With
+    ``fanout`` it returns an iterable of results instead. With ``batch``
+    it gets a list of up to that many items (gathered for at most
+    ``linger`` seconds) and returns an iterable of results, which suits the
+    engines that work on many targets concurrently (AsyncTCPScanner,
+    BannerGrabber, DNSResolver.resolve_many, ...).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        queue_size: int = 1000,
+        fanout: bool = False,
+        batch: int = 0,
+        linger: float = 0.05,
+    ):
+        """Initialize stage; queue_size bounds the stage's input queue."""
+        if workers < 1:
+            raise ValueError(f"Stage {name!r} needs at least one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.fanout = fanout or batch > 0
+        self.batch = batch
+        self.linger = linger
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.stats = StageStats(name, workers, queue_size=queue_size)
+        self._lock = threading.Lock()
+        self._running = 0
+        # (received, elapsed) at the previous snapshot, for StageStats.rate.
+        self._previous = (0, 0.0)
+
+    def snapshot(self, elapsed: float) -> StageStats:
+        """Current stats (queue depth sampled now, rate since the previous snapshot)."""
+        with self._lock:
+            stats = StageStats(**vars(self.stats))
+            received, since = self._previous
+            if elapsed > since:
+                stats.rate = (stats.received - received) / (elapsed - since)
+                self._previous = (stats.received, elapsed)
+        stats.queue_depth = self.queue.qsize()
+        stats.elapsed = elapsed
+        return stats
+
+
+class Pipeline:
+    """Chain of stages connected by bounded queues.
+
+    Items stream through: each stage's workers take items from its input
+    queue as soon as the previous stage emits them, so all stages run at
+    once. A full queue blocks the stage feeding it, so a slow stage
+    throttles everything upstream (backpressure) and memory stays bounded
+    by the queue sizes. Per-item errors are counted in the stage's stats
+    and the item is dropped.
+
+        pipeline = (
+            Pipeline()
+            .add("resolve", resolve, workers=20)
+            .add("scan", scan_ports, workers=50, fanout=True)
+            .add("banner", grab_banners, workers=4, batch=200)
+        )
+        for result in pipeline.run(hosts, progress=print_stats):
+            ...
+    """
+
+    def __init__(self, logger: Optional[Logger] = None, queue_size: int = 1000, engine: Optional["NetworkEngine"] = None):
+        """Initialize pipeline; queue_size is the default per-stage queue bound."""
+        self.logger = logger or Logger()
+        self.queue_size = queue_size
+        self.engine = engine
+        self.stages: List[Stage] = []
+        self._output: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._started = 0.0
+        self._error: Optional[BaseException] = None
+
+    def add(
+        self,
+        name: str,
+        func: Union[Callable[[Any], Any], str],
+        workers: int = 1,
+        queue_size: Optional[int] = None,
+        fanout: bool = False,
+        batch: int = 0,
+        linger: float = 0.05,
+        workload: str = "io",
+        **ext_kwargs,
+    ) -> "Pipeline":
+        """Append a stage (see Stage) and return the pipeline, for chaining.
+
+        ``workload`` names the kind of work func does (see
+        Config.workload_modes). On an engine's pipeline, a workload the
+        config runs on "processes" has every call made in the engine's
+        process pool, so CPU-bound stages (checksums, regex, JSON) use all
+        cores; func and items must then be picklable.
+
+        ``func`` may also name an extension of the pipeline's engine: each
+        batch of items (``batch`` defaults to 100 here) is passed as the
+        extension's target list (see BaseExtension.batch_arg), with
+        ext_kwargs as its other arguments, and the list elements or dict
+        (key, value) pairs it returns are emitted.
+        """
+        if isinstance(func, str):
+            func = self._extension_func(func, ext_kwargs)
+            batch = batch or 100
+        elif ext_kwargs:
+            raise TypeError(f"Unexpected arguments for stage {name!r}: {', '.join(ext_kwargs)}")
+        elif self.engine is not None and self.engine.config.mode_for(workload) == "processes":
+            func = functools.partial(_in_pool, self.engine.manager_for(workload), func, fanout or batch > 0)
+        self.stages.append(Stage(name, func, workers, queue_size or self.queue_size, fanout, batch, linger))
+        return self
+
+    def _extension_func(self, ext_name: str, kwargs: dict) -> Callable[[List[Any]], Iterable[Any]]:
+        if self.engine is None:
+            raise ValueError("Extension stages need a pipeline created by NetworkEngine.pipeline()")
+        engine = self.engine
+
+        def run_extension(items: List[Any]) -> Iterable[Any]:
+            ext = engine.get_extension(ext_name)
+            ((call_args, call_kwargs),) = ext.batch_calls(items, (), kwargs, 0)
+            result = ext.execute(*call_args, **call_kwargs)
+            return result.items() if isinstance(result, dict) else result or ()
+
+        return run_extension
+
+    def run(
+        self,
+        items: Iterable[Any],
+        progress: Optional[Callable[[List[StageStats]], None]] = None,
+        interval: float = 1.0,
+    ) -> Iterator[Any]:
+        """Stream items through every stage, yielding the last stage's output.
+
+        ``progress`` is called with stats() about every ``interval`` seconds
+        while the pipeline runs, and once at the end. Stopping iteration
+        early stops the pipeline.
+        """
+        if not self.stages:
+            raise ValueError("Pipeline has no stages")
+        if self._threads:
+            raise RuntimeError("Pipeline is already running")
+        self._stop.clear()
+        self._error = None
+        self._started = time.monotonic()
+        self._threads = [threading.Thread(target=self._feed, args=(items,), name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            stage.stats = StageStats(stage.name, stage.workers, queue_size=stage.queue.maxsize)
+            stage._running = stage.workers
+            stage._previous = (0, 0.0)
+            for number in range(stage.workers):
+                self._threads.append(
+                    threading.Thread(
+                        target=self._work, args=(index,), name=f"pipeline-{stage.name}-{number}", daemon=True
+                    )
+                )
+        for thread in self._threads:
+            thread.start()
+
+        next_report = time.monotonic() + interval
+        try:
+            while True:
+                try:
+                    item = self._output.get(timeout=max(0.0, next_report - time.monotonic()) if progress else _POLL)
+                except queue.Empty:
+                    pass
+                else:
+                    if item is _END:
+                        break
+                    yield item
+                if progress and time.monotonic() >= next_report:
+                    progress(self.stats())
+                    next_report = time.monotonic() + interval
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.stop()
+            if progress:
+                progress(self.stats())
+
+    def stats(self) -> List[StageStats]:
+        """Live per-stage throughput, queue depth and error counts."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return [stage.snapshot(elapsed) for stage in self.stages]
+
+    def stop(self):
+        """Stop every stage and wait for the workers to exit."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for stage in self.stages:
+            self._drain(stage.queue)
+        self._drain(self._output)
+
+    def _feed(self, items: Iterable[Any]):
+        """Put the input items on the first stage's queue."""
+        first = self.stages[0]
+        try:
+            for item in items:
+                if not self._put(first.queue, item):
+                    return
+        except Exception as e:
+            self._error = e
+            self.logger.error(f"Pipeline input failed: {e}")
+        for _ in range(first.workers):
+            self._put(first.queue, _END)
+
+    def _work(self, index: int):
+        """Worker loop of stage index."""
+        stage = self.stages[index]
+        target = self.stages[index + 1].queue if index + 1 < len(self.stages) else self._output
+        stats = stage.stats
+        try:
+            while not self._stop.is_set():
+                items = self._take(stage)
+                if items is None:
+                    break
+                ended = items[-1] is _END
+                if ended:
+                    items.pop()
+                if items:
+                    with stage._lock:
+                        stats.received += len(items)
+                        stats.active += 1
+                    try:
+                        results = self._apply(stage, items)
+                    finally:
+                        with stage._lock:
+                            stats.active -= 1
+                    for result in results:
+                        if not self._put(target, result):
+                            return
+                        with stage._lock:
+                            stats.emitted += 1
+                if ended:
+                    break
+        except BaseException as e:
+            # Not a per-item error (_apply() handles those): run() re-raises it.
+            if self._error is None:
+                self._error = e
+        finally:
+            # Pass the end of stream on even after a failure, or downstream workers wait forever.
+            with stage._lock:
+                stage._running -= 1
+                last = stage._running == 0
+                if last:
+                    stats.done = True
+            if last:
+                downstream = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    self._put(target, _END)
+
+    def _apply(self, stage: Stage, items: List[Any]) -> List[Any]:
+        """Run the stage's func, collecting non-None results."""
+        calls = [items] if stage.batch else items
+        results: List[Any] = []
+        for call in calls:
+            try:
+                result = stage.func(call)
+                if stage.fanout:
+                    results.extend(value for value in result or () if value is not None)
+                elif result is not None:
+                    results.append(result)
+            except Exception as e:
+                with stage._lock:
+                    stage.stats.errors += len(call) if stage.batch else 1
+                    stage.stats.last_error = f"{type(e).__name__}: {e}"
+                self.logger.debug("Pipeline stage %s failed: %s", stage.name, e)
+        return results
+
+    def _take(self, stage: Stage) -> Optional[List[Any]]:
+        """Next item, or up to batch items for batch stages; None when stopped."""
+        item = self._get(stage.queue, None)
+        if item is _NOTHING:
+            return None
+        items = [item]
+        if stage.batch and item is not _END:
+            deadline = time.monotonic() + stage.linger
+            while len(items) < stage.batch:
+                try:
+                    item = stage.queue.get_nowait()
+                except queue.Empty:
+                    item = self._get(stage.queue, deadline)
+                    if item is _NOTHING:
+                        break
+                items.append(item)
+                if item is _END:
+                    break
+        return items
+
+    def _get(self, source: "queue.Queue[Any]", deadline: Optional[float]) -> Any:
+        """Block for the next item until stopped or past deadline (then _NOTHING)."""
+        while not self._stop.is_set():
+            timeout = _POLL if deadline is None else min(_POLL, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            try:
+                return source.get(timeout=timeout)
+            except queue.Empty:
+                continue
+        return _NOTHING
+
+    def _put(self, target: "queue.Queue[Any]", item: Any) -> bool:
+        """Block until item fits in target; False if the pipeline was stopped."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _drain(source: "queue.Queue[Any]"):
+        while True:
+            try:
+                source.get_nowait()
+            except queue.Empty:
+                return
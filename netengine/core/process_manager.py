@@ -0,0 +1,126 @@
+"""Process pool backend for CPU-bound work."""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Union
+from .thread_manager import ThreadManager
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+# Names of the blocks this process created and has not unlinked yet.
+_created = set()
+
+
+class ProcessManager(ThreadManager):
+    """ThreadManager with the same submit/map/imap API on a process pool.
+
+    Use it for CPU-bound stages (checksums, regex extraction, JSON parsing of
+    large bodies) that the GIL keeps on one core under threads. Functions and
+    items must be picklable: module-level functions, staticmethods or
+    functools.partial objects, not lambdas or closures. Items are sent in
+    chunks of ``chunksize`` (default 64) to amortize the IPC per task; large
+    payloads should be passed as :class:`SharedBuffer` handles instead of
+    being copied through the pipe.
+    """
+
+    default_chunksize = 64
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize process manager (default: one worker per CPU)."""
+        super().__init__(max_workers or os.cpu_count() or 1)
+
+    def _create_executor(self, max_workers: int) -> Executor:
+        """Create the underlying pool."""
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+
+class SharedBuffer:
+    """Bytes in a shared memory block, passed to worker processes by name.
+
+    Pickling a SharedBuffer sends only its name and size; the worker maps
+    the same memory instead of receiving a copy. The creating process owns
+    the block and must release it with :meth:`unlink` (or use the buffer as
+    a context manager). Requires Python 3.8+.
+    """
+
+    def __init__(self, size: int, name: Optional[str] = None):
+        """Create a new block of size bytes, or attach to an existing one by name."""
+        if shared_memory is None:
+            raise RuntimeError("SharedBuffer requires Python 3.8+ (multiprocessing.shared_memory)")
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+            self._owner = True
+            _created.add(self._shm.name)
+        else:
+            self._shm = _attach(name)
+            self._owner = False
+        self.size = size
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "SharedBuffer":
+        """Copy data into a new shared block."""
+        buffer = cls(len(data))
+        buffer._shm.buf[: len(data)] = data
+        return buffer
+
+    @property
+    def name(self) -> str:
+        """System-wide name of the block."""
+        return self._shm.name
+
+    @property
+    def buf(self) -> memoryview:
+        """Zero-copy view of the data."""
+        return self._shm.buf[: self.size]
+
+    def tobytes(self) -> bytes:
+        """Copy the data out as bytes."""
+        return bytes(self._shm.buf[: self.size])
+
+    def close(self):
+        """Detach this process from the block."""
+        self._shm.close()
+
+    def unlink(self):
+        """Close and free the block (owner only)."""
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            _created.discard(self._shm.name)
+
+    def __reduce__(self):
+        """Pickle by name so workers attach instead of copying."""
+        return (SharedBuffer, (self.size, self.name))
+
+    def __len__(self) -> int:
+        """Size of the data in bytes."""
+        return self.size
+
+    def __enter__(self) -> "SharedBuffer":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit."""
+        self.unlink()
+
+
+def _attach(name: str):
+    """Attach to an existing block without registering it for cleanup here.
+
+    Before Python 3.13 attaching registers the block with the resource
+    tracker, which unlinks it when this process exits. The registration is
+    dropped again unless the tracker is the creator's: a multiprocessing
+    child shares its parent's, and there the creator's unlink() clears it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None and name not in _created:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
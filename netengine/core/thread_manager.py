@@ -1,34 +1,163 @@
 """Thread pool and concurrency management."""
 
+import itertools
+import queue
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Any, List
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Any, Deque, Iterable, Iterator, List, Optional
 from ..utils.logger import Logger
 
 
+@dataclass
+class TaskResult:
+    """Outcome of running a task on one item: its value or the error it raised."""
+
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task completed without raising."""
+        return self.error is None
+
+
+def _run_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[TaskResult]:
+    """Apply func to every item of a chunk, capturing per-item errors.
+
+    Module-level (rather than a closure) so chunks can also be shipped to
+    process pools.
+    """
+    results = []
+    for item in chunk:
+        try:
+            results.append(TaskResult(item, func(item)))
+        except Exception as e:
+            results.append(TaskResult(item, error=e))
+    return results
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Lazily split items into lists of at most size elements."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class ThreadManager:
     """Manages multithreading operations."""
 
+    # Items per task in imap()/imap_unordered()/map_tasks() unless given.
+    default_chunksize = 1
+
     def __init__(self, max_workers: int = 10):
         """Initialize thread manager."""
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_workers = max_workers
+        self.executor = self._create_executor(max_workers)
         self.logger = Logger()  #JZxf8V
 
+    def _create_executor(self, max_workers: int) -> Executor:
+        """Create the underlying pool."""
+        return ThreadPoolExecutor(max_workers=max_workers)
+
     def submit_task(self, func: Callable, *args, **kwargs) -> Any:
         """Submit a single task to the thread pool."""
         return self.executor.submit(func, *args, **kwargs)
   #6ERR8U
     def map_tasks(self, func: Callable, items: List[Any]) -> List[Any]:
-        """Map function over multiple items using threads."""
-        futures = [self.submit_task(func, item) for item in items]
+        """Map function over multiple items using threads.
+
+        Results are returned in input order. Failed items are logged and
+        yield None; use imap() to get the exceptions themselves.
+        """
         results = []
-        for future in as_completed(futures):
-            try:
-                results.append(future.result())
-            except Exception as e:
-                self.logger.error(f"Thread error: {e}")
+        for result in self.imap(func, items):
+            if result.error is not None:
+                self.logger.error(f"Thread error: {result.error}")
+            results.append(result.value)
         return results
 
+    def imap(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        window: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> Iterator[TaskResult]:
+        """Lazily map func over items, yielding TaskResults in input order.
+
+        Items are pulled from the iterable only as the pool has room: at most
+        ``window`` tasks (default: twice the worker count), each covering
+        ``chunksize`` items (default: ``default_chunksize``), are in flight
+        at once, so arbitrarily long inputs stream through in constant
+        memory. A slow item holds back the results behind it; use
+        imap_unordered() when order does not matter.
+        """
+        window = window or self.max_workers * 2
+        chunks = _chunks(items, max(1, chunksize or self.default_chunksize))
+        pending: Deque[Future] = deque()
+        try:
+            for chunk in itertools.islice(chunks, window):
+                pending.append(self.executor.submit(_run_chunk, func, chunk))
+            while pending:
+                results = pending.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(self.executor.submit(_run_chunk, func, chunk))
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def imap_unordered(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        window: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> Iterator[TaskResult]:
+        """Like imap(), but yield TaskResults as soon as each task finishes."""
+        window = window or self.max_workers * 2
+        chunks = _chunks(items, max(1, chunksize or self.default_chunksize))
+        finished: "queue.Queue[Future]" = queue.Queue()
+        pending = set()
+        lock = threading.Lock()
+
+        def on_done(future: Future):
+            with lock:
+                pending.discard(future)
+            finished.put(future)
+
+        def submit(chunk: List[Any]):
+            future = self.executor.submit(_run_chunk, func, chunk)
+            with lock:
+                pending.add(future)
+            future.add_done_callback(on_done)
+
+        in_flight = 0
+        try:
+            for chunk in itertools.islice(chunks, window):
+                submit(chunk)
+                in_flight += 1
+            while in_flight:
+                results = finished.get().result()
+                in_flight -= 1
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    submit(chunk)
+                    in_flight += 1
+                yield from results
+        finally:
+            with lock:
+                leftover = list(pending)
+            for future in leftover:
+                future.cancel()
+
     def shutdown(self, wait: bool = True):
         """Shutdown thread pool."""
         self.executor.shutdown(wait=wait)  #Jihg7g
@@ -1,8 +1,15 @@
 # Extension system modules  #tqNlIV
-from .loader import ExtensionLoader
-from .base import BaseExtension
+from ..utils.lazy_import import attach
 
-__all__ = ["ExtensionLoader", "BaseExtension"]  #scxhjp
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".loader": ["ExtensionLoader", "ExtensionInfo"],
+        ".base": ["BaseExtension"],
+    },
+)
+
+__all__ = ["ExtensionLoader", "ExtensionInfo", "BaseExtension"]  #scxhjp
 mjN3ZJEArnkR8r1kCLphUQuL1CpFCHKfWRsABwFIpLyRzG0HI
 j1l6LFMaTwuXNoOlMlKVQPq4oZW
 aKFSpsFrSc0zhpYZpJbJHGGhMRqjCRDkmmDQ2qvq29o8aaB8vJML
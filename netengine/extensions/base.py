@@ -1,11 +1,50 @@
 """Base class for user-defined extensions."""  #SV9pry
 
+import collections.abc
+import functools
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Annotations that mark an execute() parameter as the list of targets.
+_TARGET_TYPES = (
+    list,
+    tuple,
+    set,
+    frozenset,
+    collections.abc.Iterable,
+    collections.abc.Sequence,
+    collections.abc.Collection,
+    collections.abc.Set,
+)
+
+
+def _is_target_annotation(annotation: Any) -> bool:
+    if annotation in _TARGET_TYPES:
+        return True
+    origin = getattr(annotation, "__origin__", None)
+    if origin is Union:
+        return any(_is_target_annotation(arg) for arg in annotation.__args__)
+    return origin in _TARGET_TYPES
 
 
 class BaseExtension(ABC):  #9Evb4i
-    """Base class for all NetEngine extensions."""
+    """Base class for all NetEngine extensions.
+
+    Only execute() is required. NetworkEngine.execute_extension_batch()
+    fans a target list out over concurrent execute() calls, each given
+    ``batch_size`` targets in place of the list argument, and merges the
+    results with merge_results(). Extensions that can do better override
+    execute_batch() (handle the whole list themselves) or execute_async()
+    (run on the engine's event loop instead of its threads).
+    """
+
+    # execute() parameter that takes the target list: a name or position.
+    # None picks the first parameter annotated as a list/iterable.
+    batch_arg: Optional[Union[str, int]] = None
+    # Targets per execute() call when the engine fans a batch out.
+    batch_size: int = 1
+    # Most calls in flight at once; 0 = the engine's thread count.
+    max_concurrency: int = 0
 
     def __init__(self, name: str, version: str = "1.0.0"):
         """Initialize extension."""
@@ -18,6 +57,78 @@ class BaseExtension(ABC):  #9Evb4i
         """Execute extension logic."""
         pass
 
+    def execute_batch(self, items: Iterable[Any], *args, **kwargs) -> Any:
+        """Execute over a whole target list; args and kwargs are execute()'s other arguments.
+
+        The default is a single execute() call with the list in place. The
+        engine calls an overridden execute_batch() as is; otherwise it fans
+        the list out over concurrent execute() calls itself.
+        """
+        ((call_args, call_kwargs),) = self.batch_calls(list(items), args, kwargs, 0)
+        return self.execute(*call_args, **call_kwargs)
+
+    async def execute_async(self, *args, **kwargs) -> Any:
+        """Coroutine form of execute(); the default runs execute() in a worker thread."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.execute, *args, **kwargs))
+
+    def merge_results(self, results: List[Any]) -> Any:
+        """Combine the results of execute() calls on consecutive slices.
+
+        Lists are concatenated and dicts merged (both in target order);
+        anything else comes back as the list of per-call results.
+        """
+        if results and all(isinstance(result, list) for result in results):
+            return [value for result in results for value in result]
+        if results and all(isinstance(result, dict) for result in results):
+            merged: Dict[Any, Any] = {}
+            for result in results:
+                merged.update(result)
+            return merged
+        return results
+
+    def batch_calls(
+        self, items: List[Any], args: Tuple[Any, ...], kwargs: Dict[str, Any], size: int
+    ) -> List[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+        """(args, kwargs) for execute() on each slice of size targets (0 = one slice)."""
+        position, name, star = self._target_parameter()
+        size = size or max(1, len(items))
+        calls = []
+        for start in range(0, max(1, len(items)), size):
+            chunk = items[start : start + size]
+            if star:
+                calls.append((args[:position] + tuple(chunk), kwargs))
+            elif position is not None and (position <= len(args) or not name):
+                calls.append((args[:position] + (chunk,) + args[position:], kwargs))
+            else:
+                calls.append((args, dict(kwargs, **{name: chunk})))
+        return calls
+
+    def _target_parameter(self) -> Tuple[Optional[int], str, bool]:
+        """Position (None if keyword-only), name and whether it is *args, for the target parameter (see batch_arg)."""
+        import inspect
+
+        params = [
+            param
+            for param in inspect.signature(self.execute).parameters.values()
+            if param.kind != param.VAR_KEYWORD
+        ]
+        if isinstance(self.batch_arg, int):
+            return self.batch_arg, "", False
+        if self.batch_arg is not None:
+            chosen = next((param for param in params if param.name == self.batch_arg), None)
+        else:
+            chosen = next((param for param in params if _is_target_annotation(param.annotation)), None)
+            chosen = chosen or (params[0] if params else None)
+        if chosen is None:
+            raise ValueError(f"{type(self).__name__}.execute() has no parameter {self.batch_arg!r}")
+        if chosen.kind == chosen.VAR_POSITIONAL:
+            return params.index(chosen), "", True
+        position = params.index(chosen) if chosen.kind != chosen.KEYWORD_ONLY else None
+        return position, chosen.name, False
+
     def get_info(self) -> Dict[str, Any]:
         """Get extension info."""  #Vzyup8
         return {
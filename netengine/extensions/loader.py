@@ -1,32 +1,154 @@
 """Extension loader and manager."""
 
+import ast
+import json
+import os
 import sys
+import importlib
 import importlib.util  #wZ1JJP
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from ..utils.logger import Logger
 from .base import BaseExtension
 
+ENTRY_POINT_GROUP = "netengine.extensions"
+MANIFEST_VERSION = 1
+# Directories searched besides the ones passed in (os.pathsep-separated).
+PATH_ENV = "NETENGINE_EXTENSIONS"
+DEFAULT_PATHS = ("~/.netengine/extensions",)
+# Extension modules are imported under this prefix so an alias like "dns"
+# cannot shadow a real package in sys.modules.
+MODULE_PREFIX = "netengine_ext_"
+
+
+@dataclass
+class ExtensionInfo:
+    """Manifest entry: what an extension is and where it lives, without importing it."""
+
+    name: str
+    version: str
+    class_name: str
+    path: str = ""
+    mtime: float = 0.0
+    title: str = ""
+    entry_point: str = ""
+
+    def __str__(self) -> str:
+        """One-line summary."""
+        where = self.entry_point or self.path
+        return f"{self.name} v{self.version} ({self.class_name} in {where})"
+
+
+def default_manifest_path() -> str:
+    """Manifest location: $XDG_CACHE_HOME/netengine/extensions.json."""
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "netengine", "extensions.json")
+
+
+def _literal(node: ast.AST) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _base_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+
+def scan_source(path: str) -> List[ExtensionInfo]:
+    """Find BaseExtension subclasses in a source file by parsing, not importing, it.
+
+    The declared name and version are read from a literal
+    ``super().__init__("Name", "1.2.3")`` call in the class's __init__.
+    Classes that another class in the file derives from are left out. A
+    file with one extension names it after the file; with several, each
+    is named "file.ClassName".
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    found: Dict[str, ast.ClassDef] = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(
+            _base_name(base) == "BaseExtension" or _base_name(base) in found for base in node.bases
+        ):
+            found[node.name] = node
+    stem = Path(path).stem
+    infos: List[ExtensionInfo] = []
+    for class_name, node in found.items():
+        # A subclass that does not pass its own name inherits its parent's.
+        parent = next((i for i in infos for base in node.bases if _base_name(base) == i.class_name), None)
+        title, version = (parent.title, parent.version) if parent else (class_name, "1.0.0")
+        for item in node.body:
+            if not (isinstance(item, ast.FunctionDef) and item.name == "__init__"):
+                continue
+            for call in ast.walk(item):
+                if (
+                    isinstance(call, ast.Call)
+                    and isinstance(call.func, ast.Attribute)
+                    and call.func.attr == "__init__"
+                    and call.args
+                ):
+                    values = [_literal(arg) for arg in call.args[:2]]
+                    if isinstance(values[0], str):
+                        title = values[0]
+                    if len(values) > 1 and isinstance(values[1], str):
+                        version = values[1]
+                    break
+        infos.append(ExtensionInfo(stem, version, class_name, path, title=title))
+    extended = {_base_name(base) for node in found.values() for base in node.bases}
+    infos = [info for info in infos if info.class_name not in extended]
+    if len(infos) > 1:
+        for info in infos:
+            info.name = f"{stem}.{info.class_name}"
+    return infos
+
+
+def _split_class(filepath: str) -> Tuple[str, str]:
+    """Split "file.py:ClassName" into (path, class name); plain paths give ""."""
+    path, sep, class_name = filepath.rpartition(":")
+    if sep and path.endswith(".py") and class_name.isidentifier():
+        return path, class_name
+    return filepath, ""
+
 
 class ExtensionLoader:
-    """Load and manage user-defined extensions."""
+    """Load and manage user-defined extensions.
+
+    Besides eager load(), extensions can be discovered in directories and
+    through the ``netengine.extensions`` entry-point group. Discovery
+    parses source files instead of importing them and keeps the results in
+    a JSON manifest keyed by path, mtime and size, so later runs only
+    re-parse files that changed. An extension's module is imported the
+    first time it is required; imports go through the standard source
+    loader, which reuses the bytecode in ``__pycache__``.
+    """
 
-    def __init__(self, logger: Optional[Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        paths: Optional[Iterable[str]] = None,
+        manifest_path: Optional[str] = None,
+    ):
         """Initialize extension loader."""
         self.logger = logger or Logger()  #mKpxzz
         self.loaded: dict = {}
+        self.paths = list(paths or [])
+        self.manifest_path = manifest_path or default_manifest_path()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._index: Optional[Dict[str, ExtensionInfo]] = None
+        self._entry_points: Optional[Dict[str, ExtensionInfo]] = None
+        self._dirty = False
 
     def load(self, name: str, filepath: str) -> BaseExtension:
         """Load extension from file."""
         try:
-            spec = importlib.util.spec_from_file_location(name, filepath)
-            if not spec or not spec.loader:
-                raise ValueError(f"Cannot load module from {filepath}")
-
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[name] = module
-            spec.loader.exec_module(module)
-
+            module = self._import_file(name, filepath)
             for attr_name in dir(module):
                 attr = getattr(module, attr_name)
                 if isinstance(attr, type) and issubclass(attr, BaseExtension) and attr != BaseExtension:
@@ -40,6 +162,211 @@ class ExtensionLoader:
             self.logger.error(f"Failed to load extension: {e}")
             raise
 
+    def register(self, name: str, filepath: str) -> ExtensionInfo:
+        """Make the extension in filepath available as name, without importing it.
+
+        A file that defines several extensions needs the class picked as
+        "file.py:ClassName". The registration is saved in the manifest, so
+        it lasts across runs.
+        """
+        filepath, class_name = _split_class(filepath)
+        path = os.path.abspath(filepath)
+        info = self._pick(path, class_name)
+        spec = f"{path}:{class_name}" if class_name else path
+        manifest = self._load_manifest()
+        if manifest["registered"].get(name) != spec:
+            manifest["registered"][name] = spec
+            self._dirty = True
+        self._save_manifest()
+        self.logger.debug("Extension registered: %s -> %s", name, info)
+        return ExtensionInfo(name, info.version, info.class_name, path, info.mtime, info.title)
+
+    def discover(self, paths: Optional[Iterable[str]] = None) -> Dict[str, ExtensionInfo]:
+        """Index the extensions in the search directories (nothing is imported)."""
+        index: Dict[str, ExtensionInfo] = {}
+        for directory in self._search_paths(paths):
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".py") and not entry.name.startswith("_") and entry.is_file():
+                    for info in self._scan_cached(entry.path, entry.stat()):
+                        index.setdefault(info.name, info)
+        manifest = self._load_manifest()
+        for name, spec in manifest["registered"].items():
+            path, class_name = _split_class(spec)
+            if not os.path.isfile(path):
+                continue
+            try:
+                info = self._pick(path, class_name)
+            except ValueError as e:
+                self.logger.warning("Skipping registered extension %s: %s", name, e)
+                continue
+            index[name] = ExtensionInfo(name, info.version, info.class_name, path, info.mtime, info.title)
+        self._save_manifest()
+        self._index = index
+        return index
+
+    def entry_points(self) -> Dict[str, ExtensionInfo]:
+        """Extensions advertised by installed packages (entry points are not loaded)."""
+        if self._entry_points is not None:
+            return self._entry_points
+        found: Dict[str, ExtensionInfo] = {}
+        try:
+            from importlib import metadata as importlib_metadata
+        except ImportError:  # Python < 3.8
+            importlib_metadata = None
+        if importlib_metadata is not None:
+            try:
+                points = importlib_metadata.entry_points()
+                if hasattr(points, "select"):
+                    points = points.select(group=ENTRY_POINT_GROUP)
+                else:  # Python < 3.10: dict of group -> entry points
+                    points = points.get(ENTRY_POINT_GROUP, [])
+                for point in points:
+                    dist = getattr(point, "dist", None)
+                    version = getattr(dist, "version", "") or "0"
+                    class_name = point.value.partition(":")[2] or point.name
+                    found[point.name] = ExtensionInfo(point.name, version, class_name, entry_point=point.value)
+            except Exception as e:
+                self.logger.debug("Entry point discovery failed: %s", e)
+        self._entry_points = found
+        return found
+
+    def available(self) -> Dict[str, ExtensionInfo]:
+        """Every extension that can be required: discovered, registered or installed."""
+        index = dict(self.entry_points())
+        index.update(self.discover())
+        return index
+
+    def find(self, name: str) -> Optional[ExtensionInfo]:
+        """Manifest entry for name (file stem, registered alias or declared name)."""
+        index = self._index if self._index is not None else self.discover()
+        info = index.get(name)
+        if info is None:
+            info = self.entry_points().get(name)
+        if info is None:
+            lowered = name.lower()
+            info = next((i for i in index.values() if i.title.lower() == lowered), None)
+        return info
+
+    def require(self, name: str) -> BaseExtension:
+        """Return the extension instance, importing its module on first use."""
+        ext = self.loaded.get(name)
+        if ext is not None:
+            return ext
+        info = self.find(name)
+        if info is None:
+            raise ValueError(f"Extension '{name}' not found")
+        try:
+            if info.entry_point:
+                module_name, _, attr_path = info.entry_point.partition(":")
+                cls: Any = importlib.import_module(module_name)
+                for attr in filter(None, attr_path.split(".")):
+                    cls = getattr(cls, attr)
+            else:
+                cls = getattr(self._import_file(info.name, info.path), info.class_name, None)
+                if cls is None:
+                    raise ValueError(f"{info.class_name} not found in {info.path}")
+            ext = cls()
+        except Exception as e:
+            self.logger.error(f"Failed to load extension: {e}")
+            raise
+        self.loaded[name] = ext
+        self.logger.debug("Extension loaded: %s v%s", name, ext.version)
+        return ext
+
+    def _pick(self, path: str, class_name: str = "") -> ExtensionInfo:
+        """The extension class_name in path, or its only one; ValueError otherwise."""
+        infos = self._scan_cached(path)
+        if class_name:
+            infos = [info for info in infos if info.class_name == class_name]
+            if not infos:
+                raise ValueError(f"No BaseExtension {class_name} found in {path}")
+        if not infos:
+            raise ValueError(f"No BaseExtension found in {path}")
+        if len(infos) > 1:
+            classes = ", ".join(info.class_name for info in infos)
+            raise ValueError(f"{path} defines several extensions ({classes}); pick one as {path}:ClassName")
+        return infos[0]
+
+    def _import_file(self, name: str, filepath: str):
+        """Import a source file as a private module (bytecode cached as usual)."""
+        module_name = MODULE_PREFIX + name.replace(".", "_")
+        spec = importlib.util.spec_from_file_location(module_name, filepath)
+        if not spec or not spec.loader:
+            raise ValueError(f"Cannot load module from {filepath}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        return module
+
+    def _search_paths(self, paths: Optional[Iterable[str]]) -> List[str]:
+        extra = [p for p in os.environ.get(PATH_ENV, "").split(os.pathsep) if p]
+        chosen = list(paths) if paths is not None else self.paths + extra + list(DEFAULT_PATHS)
+        return [os.path.abspath(os.path.expanduser(p)) for p in chosen]
+
+    def _scan_cached(self, path: str, stat: Optional[os.stat_result] = None) -> List[ExtensionInfo]:
+        """scan_source() through the manifest: re-parse only when mtime/size changed."""
+        try:
+            stat = stat or os.stat(path)
+        except OSError:
+            return []
+        files = self._load_manifest()["files"]
+        cached = files.get(path)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return [ExtensionInfo(**info) for info in cached["extensions"]]
+        try:
+            infos = scan_source(path)
+        except (SyntaxError, ValueError, OSError, UnicodeDecodeError) as e:
+            self.logger.warning("Skipping extension file %s: %s", path, e)
+            infos = []
+        for info in infos:
+            info.mtime = stat.st_mtime
+        files[path] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "extensions": [asdict(info) for info in infos],
+        }
+        self._dirty = True
+        return infos
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            manifest = None
+            try:
+                with open(self.manifest_path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+                manifest = {"version": MANIFEST_VERSION, "files": {}, "registered": {}}
+            self._manifest = manifest
+        return self._manifest
+
+    def _save_manifest(self):
+        """Write the manifest if it changed (atomically; failures are not fatal)."""
+        if not self._dirty:
+            return
+        # Forget files that were deleted since they were indexed.
+        files = self._manifest["files"]
+        for path in [p for p in files if not os.path.exists(p)]:
+            del files[path]
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            temp = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(temp, "w") as f:
+                json.dump(self._manifest, f)
+            os.replace(temp, self.manifest_path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.debug("Cannot write extension manifest %s: %s", self.manifest_path, e)
+
     def unload(self, name: str):
         """Unload extension."""
         if name in self.loaded:
@@ -1,6 +1,42 @@
 # Networking modules
-from .socket_handler import SocketHandler
-from .icmp import ICMPHandler
-from .tcp_udp import TCPHandler, UDPHandler
+from ..utils.lazy_import import attach
 
-__all__ = ["SocketHandler", "ICMPHandler", "TCPHandler", "UDPHandler"]
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".socket_handler": ["SocketHandler"],
+        ".multiplexer": ["SocketMultiplexer", "Channel"],
+        ".icmp": ["ICMPHandler"],
+        ".ping_sweep": ["PingSweeper", "PingStats"],
+        ".tcp_udp": ["TCPHandler", "UDPHandler"],
+        ".udp_batch": ["UDPEndpoint", "UDPStats", "ProbeResult"],
+        ".async_scan": ["AsyncTCPScanner", "ScanResult"],
+        ".banner": ["BannerGrabber", "BannerResult"],
+        ".dns": ["DNSResolver", "DNSCache", "DNSAnswer"],
+        ".subdomain_enum": ["SubdomainEnumerator", "SubdomainResult", "read_wordlist"],
+    },
+)
+
+__all__ = [
+    "SocketHandler",
+    "SocketMultiplexer",
+    "Channel",
+    "ICMPHandler",
+    "PingSweeper",
+    "PingStats",
+    "TCPHandler",
+    "UDPHandler",
+    "UDPEndpoint",
+    "UDPStats",
+    "ProbeResult",
+    "AsyncTCPScanner",
+    "ScanResult",
+    "BannerGrabber",
+    "BannerResult",
+    "DNSResolver",
+    "DNSCache",
+    "DNSAnswer",
+    "SubdomainEnumerator",
+    "SubdomainResult",
+    "read_wordlist",
+]
@@ -0,0 +1,154 @@
+"""Asyncio TCP connect scanner with bounded concurrency."""
+
+import asyncio
+import errno
+import socket
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+from ..utils.logger import Logger
+from ..utils.aio import bounded_as_completed, iter_async
+
+OPEN = "open"
+CLOSED = "closed"
+FILTERED = "filtered"
+
+# Errors that mean the host actively rejected the connection.
+_CLOSED_ERRNOS = {errno.ECONNREFUSED, errno.ECONNRESET}
+
+
+@dataclass
+class ScanResult:
+    """Outcome of a single TCP connect probe."""
+
+    host: str
+    port: int
+    state: str
+    latency: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the port accepted the connection."""
+        return self.state == OPEN
+
+
+class HostRateLimiter:
+    """Per-host connection rate limiter (connections per second)."""
+
+    def __init__(self, rate: float = 0.0):
+        """Initialize rate limiter; a rate of 0 disables limiting."""
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        """Wait until the next connection slot for host is available."""
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncTCPScanner:
+    """TCP connect scanner keeping many non-blocking connects in flight."""
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        concurrency: int = 1000,
+        timeout: float = 2.0,
+        rate_limit: float = 0.0,
+    ):
+        """Initialize scanner.
+
+        ``concurrency`` caps the number of simultaneous connects and
+        ``rate_limit`` caps new connections per second to any single host.
+        """
+        self.logger = logger or Logger()
+        self.concurrency = self._clamp_concurrency(max(1, concurrency))
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self._limiter = HostRateLimiter(rate_limit)
+        self._lookups: Dict[str, "asyncio.Future"] = {}
+
+    def scan(self, targets: Iterable[Tuple[str, int]]) -> Iterator[ScanResult]:
+        """Scan (host, port) targets, yielding results as they arrive."""
+        return iter_async(self.scan_async(targets))
+
+    async def scan_async(self, targets: Iterable[Tuple[str, int]]) -> AsyncIterator[ScanResult]:
+        """Async variant of scan() for use inside a running event loop."""
+        self._limiter = HostRateLimiter(self.rate_limit)
+        self._lookups = {}
+        async for result in bounded_as_completed(self._probe, targets, self.concurrency):
+            yield result
+
+    async def _probe(self, target: Tuple[str, int]) -> ScanResult:
+        """Attempt a single TCP connect."""
+        host, port = target
+        try:
+            address = await self._resolve(host)
+        except OSError as e:
+            self.logger.debug("Hostname resolution failed: %s", host)
+            return ScanResult(host, port, FILTERED, error=str(e))
+
+        await self._limiter.wait(host)
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (address, port)), self.timeout)
+            return ScanResult(host, port, OPEN, latency=time.monotonic() - start)
+        except asyncio.TimeoutError:
+            return ScanResult(host, port, FILTERED, error="timeout")
+        except OSError as e:
+            state = CLOSED if e.errno in _CLOSED_ERRNOS else FILTERED
+            return ScanResult(host, port, state, latency=time.monotonic() - start, error=str(e))
+        finally:
+            sock.close()
+
+    async def _resolve(self, host: str) -> str:
+        """Resolve host once and share the lookup between its probes."""
+        lookup = self._lookups.get(host)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._lookup(host))
+            self._lookups[host] = lookup
+        address = await asyncio.shield(lookup)
+        if address is None:
+            raise socket.gaierror(f"Cannot resolve {host}")
+        return address
+
+    async def _lookup(self, host: str) -> Optional[str]:
+        """Resolve host to an IPv4 address, or None if it cannot be resolved."""
+        try:
+            socket.inet_aton(host)
+            return host
+        except OSError:
+            pass
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        except OSError:
+            return None
+        return infos[0][4][0]
+
+    def _clamp_concurrency(self, concurrency: int) -> int:
+        """Keep concurrency below the process file descriptor limit."""
+        try:
+            import resource
+
+            soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        except (ImportError, ValueError, OSError):
+            return concurrency
+        if soft == resource.RLIM_INFINITY:
+            return concurrency
+        ceiling = max(1, soft - 64)
+        if concurrency > ceiling:
+            self.logger.warning(
+                f"Concurrency {concurrency} exceeds file descriptor limit, using {ceiling}"
+            )
+            return ceiling
+        return concurrency
@@ -0,0 +1,273 @@
+"""Concurrent, probe-driven TCP banner grabbing."""
+
+import asyncio
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..utils.logger import Logger
+from ..utils.aio import iter_async
+from .async_scan import AsyncTCPScanner
+
+NULL = "null"
+
+# TLS 1.2 suites (ECDHE, then RSA key exchange). TLS 1.3 is left out on
+# purpose: a 1.2 handshake sends the certificate in the clear.
+_TLS_CIPHERS = (0xC02B, 0xC02F, 0xC02C, 0xC030, 0xCCA9, 0xCCA8, 0xC013, 0xC014, 0x009C, 0x009D, 0x002F, 0x0035)
+_TLS_GROUPS = (0x001D, 0x0017, 0x0018)
+_TLS_SIGNATURES = (0x0403, 0x0804, 0x0401, 0x0503, 0x0805, 0x0501, 0x0806, 0x0601, 0x0201)
+
+
+def _tls_extension(kind: int, data: bytes) -> bytes:
+    return struct.pack("!HH", kind, len(data)) + data
+
+
+def _u16_list(values: Tuple[int, ...]) -> bytes:
+    return struct.pack(f"!H{len(values)}H", 2 * len(values), *values)
+
+
+def tls_client_hello(server_name: Optional[str] = None) -> bytes:
+    """A TLS 1.2 ClientHello record (with SNI when server_name is a host name)."""
+    extensions = (
+        _tls_extension(10, _u16_list(_TLS_GROUPS))
+        + _tls_extension(11, b"\x01\x00")
+        + _tls_extension(13, _u16_list(_TLS_SIGNATURES))
+    )
+    if server_name and not _is_ip(server_name):
+        name = server_name.encode("idna")
+        entry = struct.pack("!BH", 0, len(name)) + name
+        extensions = _tls_extension(0, struct.pack("!H", len(entry)) + entry) + extensions
+    body = (
+        b"\x03\x03"
+        + os.urandom(32)
+        + b"\x00"
+        + _u16_list(_TLS_CIPHERS)
+        + b"\x01\x00"
+        + struct.pack("!H", len(extensions))
+        + extensions
+    )
+    handshake = b"\x01" + len(body).to_bytes(3, "big") + body
+    return b"\x16\x03\x01" + struct.pack("!H", len(handshake)) + handshake
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        socket.inet_aton(host)
+        return True
+    except OSError:
+        return ":" in host
+
+
+def _http_probe(host: str) -> bytes:
+    return f"GET / HTTP/1.0\r\nHost: {host}\r\nUser-Agent: NetEngine/1.0\r\nAccept: */*\r\n\r\n".encode()
+
+
+# Fallback probes, by name: payload for a host. The null probe sends
+# nothing and waits for services that speak first (SSH, SMTP, FTP, ...).
+PROBES: Dict[str, Callable[[str], bytes]] = {
+    "http": _http_probe,
+    "tls": tls_client_hello,
+    # Makes SMTP/FTP/POP-style servers that wait for a command answer.
+    "help": lambda host: b"HELP\r\n",
+    "generic": lambda host: b"\r\n\r\n",
+}
+DEFAULT_PROBES = ("http", "tls", "help", "generic")
+
+# Ports whose clients speak first: the null probe would only waste its wait.
+PORT_PROBES: Dict[int, Tuple[str, ...]] = {
+    **{port: ("http",) for port in (80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8088, 8888, 9000, 9200)},
+    **{port: ("tls", "http") for port in (443, 465, 636, 853, 990, 992, 993, 994, 995, 5986, 8443, 9443)},
+}
+
+# Banner prefix -> service name, checked in order.
+SIGNATURES: List[Tuple[bytes, str]] = [
+    (b"SSH-", "ssh"),
+    (b"HTTP/", "http"),
+    (b"\x16\x03", "tls"),
+    (b"\x15\x03", "tls"),
+    (b"+OK", "pop3"),
+    (b"* OK", "imap"),
+    (b"* PREAUTH", "imap"),
+    (b"RFB ", "vnc"),
+    (b"-ERR", "redis"),
+    (b"AMQP", "amqp"),
+]
+
+
+def identify(banner: bytes) -> Optional[str]:
+    """Best-effort service name for a banner."""
+    for prefix, service in SIGNATURES:
+        if banner.startswith(prefix):
+            return service
+    if banner[:3] in (b"214", b"220", b"421", b"500", b"502"):
+        head = banner[:200].upper()
+        if b"FTP" in head:
+            return "ftp"
+        if b"SMTP" in head or b"MAIL" in head:
+            return "smtp"
+        return "ftp/smtp"
+    if banner.lstrip().startswith(b"<"):
+        return "html"
+    return None
+
+
+def _complete(data: bytes) -> bool:
+    """True if data ends with a line that ends the greeting.
+
+    Line-oriented services (SSH, FTP, SMTP, POP3, ...) finish their banner
+    with a newline; "220-"-style lines announce more to come. Stopping here
+    saves waiting out the idle gap on connections that stay open.
+    """
+    if not data.endswith(b"\n"):
+        return False
+    last = data[data.rfind(b"\n", 0, len(data) - 1) + 1 :]
+    if last[3:4] == b"-" and last[:3].isdigit():
+        return False
+    # An HTTP response is only complete after its header block.
+    return not data.startswith(b"HTTP/") or b"\r\n\r\n" in data or b"\n\n" in data
+
+
+@dataclass
+class BannerResult:
+    """Banner read from one port (empty if the service stayed silent)."""
+
+    host: str
+    port: int
+    banner: bytes = b""
+    probe: Optional[str] = None
+    service: Optional[str] = None
+    latency: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the service sent anything."""
+        return bool(self.banner)
+
+    @property
+    def text(self) -> str:
+        """Banner as printable text (undecodable bytes escaped)."""
+        return self.banner.decode("utf-8", "backslashreplace").strip()
+
+    def __str__(self) -> str:
+        """One-line summary."""
+        if not self.banner:
+            return f"{self.host}:{self.port} {self.error or 'no banner'}"
+        if self.service == "tls":
+            return f"{self.host}:{self.port} [tls/{self.probe}] TLS handshake reply ({len(self.banner)} bytes)"
+        first_line = self.text.splitlines()[0] if self.text else ""
+        return f"{self.host}:{self.port} [{self.service or '?'}/{self.probe}] {first_line[:100]}"
+
+
+class BannerGrabber(AsyncTCPScanner):
+    """Grab banners from many open ports concurrently.
+
+    Each port first gets the null probe (connect and wait ``wait`` seconds
+    for the service to speak), then the fallback probes in order (HTTP
+    request, TLS ClientHello, HELP, blank lines) until one gets a reply;
+    ports in PORT_PROBES skip straight to their usual probes. Reads stop
+    at ``max_bytes``, at the probe's deadline, at the end of a complete
+    text greeting, or once the service has been quiet for ``idle`` seconds
+    after its first bytes. Results stream out in completion order.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        concurrency: int = 1000,
+        timeout: float = 2.0,
+        wait: float = 2.0,
+        read_timeout: float = 3.0,
+        idle: float = 0.2,
+        max_bytes: int = 1024,
+        probes: Iterable[str] = DEFAULT_PROBES,
+        rate_limit: float = 0.0,
+    ):
+        """Initialize grabber; timeout applies to each connect."""
+        super().__init__(logger, concurrency=concurrency, timeout=timeout, rate_limit=rate_limit)
+        self.wait = wait
+        self.read_timeout = read_timeout
+        self.idle = idle
+        self.max_bytes = max_bytes
+        self.probes = tuple(probes)
+        unknown = [name for name in self.probes if name not in PROBES]
+        if unknown:
+            raise ValueError(f"Unknown banner probes: {', '.join(unknown)}")
+
+    def grab(self, targets: Iterable[Tuple[str, int]]) -> Iterator[BannerResult]:
+        """Grab banners from (host, port) targets, yielding results as they arrive."""
+        return iter_async(self.grab_async(targets))
+
+    async def grab_async(self, targets: Iterable[Tuple[str, int]]) -> AsyncIterator[BannerResult]:
+        """Async variant of grab() for use inside a running event loop."""
+        async for result in self.scan_async(targets):
+            yield result
+
+    def probe_order(self, port: int) -> Tuple[str, ...]:
+        """Probes tried on port, in order."""
+        hinted = PORT_PROBES.get(port)
+        if hinted is None:
+            return (NULL,) + self.probes
+        return hinted + tuple(name for name in self.probes if name not in hinted)
+
+    async def _probe(self, target: Tuple[str, int]) -> BannerResult:
+        """Try the probes on one port until the service answers."""
+        host, port = target
+        try:
+            address = await self._resolve(host)
+        except OSError as e:
+            return BannerResult(host, port, error=str(e))
+
+        loop = asyncio.get_running_loop()
+        sock: Optional[socket.socket] = None
+        start = time.monotonic()
+        try:
+            for name in self.probe_order(port):
+                if sock is None:
+                    await self._limiter.wait(host)
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    await asyncio.wait_for(loop.sock_connect(sock, (address, port)), self.timeout)
+                    start = time.monotonic()
+                if name != NULL:
+                    await loop.sock_sendall(sock, PROBES[name](host))
+                banner, closed = await self._read(loop, sock, self.wait if name == NULL else self.read_timeout)
+                if banner:
+                    return BannerResult(host, port, banner, name, identify(banner), time.monotonic() - start)
+                # A silent connection is still clean after the null probe;
+                # after anything else the next probe gets a fresh one.
+                if closed or name != NULL:
+                    sock.close()
+                    sock = None
+            return BannerResult(host, port, latency=time.monotonic() - start, error="no banner")
+        except asyncio.TimeoutError:
+            return BannerResult(host, port, error="connect timeout")
+        except OSError as e:
+            return BannerResult(host, port, error=str(e))
+        finally:
+            if sock is not None:
+                sock.close()
+
+    async def _read(self, loop: asyncio.AbstractEventLoop, sock: socket.socket, timeout: float) -> Tuple[bytes, bool]:
+        """Read up to max_bytes within timeout; return (data, connection closed)."""
+        data = b""
+        deadline = loop.time() + timeout
+        while len(data) < self.max_bytes:
+            now = loop.time()
+            remaining = (deadline if not data else min(deadline, now + self.idle)) - now
+            if remaining <= 0:
+                break
+            try:
+                chunk = await asyncio.wait_for(loop.sock_recv(sock, self.max_bytes - len(data)), remaining)
+            except asyncio.TimeoutError:
+                break
+            except OSError:
+                return data, True
+            if not chunk:
+                return data, True
+            data += chunk
+            if _complete(data):
+                break
+        return data, False
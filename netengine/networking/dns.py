@@ -0,0 +1,456 @@
+"""Asynchronous UDP DNS client with a TTL-respecting cache."""
+
+import asyncio
+import random
+import socket
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from ..utils.logger import Logger
+from ..utils.advanced_packets import AdvancedPacketBuilder, DNS_TYPES
+from ..utils.aio import bounded_as_completed, iter_async, run_sync
+
+DNS_TYPE_NAMES = {value: name for name, value in DNS_TYPES.items()}
+RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+_HEADER = struct.Struct("!HHHHHH")
+_RR_FIXED = struct.Struct("!HHIH")
+
+Nameserver = Tuple[str, int]
+
+
+class DNSRecord(NamedTuple):
+    """Single resource record from an answer section."""
+
+    name: str
+    type: str
+    ttl: int
+    value: str
+
+
+class DNSAnswer(NamedTuple):
+    """Result of resolving one name."""
+
+    name: str
+    rtype: str
+    rcode: str
+    records: List[DNSRecord]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the server answered without error."""
+        return self.error is None and self.rcode == "NOERROR"
+
+    def values(self, rtype: Optional[str] = None) -> List[str]:
+        """Record values of the given type (default: the queried type)."""
+        rtype = rtype or self.rtype
+        return [record.value for record in self.records if record.type == rtype]
+
+
+class DNSResponse(NamedTuple):
+    """Decoded DNS response message."""
+
+    id: int
+    rcode: str
+    truncated: bool
+    question: Optional[Tuple[str, int]]
+    answers: List[DNSRecord]
+
+
+def parse_response(data: bytes) -> DNSResponse:
+    """Decode a DNS response (header, question and answer sections)."""
+    if len(data) < _HEADER.size:
+        raise ValueError("DNS response too short")
+    qid, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+
+    question = None
+    for _ in range(qdcount):
+        qname, offset = _read_name(data, offset)
+        qtype, _ = struct.unpack_from("!HH", data, offset)
+        offset += 4
+        if question is None:
+            question = (qname, qtype)
+
+    answers = []
+    for _ in range(ancount):
+        name, offset = _read_name(data, offset)
+        rtype, _, ttl, rdlength = _RR_FIXED.unpack_from(data, offset)
+        offset += _RR_FIXED.size
+        rdata_end = offset + rdlength
+        if rdata_end > len(data):
+            raise ValueError("DNS record exceeds message length")
+        value = _decode_rdata(data, offset, rdata_end, rtype)
+        if value is not None:
+            answers.append(DNSRecord(name, DNS_TYPE_NAMES.get(rtype, str(rtype)), ttl, value))
+        offset = rdata_end
+
+    return DNSResponse(qid, RCODES.get(flags & 0x000F, str(flags & 0x000F)), bool(flags & 0x0200), question, answers)
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a possibly compressed domain name; return (name, next offset)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("DNS name exceeds message length")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("DNS name compression loop")
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    return ".".join(labels), end if end is not None else offset
+
+
+def _decode_rdata(data: bytes, start: int, end: int, rtype: int) -> Optional[str]:
+    """Decode record data for the supported record types."""
+    if rtype == 1 and end - start == 4:
+        return socket.inet_ntop(socket.AF_INET, data[start:end])
+    if rtype == 28 and end - start == 16:
+        return socket.inet_ntop(socket.AF_INET6, data[start:end])
+    if rtype in (2, 5):
+        return _read_name(data, start)[0]
+    if rtype == 15:
+        preference = struct.unpack_from("!H", data, start)[0]
+        return f"{preference} {_read_name(data, start + 2)[0]}"
+    if rtype == 16:
+        chunks = []
+        offset = start
+        while offset < end:
+            length = data[offset]
+            chunks.append(data[offset + 1:offset + 1 + length].decode("utf-8", "replace"))
+            offset += 1 + length
+        return "".join(chunks)
+    return None
+
+
+class DNSCache:
+    """LRU cache of DNS answers that expire with the record TTLs."""
+
+    def __init__(self, max_entries: int = 100000, negative_ttl: int = 60):
+        """Initialize cache."""
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, DNSAnswer]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, rtype: str) -> Optional[DNSAnswer]:
+        """Return a cached, unexpired answer."""
+        key = (name.lower().rstrip("."), rtype)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, answer: DNSAnswer):
+        """Store an answer for the lifetime of its shortest TTL."""
+        if answer.error is not None:
+            return
+        if answer.records:
+            ttl = min(record.ttl for record in answer.records)
+        elif answer.rcode in ("NOERROR", "NXDOMAIN"):
+            ttl = self.negative_ttl
+        else:
+            return
+        if ttl <= 0:
+            return
+        key = (answer.name.lower().rstrip("."), answer.rtype)
+        self._entries[key] = (time.monotonic() + ttl, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached answers."""
+        self._entries.clear()
+
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that hands replies to the resolver."""
+
+    def __init__(self, resolver: "DNSResolver"):
+        self.resolver = resolver
+
+    def datagram_received(self, data: bytes, addr):
+        self.resolver._dispatch(data, addr)
+
+    def error_received(self, exc):
+        self.resolver.logger.debug("DNS socket error: %s", exc)
+
+
+class DNSResolver:
+    """Pipelined DNS resolver over a single UDP socket.
+
+    Thousands of queries can be in flight at once; replies are matched back
+    to their queries by transaction ID (and question), lost queries are
+    retried with exponential backoff, and answers are cached per TTL.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        nameservers: Optional[Iterable[Union[str, Nameserver]]] = None,
+        timeout: float = 2.0,
+        retries: int = 2,
+        backoff: float = 2.0,
+        concurrency: int = 1000,
+        cache: Optional[DNSCache] = None,
+        use_hosts_file: bool = True,
+    ):
+        """Initialize resolver.
+
+        ``nameservers`` accepts "host", "host:port", "[ipv6]:port" or
+        (host, port) entries, with host names resolved to an address here,
+        and defaults to the system resolvers from /etc/resolv.conf. Names listed
+        in /etc/hosts are answered locally unless ``use_hosts_file`` is False.
+        """
+        self.logger = logger or Logger()
+        self.nameservers = [_parse_nameserver(ns) for ns in (nameservers or system_nameservers())]
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.concurrency = max(1, min(concurrency, 60000))
+        self.cache = cache if cache is not None else DNSCache()
+        self.hosts = load_hosts_file() if use_hosts_file else {}
+        self.builder = AdvancedPacketBuilder(self.logger)
+        self._pending: Dict[int, Tuple[asyncio.Future, str, int]] = {}
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---- synchronous API ----
+
+    def resolve(self, name: str, rtype: str = "A") -> DNSAnswer:
+        """Resolve one name."""
+        return run_sync(self._closing_after(self.query(name, rtype)))
+
+    def resolve_many(self, names: Iterable[str], rtype: str = "A") -> Iterator[DNSAnswer]:
+        """Resolve many names, yielding answers as they arrive."""
+        return iter_async(self.closing_iter(self.resolve_many_async(names, rtype)))
+
+    # ---- asynchronous API ----
+
+    async def resolve_many_async(self, names: Iterable[str], rtype: str = "A") -> AsyncIterator[DNSAnswer]:
+        """Async variant of resolve_many()."""
+        async for answer in bounded_as_completed(lambda name: self.query(name, rtype), names, self.concurrency):
+            yield answer
+
+    async def query(self, name: str, rtype: str = "A") -> DNSAnswer:
+        """Resolve name, consulting the cache first."""
+        name = name.strip().rstrip(".")
+        if rtype == "A" and _is_ipv4(name):
+            return DNSAnswer(name, rtype, "NOERROR", [DNSRecord(name, "A", 0, name)])
+        local = self.hosts.get((name.lower(), rtype))
+        if local:
+            return DNSAnswer(name, rtype, "NOERROR", [DNSRecord(name, rtype, 0, ip) for ip in local])
+        cached = self.cache.get(name, rtype)
+        if cached is not None:
+            return cached
+
+        await self._ensure_transport()
+        loop = asyncio.get_running_loop()
+        qid = self._allocate_id()
+        future = loop.create_future()
+        qtype = DNS_TYPES.get(rtype, 1)
+        self._pending[qid] = (future, name.lower(), qtype)
+        packet = self.builder.build_dns_query(name, rtype, transaction_id=qid)
+
+        try:
+            timeout = self.timeout
+            for attempt in range(self.retries + 1):
+                nameserver = self.nameservers[attempt % len(self.nameservers)]
+                self._transport.sendto(packet, self._sockaddr(nameserver))
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), timeout)
+                    break
+                except asyncio.TimeoutError:
+                    timeout *= self.backoff
+            else:
+                return DNSAnswer(name, rtype, "TIMEOUT", [], error="timeout")
+        finally:
+            self._pending.pop(qid, None)
+
+        answer = DNSAnswer(name, rtype, response.rcode, response.answers)
+        if response.truncated and not response.answers:
+            answer = answer._replace(error="truncated response")
+        self.cache.put(answer)
+        return answer
+
+    async def close_async(self):
+        """Close the UDP socket."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            self._loop = None
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def closing_iter(self, agen: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Iterate agen, then close the socket.
+
+        The socket belongs to the event loop it was opened on, so wrap any
+        async iterator that queries this resolver in closing_iter() when
+        driving it from synchronous code with iter_async().
+        """
+        try:
+            async for item in agen:
+                yield item
+        finally:
+            await self.close_async()
+
+    # ---- internals ----
+
+    async def _ensure_transport(self):
+        """Open the shared UDP socket on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._transport is not None and self._loop is loop and not self._transport.is_closing():
+            return
+        # One dual-stack socket serves IPv4 nameservers too (as mapped addresses).
+        ipv6 = any(":" in ip for ip, _ in self.nameservers)
+        sock = socket.socket(socket.AF_INET6 if ipv6 else socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        if ipv6:
+            sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+            sock.bind(("::", 0))
+        else:
+            sock.bind(("0.0.0.0", 0))
+        sock.setblocking(False)
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: _DNSProtocol(self), sock=sock)
+        self._loop = loop
+
+    def _allocate_id(self) -> int:
+        """Pick a random transaction ID that is not in flight."""
+        while True:
+            qid = random.getrandbits(16)
+            if qid not in self._pending:
+                return qid
+
+    def _sockaddr(self, nameserver: Nameserver) -> Nameserver:
+        """Destination for nameserver on the current socket's address family."""
+        if self._transport.get_extra_info("socket").family == socket.AF_INET6 and ":" not in nameserver[0]:
+            return f"::ffff:{nameserver[0]}", nameserver[1]
+        return nameserver
+
+    def _dispatch(self, data: bytes, addr):
+        """Match a reply datagram to its pending query."""
+        ip = addr[0][7:] if addr[0].startswith("::ffff:") and "." in addr[0] else addr[0]
+        if (ip, addr[1]) not in self.nameservers:
+            return
+        try:
+            response = parse_response(data)
+        except (ValueError, IndexError, struct.error, OSError) as e:
+            self.logger.debug("Malformed DNS reply from %s: %s", addr[0], e)
+            return
+        pending = self._pending.get(response.id)
+        if pending is None:
+            return
+        future, name, qtype = pending
+        if response.question is not None and (response.question[0].lower(), response.question[1]) != (name, qtype):
+            return
+        if not future.done():
+            future.set_result(response)
+
+    async def _closing_after(self, coro):
+        """Await coro, then close the socket (used by the sync API)."""
+        try:
+            return await coro
+        finally:
+            await self.close_async()
+
+
+def system_nameservers(path: str = "/etc/resolv.conf") -> List[str]:
+    """Read IPv4 nameservers from resolv.conf, falling back to public resolvers."""
+    servers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    try:
+                        socket.inet_aton(parts[1])
+                        servers.append(parts[1])
+                    except OSError:
+                        continue
+    except OSError:
+        pass
+    return servers or ["8.8.8.8", "1.1.1.1"]
+
+
+def load_hosts_file(path: str = "/etc/hosts") -> Dict[Tuple[str, str], List[str]]:
+    """Read static host entries, keyed by (lowercase name, "A"/"AAAA")."""
+    hosts: Dict[Tuple[str, str], List[str]] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split("#", 1)[0].split()
+                if len(fields) < 2:
+                    continue
+                rtype = "AAAA" if ":" in fields[0] else "A"
+                for name in fields[1:]:
+                    hosts.setdefault((name.lower(), rtype), []).append(fields[0])
+    except OSError:
+        pass
+    return hosts
+
+
+def _is_ipv4(name: str) -> bool:
+    """Check whether name is a dotted-quad IPv4 literal."""
+    try:
+        return name.count(".") == 3 and bool(socket.inet_aton(name))
+    except OSError:
+        return False
+
+
+def _parse_nameserver(nameserver: Union[str, Nameserver]) -> Nameserver:
+    """Normalize a nameserver entry to (ip, port), resolving a host name."""
+    if isinstance(nameserver, tuple):
+        host, port = nameserver[0], str(nameserver[1])
+    elif nameserver.startswith("["):
+        host, _, port = nameserver[1:].partition("]")
+        if port and not port.startswith(":"):
+            raise ValueError(f"Invalid nameserver: {nameserver!r}")
+        port = port[1:]
+    elif nameserver.count(":") == 1:
+        host, _, port = nameserver.partition(":")
+    else:
+        host, port = nameserver, ""
+    return _nameserver_ip(host), int(port or 53)
+
+
+def _nameserver_ip(host: str) -> str:
+    """Canonical IPv4/IPv6 address for host, looking names up once."""
+    if _is_ipv4(host):
+        return host
+    try:
+        return socket.inet_ntop(socket.AF_INET6, socket.inet_pton(socket.AF_INET6, host))
+    except OSError:
+        pass
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_DGRAM)
+    except socket.gaierror as e:
+        raise ValueError(f"Cannot resolve nameserver {host!r}: {e}") from None
+    infos.sort(key=lambda info: info[0] != socket.AF_INET)
+    return infos[0][4][0]
@@ -0,0 +1,473 @@
+"""Single-threaded socket multiplexer built on selectors (epoll on Linux)."""
+
+import collections
+import errno
+import inspect
+import selectors
+import socket
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from ..utils.logger import Logger
+
+# on_data(channel, data) / on_connect(channel) / on_close(channel, error)
+DataCallback = Callable[["Channel", bytes], None]
+ConnectCallback = Callable[["Channel"], None]
+CloseCallback = Callable[["Channel", Optional[BaseException]], None]
+
+_CONNECT_PENDING = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY)
+
+
+class _Wait:
+    """Awaitable handed out by Channel.recv()/drain(); resumed by the multiplexer."""
+
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __await__(self):
+        return (yield self)
+
+
+class Channel:
+    """A named non-blocking socket registered with a SocketMultiplexer.
+
+    Outgoing data is queued in ``send_buffer`` and written as the socket
+    becomes writable, so partial writes never block the loop. Received data
+    goes to the channel's ``on_data`` callback, or, for coroutine handlers
+    and channels without a callback, into ``inbox``.
+    """
+
+    def __init__(self, multiplexer: "SocketMultiplexer", name: str, sock: socket.socket):
+        """Initialize channel state (use SocketMultiplexer.register())."""
+        self.multiplexer = multiplexer
+        self.name = name
+        self.sock = sock
+        self.send_buffer = bytearray()
+        self.inbox = bytearray()
+        self.on_data: Optional[DataCallback] = None
+        self.on_connect: Optional[ConnectCallback] = None
+        self.on_close: Optional[CloseCallback] = None
+        self.listening = False
+        self.connecting = False
+        self.eof = False
+        self.closed = False
+        self.error: Optional[BaseException] = None
+        self.context: Dict[str, Any] = {}
+        self._coro = None
+        self._waiting: Optional[str] = None
+        self._events = 0
+
+    @property
+    def pending(self) -> int:
+        """Bytes queued but not yet written to the socket."""
+        return len(self.send_buffer)
+
+    def send(self, data: bytes):
+        """Queue data for sending."""
+        self.multiplexer.send(self.name, data)
+
+    def close(self):
+        """Close the channel once its send buffer has been flushed."""
+        self.multiplexer.close(self.name)
+
+    def recv(self) -> _Wait:
+        """In a coroutine handler: await the next received data (b"" at EOF)."""
+        return _Wait("recv")
+
+    def drain(self) -> _Wait:
+        """In a coroutine handler: await until the send buffer is empty."""
+        return _Wait("drain")
+
+    def __repr__(self) -> str:
+        state = "closed" if self.closed else "connecting" if self.connecting else "open"
+        return f"<Channel {self.name} {state} pending={self.pending}>"
+
+
+class SocketMultiplexer:
+    """Drive many named non-blocking sockets from one thread.
+
+    Every socket is a :class:`Channel` registered with a
+    ``selectors.DefaultSelector`` (epoll on Linux, kqueue on BSD/macOS). A
+    channel is handled either by callbacks (``on_data``/``on_connect``/
+    ``on_close``) or by an ``async def handler(channel)`` coroutine that
+    awaits ``channel.recv()`` and ``channel.drain()``. Only the loop thread
+    touches sockets; other threads use send()/close()/call_soon(), which are
+    forwarded to it.
+    """
+
+    def __init__(self, logger: Optional[Logger] = None, recv_size: int = 65536):
+        """Initialize multiplexer."""
+        self.logger = logger or Logger()
+        self.recv_size = recv_size
+        self.selector = selectors.DefaultSelector()
+        self.channels: Dict[str, Channel] = {}
+        self._calls: Deque[Tuple[Callable, tuple]] = collections.deque()
+        self._closing: Dict[str, Channel] = {}
+        self._running = False
+        self._loop_thread: Optional[int] = None
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+    def register(
+        self,
+        name: str,
+        sock: socket.socket,
+        handler: Optional[Callable] = None,
+        on_connect: Optional[ConnectCallback] = None,
+        on_close: Optional[CloseCallback] = None,
+    ) -> Channel:
+        """Register a connected (or listening) socket under name.
+
+        ``handler`` is either an ``on_data(channel, data)`` callback or an
+        ``async def`` coroutine function called once with the channel.
+        """
+        if name in self.channels:
+            raise ValueError(f"Socket name already registered: {name}")
+        sock.setblocking(False)
+        channel = Channel(self, name, sock)
+        channel.on_connect = on_connect
+        channel.on_close = on_close
+        self.channels[name] = channel
+        self._update(channel)
+        if handler is not None:
+            if inspect.iscoroutinefunction(handler):
+                channel._coro = handler(channel)
+                self._call_threadsafe(self._step, channel)
+            else:
+                channel.on_data = handler
+        return channel
+
+    def connect(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        handler: Optional[Callable] = None,
+        on_connect: Optional[ConnectCallback] = None,
+        on_close: Optional[CloseCallback] = None,
+        sock: Optional[socket.socket] = None,
+    ) -> Channel:
+        """Start a non-blocking TCP connect and register the socket.
+
+        A new IPv4 socket is created unless ``sock`` is given. Data sent
+        before the connection completes is buffered; a failed connect closes
+        the channel with the error passed to ``on_close``.
+        """
+        sock = sock or socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        err = sock.connect_ex((host, port))
+        if err not in _CONNECT_PENDING:
+            sock.close()
+            raise OSError(err, f"Connect to {host}:{port} failed: {errno.errorcode.get(err, err)}")
+        channel = self.register(name, sock, handler, on_connect, on_close)
+        channel.connecting = True
+        self._update(channel)
+        return channel
+
+    def listen(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        handler: Optional[Callable] = None,
+        on_close: Optional[CloseCallback] = None,
+        backlog: int = 1024,
+    ) -> Channel:
+        """Listen on host:port; accepted sockets become channels "name/ip:port".
+
+        ``handler`` and ``on_close`` are applied to every accepted channel.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+        channel = self.register(name, sock)
+        channel.listening = True
+        channel.context["handler"] = handler
+        channel.context["on_close"] = on_close
+        return channel
+
+    def send(self, name: str, data: bytes):
+        """Queue data on a channel; written without blocking as space allows."""
+        if not self._in_loop():
+            self._call_threadsafe(self.send, name, bytes(data))
+            return
+        channel = self.channels.get(name)
+        if channel is None or channel.closed:
+            raise KeyError(f"No open socket named {name}")
+        if not data:
+            return
+        channel.send_buffer += data
+        if not channel.connecting:
+            self._flush(channel)
+        self._update(channel)
+
+    def close(self, name: str):
+        """Close a channel after flushing whatever it still has queued."""
+        if not self._in_loop():
+            self._call_threadsafe(self.close, name)
+            return
+        channel = self.channels.get(name)
+        if channel is None:
+            return
+        if channel.send_buffer and not channel.closed:
+            self._closing[name] = channel
+            return
+        self._close(channel)
+
+    def call_soon(self, func: Callable, *args):
+        """Run func(*args) on the loop thread (safe from any thread)."""
+        self._call_threadsafe(func, *args)
+
+    def close_all(self):
+        """Close every channel immediately and release the selector."""
+        for channel in list(self.channels.values()):
+            self._close(channel)
+        self.selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    def run_once(self, timeout: Optional[float] = None) -> int:
+        """Wait up to timeout seconds for I/O and dispatch it; return events handled."""
+        self._loop_thread = threading.get_ident()
+        self._run_calls()
+        if self._calls:
+            timeout = 0
+        events = self.selector.select(timeout)
+        for key, mask in events:
+            channel = key.data
+            if channel is None:
+                self._drain_wakeup()
+                continue
+            if channel.closed:
+                continue
+            if channel.listening:
+                self._accept(channel)
+                continue
+            if mask & selectors.EVENT_WRITE:
+                self._on_writable(channel)
+            if mask & selectors.EVENT_READ and not channel.closed:
+                self._on_readable(channel)
+        self._run_calls()
+        return len(events)
+
+    def run(self, timeout: Optional[float] = None, until: Optional[Callable[[], bool]] = None) -> bool:
+        """Run the loop until stop(), until() is true, or timeout expires.
+
+        Without ``until`` the loop also ends when no channels are left.
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._loop_thread = threading.get_ident()
+        self._running = True
+        try:
+            while self._running:
+                if until is not None:
+                    if until():
+                        return True
+                elif not self.channels:
+                    return True
+                wait = None if deadline is None else deadline - time.monotonic()
+                if wait is not None and wait <= 0:
+                    return False
+                # Wake up periodically so until() is re-checked after callbacks.
+                self.run_once(0.1 if wait is None else min(wait, 0.1))
+            return True
+        finally:
+            self._running = False
+
+    def stop(self):
+        """Make run() return (safe from any thread)."""
+        self._call_threadsafe(setattr, self, "_running", False)
+
+    def _in_loop(self) -> bool:
+        """True when called from the loop thread (or before the loop ran)."""
+        return self._loop_thread is None or self._loop_thread == threading.get_ident()
+
+    def _call_threadsafe(self, func: Callable, *args):
+        self._calls.append((func, args))
+        if not self._in_loop():
+            try:
+                self._wakeup_w.send(b"\0")
+            except (BlockingIOError, OSError):
+                pass
+
+    def _run_calls(self):
+        for _ in range(len(self._calls)):
+            func, args = self._calls.popleft()
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.error("Multiplexer callback failed", exc=e)
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _update(self, channel: Channel):
+        """Register interest in read and, when data is queued, write events."""
+        if channel.closed:
+            return
+        events = 0 if channel.eof and not channel.listening else selectors.EVENT_READ
+        if channel.connecting or channel.send_buffer:
+            events |= selectors.EVENT_WRITE
+        if events == channel._events:
+            return
+        if channel._events == 0:
+            self.selector.register(channel.sock, events, channel)
+        elif events == 0:
+            self.selector.unregister(channel.sock)
+        else:
+            self.selector.modify(channel.sock, events, channel)
+        channel._events = events
+
+    def _accept(self, server: Channel):
+        while True:
+            try:
+                sock, (host, port) = server.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                self.logger.error("Accept on %s failed: %s", server.name, e)
+                return
+            name = f"{server.name}/{host}:{port}"
+            self.logger.debug("Accepted %s", name)
+            self.register(name, sock, server.context.get("handler"), on_close=server.context.get("on_close"))
+
+    def _on_writable(self, channel: Channel):
+        if channel.connecting:
+            err = channel.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err:
+                self._close(channel, OSError(err, f"Connect failed: {errno.errorcode.get(err, err)}"))
+                return
+            channel.connecting = False
+            self.logger.debug("Connected %s", channel.name)
+            if channel.on_connect is not None:
+                self._callback(channel, channel.on_connect, channel)
+        if not channel.closed:
+            self._flush(channel)
+            self._update(channel)
+
+    def _flush(self, channel: Channel):
+        """Write as much of the send buffer as the socket accepts."""
+        buffer = channel.send_buffer
+        while buffer:
+            try:
+                sent = channel.sock.send(buffer)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self._close(channel, e)
+                return
+            # Deleting from the front of a bytearray is amortized O(1).
+            del buffer[:sent]
+        if not buffer:
+            if channel._waiting == "drain":
+                self._step(channel)
+            if channel.name in self._closing:
+                self._close(channel)
+
+    def _on_readable(self, channel: Channel):
+        try:
+            data = channel.sock.recv(self.recv_size)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._close(channel, e)
+            return
+        if not data:
+            channel.eof = True
+            self._update(channel)
+        if channel.on_data is not None:
+            self._callback(channel, channel.on_data, channel, data)
+            if channel.eof and not channel.closed:
+                self.close(channel.name)
+            return
+        channel.inbox += data
+        if channel._waiting == "recv":
+            self._step(channel)
+
+    def _callback(self, channel: Channel, func: Callable, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self.logger.error("Handler for %s failed", channel.name, exc=e)
+            self._close(channel, e)
+
+    def _step(self, channel: Channel):
+        """Resume a channel's coroutine until it waits for something not yet ready."""
+        coro = channel._coro
+        # cr_running: the coroutine itself caused this (e.g. by closing its
+        # channel); it sees the new state at its next await.
+        if coro is None or coro.cr_running:
+            return
+        waiting, channel._waiting = channel._waiting, None
+        value = None
+        if waiting == "recv":
+            value = bytes(channel.inbox)
+            channel.inbox.clear()
+        while True:
+            try:
+                wait = coro.send(value)
+            except StopIteration:
+                channel._coro = None
+                self.close(channel.name)
+                return
+            except Exception as e:
+                channel._coro = None
+                self.logger.error("Handler for %s failed", channel.name, exc=e)
+                self._close(channel, e)
+                return
+            if not isinstance(wait, _Wait):
+                coro.close()
+                channel._coro = None
+                error = TypeError(f"Channel handlers can only await recv()/drain(), got {wait!r}")
+                self.logger.error("Handler for %s failed", channel.name, exc=error)
+                self._close(channel, error)
+                return
+            if wait.kind == "recv":
+                if channel.inbox or channel.eof or channel.closed:
+                    value = bytes(channel.inbox)
+                    channel.inbox.clear()
+                    continue
+            elif not channel.send_buffer or channel.closed:
+                value = None
+                continue
+            channel._waiting = wait.kind
+            return
+
+    def _close(self, channel: Channel, error: Optional[BaseException] = None):
+        if channel.closed:
+            return
+        channel.closed = True
+        channel.error = error
+        self.channels.pop(channel.name, None)
+        self._closing.pop(channel.name, None)
+        if channel._events:
+            try:
+                self.selector.unregister(channel.sock)
+            except (KeyError, ValueError):
+                pass
+            channel._events = 0
+        channel.sock.close()
+        if error is not None:
+            self.logger.debug("Closed %s: %s", channel.name, error)
+        coro = channel._coro
+        if coro is not None and not coro.cr_running:
+            # Let a coroutine waiting on the channel see EOF and finish.
+            self._step(channel)
+            if channel._coro is not None:
+                channel._coro.close()
+                channel._coro = None
+        if channel.on_close is not None:
+            try:
+                channel.on_close(channel, error)
+            except Exception as e:
+                self.logger.error("Close handler for %s failed", channel.name, exc=e)
@@ -0,0 +1,309 @@
+"""Concurrent ICMP echo sweeps over one shared socket."""
+
+import os
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+from ..utils.logger import Logger
+from ..utils.checksum import checksum
+from ..utils.codec import ICMP_ECHO_REPLY, ICMP_ECHO_REQUEST
+
+_ICMP = struct.Struct("!BBHHH")
+# Every probe carries a unique 64-bit token at the start of its payload.
+# The kernel rewrites the identifier of SOCK_DGRAM echo requests, so the
+# token (not id/seq alone) is what replies are matched on.
+_TOKEN = struct.Struct("!Q")
+
+
+@dataclass
+class PingStats:
+    """Per-host results of a sweep; RTTs are in milliseconds."""
+
+    host: str
+    address: str
+    sent: int = 0
+    received: int = 0
+    rtts: List[float] = field(default_factory=list)
+
+    @property
+    def loss(self) -> float:
+        """Fraction of probes without a reply (0.0 - 1.0)."""
+        return 1.0 - self.received / self.sent if self.sent else 0.0
+
+    @property
+    def alive(self) -> bool:
+        """True if at least one reply arrived."""
+        return self.received > 0
+
+    @property
+    def min(self) -> Optional[float]:
+        """Fastest RTT."""
+        return min(self.rtts) if self.rtts else None
+
+    @property
+    def avg(self) -> Optional[float]:
+        """Mean RTT."""
+        return sum(self.rtts) / len(self.rtts) if self.rtts else None
+
+    @property
+    def max(self) -> Optional[float]:
+        """Slowest RTT."""
+        return max(self.rtts) if self.rtts else None
+
+    @property
+    def jitter(self) -> Optional[float]:
+        """Mean absolute difference between consecutive RTTs."""
+        if not self.rtts:
+            return None
+        rtts = self.rtts
+        if len(rtts) == 1:
+            return 0.0
+        return sum(abs(b - a) for a, b in zip(rtts, rtts[1:])) / (len(rtts) - 1)
+
+    def __str__(self) -> str:
+        """ping(8)-style summary line."""
+        line = f"{self.host}: {self.received}/{self.sent} received, {self.loss:.0%} loss"
+        if self.rtts:
+            line += (
+                f", rtt min/avg/max/jitter = "
+                f"{self.min:.3f}/{self.avg:.3f}/{self.max:.3f}/{self.jitter:.3f} ms"
+            )
+        return line
+
+
+@dataclass
+class _Probe:
+    """An echo request waiting for its reply."""
+
+    stats: PingStats
+    sent_ns: int
+    deadline_ns: int
+
+
+class PingSweeper:
+    """Ping many hosts concurrently over a single ICMP socket.
+
+    An unprivileged ``SOCK_DGRAM`` ICMP socket is used where the kernel
+    allows it (Linux ``net.ipv4.ping_group_range``), otherwise a raw socket,
+    which needs root. Probes are sent from the calling thread while a
+    dispatcher thread receives replies, matches them to their probe by the
+    token in the payload and timestamps them with ``perf_counter_ns``.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        count: int = 1,
+        timeout: float = 1.0,
+        interval: float = 1.0,
+        rate: float = 0.0,
+        payload_size: int = 56,
+        privileged: Optional[bool] = None,
+    ):
+        """Initialize sweeper.
+
+        Each host gets ``count`` probes, ``interval`` seconds apart; a probe
+        is lost if no reply arrives within ``timeout`` seconds. ``rate``
+        caps probes per second across all hosts (0 for no limit).
+        ``privileged`` forces a raw (True) or datagram (False) socket; by
+        default the datagram socket is tried first.
+        """
+        if count < 1:
+            raise ValueError(f"count must be at least 1, got {count}")
+        self.logger = logger or Logger()
+        self.count = count
+        self.timeout = timeout
+        self.interval = interval
+        self.rate = rate
+        self.payload_size = max(payload_size, _TOKEN.size)
+        self.privileged = privileged
+        self.identifier = os.getpid() & 0xFFFF
+        self.raw = False
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, _Probe] = {}
+        self._lock = threading.Lock()
+        self._next_token = int.from_bytes(os.urandom(4), "big") << 32
+        self._padding = bytes(range(self.payload_size - _TOKEN.size))
+
+    def open(self) -> socket.socket:
+        """Create the shared ICMP socket (idempotent)."""
+        if self._sock is not None:
+            return self._sock
+        if self.privileged is not True:
+            try:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            except OSError as e:
+                if self.privileged is False:
+                    raise
+                self.logger.debug("Datagram ICMP unavailable (%s), using a raw socket", e)
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+        try:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        self._sock.setblocking(False)
+        return self._sock
+
+    def close(self):
+        """Close the shared socket."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "PingSweeper":
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sweep(self, hosts: Iterable[str]) -> Iterator[PingStats]:
+        """Ping every host, yielding each host's stats once it is finished.
+
+        A host is finished when all its probes were answered or timed out,
+        so responsive hosts are reported while slower ones are still going.
+        """
+        sock = self.open()
+        targets = self._resolve(hosts)
+        if not targets:
+            return
+        remaining = {id(stats): self.count for stats in targets}
+        finished: "queue.SimpleQueue[PingStats]" = queue.SimpleQueue()
+        stop = threading.Event()
+        dispatcher = threading.Thread(
+            target=self._dispatch, args=(sock, stop, remaining, finished), name="ping-dispatcher", daemon=True
+        )
+        dispatcher.start()
+
+        done = 0
+        try:
+            gap = 1.0 / self.rate if self.rate > 0 else 0.0
+            start = time.monotonic()
+            sent = 0
+            for round_number in range(self.count):
+                round_start = start + round_number * self.interval
+                for stats in targets:
+                    now = time.monotonic()
+                    wait = max(round_start, start + sent * gap) - now
+                    if wait > 0:
+                        time.sleep(wait)
+                    self._send(sock, stats, remaining, finished)
+                    sent += 1
+                    if sent % 256 == 0:
+                        self._expire(remaining, finished)
+                    while not finished.empty():
+                        done += 1
+                        yield finished.get()
+
+            while done < len(targets):
+                self._expire(remaining, finished)
+                try:
+                    yield finished.get(timeout=0.05)
+                    done += 1
+                except queue.Empty:
+                    pass
+        finally:
+            stop.set()
+            dispatcher.join()
+            with self._lock:
+                self._pending.clear()
+
+    def _resolve(self, hosts: Iterable[str]) -> List[PingStats]:
+        """Resolve hostnames once up front; unresolvable ones are skipped."""
+        targets = []
+        for host in hosts:
+            try:
+                targets.append(PingStats(host, socket.gethostbyname(host)))
+            except (socket.gaierror, UnicodeError) as e:
+                self.logger.error("Cannot resolve %s: %s", host, e)
+        return targets
+
+    def _send(self, sock: socket.socket, stats: PingStats, remaining: Dict[int, int], finished):
+        """Send one echo request to stats.address."""
+        token = self._next_token
+        self._next_token = (token + 1) & 0xFFFFFFFFFFFFFFFF
+        sequence = token & 0xFFFF
+        payload = _TOKEN.pack(token) + self._padding
+        header = _ICMP.pack(ICMP_ECHO_REQUEST, 0, 0, self.identifier, sequence)
+        packet = _ICMP.pack(
+            ICMP_ECHO_REQUEST, 0, checksum(header + payload), self.identifier, sequence
+        ) + payload
+
+        stats.sent += 1
+        now = time.perf_counter_ns()
+        with self._lock:
+            self._pending[token] = _Probe(stats, now, now + int(self.timeout * 1e9))
+        try:
+            sock.sendto(packet, (stats.address, 0))
+        except OSError as e:
+            self.logger.debug("Send to %s failed: %s", stats.address, e)
+            with self._lock:
+                if self._pending.pop(token, None) is not None:
+                    self._settle(stats, remaining, finished)
+
+    def _dispatch(self, sock: socket.socket, stop: threading.Event, remaining: Dict[int, int], finished):
+        """Dispatcher thread: receive replies and match them to probes."""
+        raw = self.raw
+        perf_counter_ns = time.perf_counter_ns
+        while not stop.is_set():
+            readable, _, _ = select.select([sock], [], [], 0.05)
+            if not readable:
+                continue
+            while True:
+                try:
+                    data, (address, _) = sock.recvfrom(65535)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError as e:
+                    self.logger.debug("ICMP receive failed: %s", e)
+                    break
+                received_ns = perf_counter_ns()
+                offset = (data[0] & 0x0F) * 4 if raw else 0
+                if len(data) < offset + _ICMP.size + _TOKEN.size:
+                    continue
+                icmp_type, _, _, identifier, _ = _ICMP.unpack_from(data, offset)
+                # Raw sockets see every ICMP message, including our own
+                # requests on loopback and other processes' pings.
+                if icmp_type != ICMP_ECHO_REPLY or (raw and identifier != self.identifier):
+                    continue
+                (token,) = _TOKEN.unpack_from(data, offset + _ICMP.size)
+                with self._lock:
+                    probe = self._pending.get(token)
+                    if probe is None or probe.stats.address != address:
+                        continue
+                    del self._pending[token]
+                    stats = probe.stats
+                    stats.received += 1
+                    stats.rtts.append((received_ns - probe.sent_ns) / 1e6)
+                    self._settle(stats, remaining, finished)
+
+    def _expire(self, remaining: Dict[int, int], finished):
+        """Count probes past their deadline as lost."""
+        now = time.perf_counter_ns()
+        with self._lock:
+            # Probes are inserted in send order with the same timeout, so
+            # deadlines are ascending: stop at the first live one.
+            expired = []
+            for token, probe in self._pending.items():
+                if probe.deadline_ns > now:
+                    break
+                expired.append(token)
+            for token in expired:
+                self._settle(self._pending.pop(token).stats, remaining, finished)
+
+    def _settle(self, stats: PingStats, remaining: Dict[int, int], finished):
+        """Record one probe as answered or lost; report the host when done.
+
+        Called with the lock held.
+        """
+        key = id(stats)
+        remaining[key] -= 1
+        if remaining[key] == 0:
+            finished.put(stats)
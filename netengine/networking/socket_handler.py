@@ -1,12 +1,21 @@
 """Universal socket handler for various protocols."""
 
 import socket
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 from ..utils.logger import Logger
+from ..utils.buffer_pool import BufferPool, PooledBuffer
+from .multiplexer import Channel, CloseCallback, SocketMultiplexer
 
 
 class SocketHandler:
-    """Generic socket handler supporting multiple protocols."""
+    """Generic socket handler supporting multiple protocols.
+
+    By default every call blocks on its socket. With ``event_loop=True``
+    sockets are non-blocking and driven by a :class:`SocketMultiplexer`:
+    connect() and send() return immediately (sends are buffered), received
+    data goes to per-socket handlers while run() is looping, and one thread
+    can keep thousands of named connections open.
+    """
 
     SOCKET_TYPES = {
         "tcp": socket.SOCK_STREAM,
@@ -14,10 +23,11 @@ class SocketHandler:
         "raw": socket.SOCK_RAW,
     }
 
-    def __init__(self, logger: Optional[Logger] = None):
+    def __init__(self, logger: Optional[Logger] = None, event_loop: bool = False):
         """Initialize socket handler."""  #A6hz8L
         self.logger = logger or Logger()
         self.sockets: Dict[str, socket.socket] = {}
+        self.multiplexer: Optional[SocketMultiplexer] = SocketMultiplexer(self.logger) if event_loop else None
 
     def create_socket(
         self, 
@@ -31,15 +41,33 @@ class SocketHandler:
         self.logger.info(f"Socket created: {name}")
         return sock
 
-    def connect(self, name: str, host: str, port: int, timeout: float = 10.0):
-        """Connect socket to host:port."""
+    def connect(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        timeout: float = 10.0,
+        handler: Optional[Callable] = None,
+        on_close: Optional[CloseCallback] = None,
+    ):
+        """Connect socket to host:port.
+
+        In event-loop mode the connect only starts here (``timeout`` is not
+        used) and ``handler`` receives the socket's data: an
+        ``on_data(channel, data)`` callback or an ``async def`` coroutine
+        function taking the channel. Failures are passed to ``on_close``.
+        """
         try:
             sock = self.sockets.get(name)
             if not sock:
                 sock = self.create_socket(name)
+            if self.multiplexer is not None:
+                self.multiplexer.connect(name, host, port, handler, on_close=self._forget(on_close), sock=sock)
+                self.logger.debug("Connecting %s to %s:%d", name, host, port)
+                return
             sock.settimeout(timeout)
             sock.connect((host, port))
-            self.logger.success(f"Connected {name} to {host}:{port}")
+            self.logger.success("Connected %s to %s:%d", name, host, port)
         except Exception as e:
             self.logger.error(f"Connection failed: {e}")
             raise
@@ -47,28 +75,101 @@ class SocketHandler:
     def send(self, name: str, data: bytes) -> int:
         """Send data on socket."""
         try:
+            if self.multiplexer is not None:
+                self.multiplexer.send(name, data)
+                self.logger.debug("Queued %d bytes on %s", len(data), name)
+                return len(data)
             sock = self.sockets[name]
             sock.sendall(data)
-            self.logger.info(f"Sent {len(data)} bytes on {name}")
+            self.logger.info("Sent %d bytes on %s", len(data), name)
             return len(data)
         except Exception as e:
             self.logger.error(f"Send failed: {e}")
             raise
 
-    def receive(self, name: str, buffer_size: int = 4096) -> bytes:
-        """Receive data from socket."""
+    def receive(self, name: str, buffer_size: int = 4096, timeout: Optional[float] = None) -> bytes:
+        """Receive data from socket.
+
+        In event-loop mode this runs the loop until the socket (which must
+        not have a handler) has data, reaches EOF or timeout expires, so
+        other sockets keep being serviced while waiting.
+        """
         try:
+            if self.multiplexer is not None:
+                return self._receive_buffered(name, buffer_size, timeout)
             sock = self.sockets[name]
             data = sock.recv(buffer_size)
-            self.logger.info(f"Received {len(data)} bytes on {name}")
+            self.logger.info("Received %d bytes on %s", len(data), name)
             return data
         except Exception as e:
             self.logger.error(f"Receive failed: {e}")
             raise
 
+    def receive_into(self, name: str, pool: Optional[BufferPool] = None) -> PooledBuffer:
+        """Blocking mode: receive into a pooled buffer; release() it when done."""
+        try:
+            if self.multiplexer is not None:
+                raise RuntimeError("receive_into() is not available in event-loop mode")
+            buffer = (pool or BufferPool.shared()).recv_into(self.sockets[name])
+            self.logger.info("Received %d bytes on %s", buffer.length, name)
+            return buffer
+        except Exception as e:
+            self.logger.error(f"Receive failed: {e}")
+            raise
+
+    def _receive_buffered(self, name: str, buffer_size: int, timeout: Optional[float]) -> bytes:
+        """Event-loop receive: take up to buffer_size bytes from the channel inbox."""
+        channel = self.multiplexer.channels.get(name)
+        if channel is None:
+            raise KeyError(name)
+        self.multiplexer.run(timeout, until=lambda: bool(channel.inbox) or channel.eof or channel.closed)
+        data = bytes(channel.inbox[:buffer_size])
+        del channel.inbox[:buffer_size]
+        self.logger.info("Received %d bytes on %s", len(data), name)
+        return data
+
+    def listen(self, name: str, host: str, port: int, handler: Optional[Callable] = None) -> Channel:
+        """Event-loop mode: accept connections on host:port, handling each with handler."""
+        if self.multiplexer is None:
+            raise RuntimeError("listen() requires SocketHandler(event_loop=True)")
+        channel = self.multiplexer.listen(name, host, port, handler)
+        self.sockets[name] = channel.sock
+        self.logger.info("Listening on %s:%d as %s", host, port, name)
+        return channel
+
+    def run(self, timeout: Optional[float] = None, until: Optional[Callable[[], bool]] = None) -> bool:
+        """Event-loop mode: service all sockets (see SocketMultiplexer.run)."""
+        if self.multiplexer is None:
+            raise RuntimeError("run() requires SocketHandler(event_loop=True)")
+        return self.multiplexer.run(timeout, until)
+
+    def stop(self):
+        """Event-loop mode: make run() return."""
+        if self.multiplexer is not None:
+            self.multiplexer.stop()
+
+    def _forget(self, on_close: Optional[CloseCallback]) -> CloseCallback:
+        """Wrap on_close so sockets closed by the loop leave self.sockets."""
+
+        def closed(channel: Channel, error: Optional[BaseException]):
+            if self.sockets.get(channel.name) is channel.sock:
+                del self.sockets[channel.name]
+            if error is not None:
+                self.logger.error("Socket %s failed: %s", channel.name, error)
+            if on_close is not None:
+                on_close(channel, error)
+
+        return closed
+
     def close(self, name: str):
         """Close a socket."""
         try:
+            if self.multiplexer is not None:
+                # The loop closes the socket once its send buffer is flushed.
+                self.sockets.pop(name, None)
+                self.multiplexer.close(name)
+                self.logger.info(f"Socket closed: {name}")
+                return
             sock = self.sockets.pop(name)
             sock.close()
             self.logger.info(f"Socket closed: {name}")
@@ -79,3 +180,5 @@ class SocketHandler:
         """Close all sockets."""
         for name in list(self.sockets.keys()):
             self.close(name)
+        if self.multiplexer is not None:
+            self.multiplexer.close_all()
@@ -0,0 +1,168 @@
+"""Streaming subdomain enumeration over the pipelined DNS resolver."""
+
+import random
+import string
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Union
+from ..utils.logger import Logger
+from ..utils.aio import iter_async
+from .dns import DNSResolver
+
+Domains = Union[str, Iterable[str]]
+
+
+@dataclass
+class SubdomainResult:
+    """Subdomain that resolved to something other than the zone wildcard."""
+
+    name: str
+    zone: str
+    addresses: List[str]
+    cname: Optional[str] = None
+
+
+@dataclass
+class EnumStats:
+    """Progress counters for a running enumeration."""
+
+    submitted: int = 0
+    resolved: int = 0
+    found: int = 0
+    wildcard: int = 0
+    errors: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the enumeration started."""
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Names resolved per second."""
+        elapsed = self.elapsed
+        return self.resolved / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """One-line progress summary."""
+        return (
+            f"{self.resolved}/{self.submitted} resolved, {self.found} found, "
+            f"{self.wildcard} wildcard, {self.errors} errors ({self.rate:.0f}/s)"
+        )
+
+
+def read_wordlist(path: str) -> Iterator[str]:
+    """Lazily read subdomain labels from a wordlist file.
+
+    Blank lines and ``#`` comments are skipped and labels are lowercased;
+    the file is never loaded into memory as a whole.
+    """
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip().strip(".").lower()
+            if word and not word.startswith("#"):
+                yield word
+
+
+class SubdomainEnumerator:
+    """Resolve wordlist x zone candidates and stream the real hits.
+
+    Candidates are generated lazily and resolved through a shared
+    :class:`DNSResolver` with at most ``concurrency`` queries in flight.
+    Each zone is probed once up front with random labels; hits whose
+    addresses all belong to the zone's wildcard answer are dropped.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        resolver: Optional[DNSResolver] = None,
+        concurrency: int = 1000,
+        rtype: str = "A",
+        wildcard_probes: int = 3,
+        on_progress: Optional[Callable[[EnumStats], None]] = None,
+        progress_interval: float = 5.0,
+    ):
+        """Initialize enumerator.
+
+        ``on_progress`` is called with the live :class:`EnumStats` at most
+        every ``progress_interval`` seconds while names are resolving.
+        """
+        self.logger = logger or Logger()
+        self.resolver = resolver or DNSResolver(self.logger, concurrency=concurrency)
+        self.rtype = rtype
+        self.wildcard_probes = wildcard_probes
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.wildcards: Dict[str, FrozenSet[str]] = {}
+        self.stats = EnumStats()
+
+    def enumerate(self, domains: Domains, words: Iterable[str]) -> Iterator[SubdomainResult]:
+        """Enumerate subdomains, yielding results as they are found."""
+        return iter_async(self.resolver.closing_iter(self.enumerate_async(domains, words)))
+
+    async def enumerate_async(self, domains: Domains, words: Iterable[str]) -> AsyncIterator[SubdomainResult]:
+        """Async variant of enumerate()."""
+        zones = [domains] if isinstance(domains, str) else list(domains)
+        zones = [zone.strip().strip(".").lower() for zone in zones if zone.strip()]
+        self.stats = EnumStats()
+
+        for zone in zones:
+            if zone not in self.wildcards:
+                self.wildcards[zone] = await self.detect_wildcard(zone)
+
+        zone_of = {}
+        next_report = self.progress_interval
+        async for answer in self.resolver.resolve_many_async(self._candidates(zones, words, zone_of), self.rtype):
+            stats = self.stats
+            stats.resolved += 1
+            if self.on_progress is not None and stats.elapsed >= next_report:
+                next_report = stats.elapsed + self.progress_interval
+                self.on_progress(stats)
+            zone = zone_of.pop(answer.name, None) or _zone_for(answer.name, zones)
+            if answer.error is not None:
+                stats.errors += 1
+                continue
+            addresses = answer.values()
+            if not addresses:
+                continue
+            wildcard = self.wildcards.get(zone)
+            if wildcard and wildcard.issuperset(addresses):
+                stats.wildcard += 1
+                continue
+            stats.found += 1
+            cnames = answer.values("CNAME")
+            yield SubdomainResult(answer.name, zone, addresses, cnames[-1] if cnames else None)
+
+    async def detect_wildcard(self, zone: str) -> FrozenSet[str]:
+        """Return the addresses a zone answers for random labels (empty if none)."""
+        addresses = set()
+        for _ in range(self.wildcard_probes):
+            label = "".join(random.choices(string.ascii_lowercase + string.digits, k=16))
+            answer = await self.resolver.query(f"{label}.{zone}", self.rtype)
+            addresses.update(answer.values())
+        if addresses:
+            self.logger.warning(f"Wildcard DNS detected for {zone}: {', '.join(sorted(addresses))}")
+        return frozenset(addresses)
+
+    def _candidates(self, zones: List[str], words: Iterable[str], zone_of: Dict[str, str]) -> Iterator[str]:
+        """Lazily generate word.zone names, recording each name's zone."""
+        for word in words:
+            word = word.strip().strip(".").lower()
+            if not word or word.startswith("#"):
+                continue
+            for zone in zones:
+                name = f"{word}.{zone}"
+                zone_of[name] = zone
+                self.stats.submitted += 1
+                yield name
+
+
+def _zone_for(name: str, zones: List[str]) -> str:
+    """Find the longest zone that name belongs to."""
+    best = ""
+    for zone in zones:
+        if (name == zone or name.endswith("." + zone)) and len(zone) > len(best):
+            best = zone
+    return best
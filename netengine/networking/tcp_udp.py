@@ -4,6 +4,8 @@ import socket
 import struct
 from typing import Optional, Tuple
 from ..utils.logger import Logger
+from ..utils.buffer_pool import BufferPool, PooledBuffer
+from .udp_batch import UDPEndpoint
 
 
 class TCPHandler:
@@ -19,7 +21,7 @@ class TCPHandler:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(timeout)
             sock.connect((host, port))
-            self.logger.success(f"TCP connected to {host}:{port}")
+            self.logger.success("TCP connected to %s:%d", host, port)
             return sock
         except socket.timeout:
             self.logger.error(f"Connection timeout to {host}:{port}")
@@ -38,7 +40,7 @@ class TCPHandler:
         """Send data over TCP."""
         try:
             sent = sock.sendall(data)
-            self.logger.info(f"TCP sent {len(data)} bytes")
+            self.logger.info("TCP sent %d bytes", len(data))
             return len(data)
         except BrokenPipeError:
             self.logger.error("Connection lost: broken pipe")
@@ -51,7 +53,7 @@ class TCPHandler:
         """Receive data from TCP socket."""
         try:
             data = sock.recv(buffer_size)
-            self.logger.info(f"TCP received {len(data)} bytes")
+            self.logger.info("TCP received %d bytes", len(data))
             return data
         except socket.timeout:
             self.logger.error("Receive timeout")
@@ -60,6 +62,19 @@ class TCPHandler:
             self.logger.error(f"TCP receive failed", exc=e)
             raise
 
+    def receive_into(self, sock: socket.socket, pool: Optional[BufferPool] = None) -> PooledBuffer:
+        """Receive into a pooled buffer without copying; release() it when done."""
+        try:
+            buffer = (pool or BufferPool.shared()).recv_into(sock)
+            self.logger.info("TCP received %d bytes", buffer.length)
+            return buffer
+        except socket.timeout:
+            self.logger.error("Receive timeout")
+            raise
+        except Exception as e:
+            self.logger.error(f"TCP receive failed", exc=e)
+            raise
+
 
 class UDPHandler:  #RBg6MM
     """UDP protocol handler."""
@@ -74,7 +89,7 @@ class UDPHandler:  #RBg6MM
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             sock.settimeout(timeout)
             sock.sendto(data, (host, port))
-            self.logger.success(f"UDP sent to {host}:{port}")
+            self.logger.success("UDP sent to %s:%d", host, port)
             return sock
         except Exception as e:
             self.logger.error(f"UDP send failed: {e}")
@@ -84,11 +99,29 @@ class UDPHandler:  #RBg6MM
         """Receive UDP packet."""
         try:
             data, addr = sock.recvfrom(buffer_size)
-            self.logger.info(f"UDP received from {addr[0]}:{addr[1]}")
+            self.logger.info("UDP received from %s:%d", addr[0], addr[1])
             return data, addr
         except Exception as e:
             self.logger.error(f"UDP receive failed: {e}")
             raise
+
+    def receive_into(self, sock: socket.socket, pool: Optional[BufferPool] = None) -> PooledBuffer:
+        """Receive a datagram into a pooled buffer; the sender is in ``buffer.address``."""
+        try:
+            buffer = (pool or BufferPool.shared()).recvfrom_into(sock)
+            self.logger.info("UDP received from %s:%d", buffer.address[0], buffer.address[1])
+            return buffer
+        except Exception as e:
+            self.logger.error(f"UDP receive failed: {e}")
+            raise
+
+    def endpoint(self, **kwargs) -> UDPEndpoint:
+        """Open a batched UDP endpoint (one socket for many datagrams).
+
+        Prefer it to send() for more than a handful of packets: send() opens
+        a socket per datagram. Keyword arguments go to UDPEndpoint.
+        """
+        return UDPEndpoint(self.logger, **kwargs)
 awZgMRI1jhC
 ybsop4hRjzsx
 dKxpjWg0JtNq2s7xvI97ZgK5uiyuCwHBY1cOyAjh
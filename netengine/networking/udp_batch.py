@@ -0,0 +1,515 @@
+"""Batched UDP endpoint: one socket, sendmmsg/recvmmsg where available."""
+
+import array
+import collections
+import ctypes
+import ctypes.util
+import errno
+import itertools
+import select
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from ..utils.logger import Logger
+
+Address = Tuple[str, int]
+Datagram = Tuple[bytes, Address]
+Probe = Tuple[Address, bytes]
+
+# Ready-made discovery probes: (default port, payload, response key).
+# The DNS key is the transaction ID, so replies are matched per query.
+_DNS_ID = slice(0, 2)
+PROBES: Dict[str, Tuple[int, bytes, Optional[Callable[[bytes], Hashable]]]] = {
+    # Root NS query, recursion desired.
+    "dns": (53, b"\x4e\x45\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01", lambda data: data[_DNS_ID]),
+    # NTPv3 client request.
+    "ntp": (123, b"\x1b" + b"\x00" * 47, None),
+    # SNMPv1 GetRequest for sysDescr.0 with community "public".
+    "snmp": (
+        161,
+        bytes.fromhex(
+            "302602010004067075626c6963a019020101020100020100300e300c06082b060102010101000500"
+        ),
+        None,
+    ),
+}
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_SOCKADDR_IN = struct.Struct("=H2s4s8x")
+# struct iovec: native pointer and size_t, laid out like _IOVec.
+_IOVEC = struct.Struct("PN")
+_SOCKADDR_LEN = _SOCKADDR_IN.size
+# mmsghdr arrays are read as flat uint32 arrays: stride and field indexes.
+_MMSG_WORDS = ctypes.sizeof(_MMsgHdr) // 4
+_NAMELEN_WORD = (_MMsgHdr.msg_hdr.offset + _MsgHdr.msg_namelen.offset) // 4
+_MSGLEN_WORD = _MMsgHdr.msg_len.offset // 4
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0x40)
+
+
+def _load_mmsg():
+    """Return libc if it exports sendmmsg/recvmmsg (Linux), else None."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        for name in ("sendmmsg", "recvmmsg"):
+            func = getattr(libc, name)
+            func.restype = ctypes.c_int
+        libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        libc.recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_mmsg()
+
+
+def _is_ipv4(host: str) -> bool:
+    """Check whether host is a dotted-quad IPv4 literal (no lookup needed)."""
+    try:
+        return host.count(".") == 3 and bool(socket.inet_aton(host))
+    except OSError:
+        return False
+
+
+@dataclass
+class UDPStats:
+    """Counters for a UDP endpoint."""
+
+    sent: int = 0
+    received: int = 0
+    matched: int = 0
+    unmatched: int = 0
+    errors: int = 0
+    syscalls: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the counters were reset."""
+        return time.monotonic() - self.started
+
+    @property
+    def send_rate(self) -> float:
+        """Datagrams sent per second."""
+        elapsed = self.elapsed
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def recv_rate(self) -> float:
+        """Datagrams received per second."""
+        elapsed = self.elapsed
+        return self.received / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """One-line summary."""
+        return (
+            f"{self.sent} sent ({self.send_rate:.0f} pps), {self.received} received "
+            f"({self.recv_rate:.0f} pps), {self.matched} matched, {self.errors} errors, "
+            f"{self.syscalls} syscalls"
+        )
+
+
+@dataclass
+class ProbeResult:
+    """A probe and its response (None if it timed out)."""
+
+    address: Address
+    payload: bytes
+    response: Optional[bytes] = None
+    rtt: Optional[float] = None
+
+    @property
+    def answered(self) -> bool:
+        """True if a response arrived."""
+        return self.response is not None
+
+
+class UDPEndpoint:
+    """One UDP socket that sends and receives datagrams in batches.
+
+    On Linux, batches go through ``sendmmsg``/``recvmmsg`` (called with
+    ctypes), moving up to ``batch_size`` datagrams per system call;
+    elsewhere, or with ``use_mmsg=False``, a tight sendto/recvfrom loop is
+    used. Destinations must be IPv4 addresses (probe() resolves names).
+    """
+
+    # Host names probe() keeps resolved at once; IPv4 literals bypass the cache.
+    resolve_cache_size = 4096
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        bind: Address = ("0.0.0.0", 0),
+        batch_size: int = 64,
+        buffer_size: int = 2048,
+        socket_buffer: int = 4 * 1024 * 1024,
+        use_mmsg: Optional[bool] = None,
+    ):
+        """Bind the socket and preallocate the batch structures."""
+        self.logger = logger or Logger()
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, option, socket_buffer)
+            except OSError:
+                pass
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+        self.use_mmsg = _libc is not None if use_mmsg is None else use_mmsg and _libc is not None
+        self.stats = UDPStats()
+        self._sockaddrs: Dict[Address, bytes] = {}
+        self._addresses: Dict[bytes, Address] = {}
+        if self.use_mmsg:
+            self._setup_mmsg()
+
+    def _setup_mmsg(self):
+        """Allocate reusable mmsghdr/iovec/sockaddr arrays for both directions.
+
+        The iovecs, addresses and receive headers live in bytearrays so a
+        batch is filled (or read back) with slice operations and one
+        struct.pack_into rather than per-field ctypes attribute access.
+        """
+        n = self.batch_size
+        size = self.buffer_size
+        self._send_msgs = (_MMsgHdr * n)()
+        self._send_iov_raw = bytearray(_IOVEC.size * n)
+        self._send_names_raw = bytearray(_SOCKADDR_LEN * n)
+        self._send_iov = (_IOVec * n).from_buffer(self._send_iov_raw)
+        send_names = ctypes.addressof((ctypes.c_char * len(self._send_names_raw)).from_buffer(self._send_names_raw))
+        self._iovec_structs: Dict[int, struct.Struct] = {}
+
+        self._recv_msgs_raw = bytearray(ctypes.sizeof(_MMsgHdr) * n)
+        self._recv_msgs = (_MMsgHdr * n).from_buffer(self._recv_msgs_raw)
+        words = memoryview(self._recv_msgs_raw).cast("I")
+        self._recv_namelens = words[_NAMELEN_WORD::_MMSG_WORDS]
+        self._recv_lengths = words[_MSGLEN_WORD::_MMSG_WORDS]
+        self._namelen_reset = memoryview(array.array("I", [_SOCKADDR_LEN] * n))
+        self._recv_iov = (_IOVec * n)()
+        self._recv_names_raw = bytearray(_SOCKADDR_LEN * n)
+        self._recv_data = bytearray(size * n)
+        self._recv_view = memoryview(self._recv_data)
+        recv_base = ctypes.addressof((ctypes.c_char * len(self._recv_data)).from_buffer(self._recv_data))
+        recv_names = ctypes.addressof((ctypes.c_char * len(self._recv_names_raw)).from_buffer(self._recv_names_raw))
+        for i in range(n):
+            header = self._send_msgs[i].msg_hdr
+            header.msg_name = send_names + i * _SOCKADDR_LEN
+            header.msg_namelen = _SOCKADDR_LEN
+            header.msg_iov = ctypes.pointer(self._send_iov[i])
+            header.msg_iovlen = 1
+
+            self._recv_iov[i].iov_base = recv_base + i * size
+            self._recv_iov[i].iov_len = size
+            header = self._recv_msgs[i].msg_hdr
+            header.msg_name = recv_names + i * _SOCKADDR_LEN
+            header.msg_iov = ctypes.pointer(self._recv_iov[i])
+            header.msg_iovlen = 1
+
+    def fileno(self) -> int:
+        """Socket file descriptor (for select/selectors)."""
+        return self.sock.fileno()
+
+    def close(self):
+        """Close the socket."""
+        self.sock.close()
+
+    def __enter__(self) -> "UDPEndpoint":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _sockaddr(self, address: Address) -> bytes:
+        """Packed sockaddr_in for address (cached)."""
+        packed = self._sockaddrs.get(address)
+        if packed is None:
+            if len(self._sockaddrs) >= 65536:
+                self._sockaddrs.clear()
+            host, port = address
+            packed = _SOCKADDR_IN.pack(socket.AF_INET, port.to_bytes(2, "big"), socket.inet_aton(host))
+            self._sockaddrs[address] = packed
+        return packed
+
+    def _sockaddr_list(self, batch: Sequence[Datagram]) -> List[bytes]:
+        """Packed sockaddr_in for every datagram of batch."""
+        cache = self._sockaddrs
+        try:
+            return [cache[address] for _, address in batch]
+        except KeyError:
+            return [self._sockaddr(address) for _, address in batch]
+
+    def _address(self, sockaddr: bytes) -> Address:
+        """(host, port) of a packed sockaddr_in (cached)."""
+        address = self._addresses.get(sockaddr)
+        if address is None:
+            if len(self._addresses) >= 65536:
+                self._addresses.clear()
+            _, port, host = _SOCKADDR_IN.unpack(sockaddr)
+            address = self._addresses[sockaddr] = (socket.inet_ntoa(host), int.from_bytes(port, "big"))
+        return address
+
+    def _iovec_struct(self, count: int) -> struct.Struct:
+        """Struct packing count iovecs at once (cached per count)."""
+        packer = self._iovec_structs.get(count)
+        if packer is None:
+            packer = self._iovec_structs[count] = struct.Struct("PN" * count)
+        return packer
+
+    def send_batch(self, datagrams: Sequence[Datagram], timeout: Optional[float] = None) -> int:
+        """Send (payload, address) datagrams; return how many were sent.
+
+        Waits up to timeout seconds (forever if None) whenever the socket
+        buffer is full. Datagrams the kernel rejects are counted as errors.
+        """
+        sent = 0
+        total = len(datagrams)
+        while sent < total:
+            if self.use_mmsg:
+                count = self._sendmmsg(datagrams, sent)
+            else:
+                count = self._sendto_loop(datagrams, sent)
+            if count > 0:
+                sent += count
+                continue
+            if count < 0:
+                # The datagram at `sent` was refused; skip it.
+                self.stats.errors += 1
+                sent += 1
+                continue
+            if not select.select([], [self.sock], [], timeout)[1]:
+                break
+        self.stats.sent += sent
+        return sent
+
+    def _sendmmsg(self, datagrams: Sequence[Datagram], start: int) -> int:
+        """One sendmmsg call; 0 when the socket buffer is full, -1 on error."""
+        count = min(self.batch_size, len(datagrams) - start)
+        batch = datagrams[start : start + count]
+        # The batch is laid out with joins and one pack_into per array, so
+        # the per-datagram work stays in C instead of Python bytecode.
+        payloads = [payload for payload, _ in batch]
+        joined = b"".join(payloads)
+        base = ctypes.cast(ctypes.c_char_p(joined), ctypes.c_void_p).value
+        lengths = list(map(len, payloads))
+        iovecs = [0] * (2 * count)
+        iovecs[0::2] = [base + offset for offset in itertools.accumulate([0] + lengths[:-1])]
+        iovecs[1::2] = lengths
+        self._iovec_struct(count).pack_into(self._send_iov_raw, 0, *iovecs)
+        self._send_names_raw[: count * _SOCKADDR_LEN] = b"".join(self._sockaddr_list(batch))
+        self.stats.syscalls += 1
+        result = _libc.sendmmsg(self.sock.fileno(), self._send_msgs, count, _MSG_DONTWAIT)
+        if result >= 0:
+            return result
+        err = ctypes.get_errno()
+        if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS, errno.EINTR):
+            return 0
+        self.logger.debug("sendmmsg failed: %s", errno.errorcode.get(err, err))
+        return -1
+
+    def _sendto_loop(self, datagrams: Sequence[Datagram], start: int) -> int:
+        """sendto() each datagram until the buffer fills; -1 if the first fails."""
+        sendto = self.sock.sendto
+        sent = 0
+        for payload, address in datagrams[start : start + self.batch_size]:
+            try:
+                sendto(payload, address)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                if sent:
+                    break
+                self.logger.debug("sendto %s failed: %s", address, e)
+                return -1
+            finally:
+                self.stats.syscalls += 1
+            sent += 1
+        return sent
+
+    def recv_batch(self, timeout: float = 0.0) -> List[Datagram]:
+        """Return the datagrams that arrive within timeout seconds.
+
+        Returns as soon as at least one datagram was read, with at most
+        ``batch_size`` datagrams.
+        """
+        if timeout and not select.select([self.sock], [], [], timeout)[0]:
+            return []
+        datagrams = self._recvmmsg() if self.use_mmsg else self._recvfrom_loop()
+        self.stats.received += len(datagrams)
+        return datagrams
+
+    def _recvmmsg(self) -> List[Datagram]:
+        self._recv_namelens[:] = self._namelen_reset
+        self.stats.syscalls += 1
+        count = _libc.recvmmsg(self.sock.fileno(), self._recv_msgs, self.batch_size, _MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                self.stats.errors += 1
+                self.logger.debug("recvmmsg failed: %s", errno.errorcode.get(err, err))
+            return []
+        # Lengths and sender addresses are sliced out of the raw arrays in
+        # bulk; senders repeat, so their decoded tuples come from a cache.
+        lengths = self._recv_lengths[:count].tolist()
+        names = bytes(self._recv_names_raw[: count * _SOCKADDR_LEN])
+        offsets = range(0, count * _SOCKADDR_LEN, _SOCKADDR_LEN)
+        addresses = self._addresses
+        try:
+            senders = [addresses[names[o : o + _SOCKADDR_LEN]] for o in offsets]
+        except KeyError:
+            senders = [self._address(names[o : o + _SOCKADDR_LEN]) for o in offsets]
+        view = self._recv_view
+        size = self.buffer_size
+        return [
+            (view[offset : offset + length].tobytes(), sender)
+            for offset, length, sender in zip(range(0, count * size, size), lengths, senders)
+        ]
+
+    def _recvfrom_loop(self) -> List[Datagram]:
+        recvfrom = self.sock.recvfrom
+        size = self.buffer_size
+        datagrams = []
+        for _ in range(self.batch_size):
+            try:
+                datagrams.append(recvfrom(size))
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                # e.g. ECONNREFUSED from an ICMP port unreachable
+                self.stats.errors += 1
+                self.logger.debug("recvfrom failed: %s", e)
+                break
+            finally:
+                self.stats.syscalls += 1
+        return datagrams
+
+    def _resolve(self, host: str, resolved: "collections.OrderedDict[str, Optional[str]]") -> Optional[str]:
+        """IPv4 address of host via the bounded LRU cache resolved (None if it fails)."""
+        if host in resolved:
+            resolved.move_to_end(host)
+            return resolved[host]
+        try:
+            address: Optional[str] = socket.gethostbyname(host)
+        except (socket.gaierror, UnicodeError) as e:
+            self.logger.error("Cannot resolve %s: %s", host, e)
+            address = None
+        resolved[host] = address
+        if len(resolved) > self.resolve_cache_size:
+            resolved.popitem(last=False)
+        return address
+
+    def probe(
+        self,
+        probes: Iterable[Probe],
+        timeout: float = 2.0,
+        rate: float = 0.0,
+        key: Optional[Callable[[bytes], Hashable]] = None,
+        include_timeouts: bool = False,
+    ) -> Iterator[ProbeResult]:
+        """Send (address, payload) probes and yield matched responses.
+
+        A response matches the oldest outstanding probe to the address it
+        came from whose ``key(payload)`` equals ``key(response)``; without
+        ``key`` the source address alone is used. ``rate`` caps probes per
+        second (0 for no limit). Responses are yielded while sending
+        continues; probes unanswered ``timeout`` seconds after being sent
+        are yielded with ``response=None`` when include_timeouts is set.
+
+        Host names are looked up (blocking) as their probes are reached, and
+        the most recent ``resolve_cache_size`` of them are remembered; give
+        IPv4 addresses to keep name lookups out of the send loop.
+        """
+        self.stats = UDPStats()
+        key = key or (lambda data: None)
+        pending: Dict[Tuple[Address, Hashable], Deque[Tuple[bytes, float]]] = {}
+        deadlines: Deque[Tuple[float, Address, Hashable]] = collections.deque()
+        resolved: "collections.OrderedDict[str, Optional[str]]" = collections.OrderedDict()
+        gap = self.batch_size / rate if rate > 0 else 0.0
+        next_send = time.monotonic()
+
+        def expire(now: float) -> Iterator[ProbeResult]:
+            while deadlines and deadlines[0][0] <= now:
+                _, address, probe_key = deadlines.popleft()
+                waiting = pending.get((address, probe_key))
+                # Its probe may have been answered already; the oldest one
+                # still waiting then has a later deadline entry of its own.
+                if not waiting or waiting[0][1] + timeout > now:
+                    continue
+                payload, _ = waiting.popleft()
+                if not waiting:
+                    del pending[(address, probe_key)]
+                if include_timeouts:
+                    yield ProbeResult(address, payload)
+
+        def receive(wait: float) -> Iterator[ProbeResult]:
+            for response, address in self.recv_batch(wait):
+                response_key = (address, key(response))
+                waiting = pending.get(response_key)
+                if not waiting:
+                    self.stats.unmatched += 1
+                    continue
+                payload, sent_at = waiting.popleft()
+                if not waiting:
+                    del pending[response_key]
+                self.stats.matched += 1
+                yield ProbeResult(address, payload, response, time.monotonic() - sent_at)
+
+        iterator = iter(probes)
+        exhausted = False
+        while not exhausted:
+            batch: List[Datagram] = []
+            for (host, port), payload in iterator:
+                address = host if _is_ipv4(host) else self._resolve(host, resolved)
+                if address is None:
+                    continue
+                batch.append((payload, (address, port)))
+                if len(batch) == self.batch_size:
+                    break
+            else:
+                exhausted = True
+            if not batch:
+                continue
+
+            wait = next_send - time.monotonic()
+            while wait > 0:
+                yield from receive(wait)
+                wait = next_send - time.monotonic()
+            next_send = max(next_send + gap, time.monotonic()) if gap else next_send
+
+            count = self.send_batch(batch)
+            now = time.monotonic()
+            for payload, address in batch[:count]:
+                probe_key = key(payload)
+                pending.setdefault((address, probe_key), collections.deque()).append((payload, now))
+                deadlines.append((now + timeout, address, probe_key))
+            yield from receive(0.0)
+            yield from expire(now)
+
+        while pending:
+            now = time.monotonic()
+            yield from expire(now)
+            if not deadlines:
+                break
+            yield from receive(max(0.0, min(deadlines[0][0] - now, 0.1)))
@@ -1,6 +1,17 @@
 # Utility modules
-from .logger import Logger
-from .proxychains import ProxyChainsManager  #zSL1vO
-from .packet_builder import PacketBuilder
+from .lazy_import import attach
 
-__all__ = ["Logger", "ProxyChainsManager", "PacketBuilder"]  #yAZnHK
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".logger": ["Logger", "LogLevel"],
+        ".log_sink": ["BufferedFileSink"],
+        ".proxychains": ["ProxyChainsManager"],  #zSL1vO
+        ".packet_builder": ["PacketBuilder"],
+        ".targets": ["TargetSpec", "HostSpec", "PortSpec"],
+        ".result_sink": ["ResultSink", "open_sink"],
+        ".buffer_pool": ["BufferPool", "PooledBuffer"],
+    },
+)
+
+__all__ = ["Logger", "LogLevel", "BufferedFileSink", "ProxyChainsManager", "PacketBuilder", "TargetSpec", "HostSpec", "PortSpec", "ResultSink", "open_sink", "BufferPool", "PooledBuffer"]  #yAZnHK
@@ -1,18 +1,25 @@
 """Advanced packet crafting for various protocols."""
 
-import socket
 import struct
-import platform
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Tuple
 from ..utils.logger import Logger
+from .checksum import checksum
+from .codec import FIN, RST, SYN
+from .packet_template import TCPPacketTemplate
+
+DNS_TYPES = {"A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "MX": 15, "TXT": 16, "AAAA": 28}
 
 
 class AdvancedPacketBuilder:
     """Build advanced custom packets."""
 
+    # Templates kept per (source, destination, flags) before the cache resets.
+    MAX_TEMPLATES = 1024
+
     def __init__(self, logger: Optional[Logger] = None):
         """Initialize packet builder."""
         self.logger = logger or Logger()
+        self._templates: Dict[Tuple[str, str, int], TCPPacketTemplate] = {}
 
     def build_syn_packet(
         self,
@@ -23,149 +30,47 @@ class AdvancedPacketBuilder:
         seq: int = 1000,
     ) -> bytes:
         """Build TCP SYN packet."""
-        try:
-            ttl = 64
-            protocol = socket.IPPROTO_TCP
-
-            src_packed = socket.inet_aton(src_ip)
-            dst_packed = socket.inet_aton(dst_ip)
-
-            ip_version = 4
-            ip_header_length = 5
-            ip_header = struct.pack(
-                "!BBHHHBBH",
-                (ip_version << 4) + ip_header_length,
-                0,
-                40,
-                0,
-                0,
-                ttl,
-                protocol,
-                0,
-            ) + src_packed + dst_packed
-
-            tcp_flags = 0x02
-            window = 5840
-            tcp_header = struct.pack(
-                "!HHLLBBHHH",
-                src_port,
-                dst_port,
-                seq,
-                0,
-                (5 << 4) + 0,
-                tcp_flags,
-                window,
-                0,
-                0,
-            )
-
-            checksum = self._checksum(ip_header + tcp_header)
-            ip_header_fixed = struct.pack(
-                "!BBHHHBBH",
-                (ip_version << 4) + ip_header_length,
-                0,
-                40,
-                0,
-                0,
-                ttl,
-                protocol,
-                checksum,
-            ) + src_packed + dst_packed
-
-            self.logger.debug("SYN packet built successfully")
-            return ip_header_fixed + tcp_header
-        except Exception as e:
-            self.logger.error("Failed to build SYN packet", exc=e)
-            raise
+        return self._tcp_packet("SYN", SYN, src_ip, dst_ip, src_port, dst_port, seq)
 
     def build_fin_packet(
         self, src_ip: str, dst_ip: str, src_port: int, dst_port: int
     ) -> bytes:
         """Build TCP FIN packet."""
-        try:
-            ttl = 64  #qVa74P
-            protocol = socket.IPPROTO_TCP
-
-            src_packed = socket.inet_aton(src_ip)
-            dst_packed = socket.inet_aton(dst_ip)
-
-            ip_version = 4
-            ip_header_length = 5
-            ip_header = struct.pack(
-                "!BBHHHBBH", (ip_version << 4) + ip_header_length, 0, 40, 0, 0, ttl, protocol, 0
-            ) + src_packed + dst_packed
-
-            tcp_flags = 0x01
-            window = 5840
-            tcp_header = struct.pack(
-                "!HHLLBBHHH", src_port, dst_port, 1000, 0, (5 << 4) + 0, tcp_flags, window, 0, 0
-            )
-
-            checksum = self._checksum(ip_header + tcp_header)
-            ip_header_fixed = struct.pack(
-                "!BBHHHBBH",
-                (ip_version << 4) + ip_header_length,
-                0,
-                40,
-                0,
-                0,
-                ttl,
-                protocol,
-                checksum,
-            ) + src_packed + dst_packed
-
-            self.logger.debug("FIN packet built successfully")
-            return ip_header_fixed + tcp_header
-        except Exception as e:
-            self.logger.error("Failed to build FIN packet", exc=e)
-            raise
+        return self._tcp_packet("FIN", FIN, src_ip, dst_ip, src_port, dst_port, 1000)  #qVa74P
 
     def build_rst_packet(
         self, src_ip: str, dst_ip: str, src_port: int, dst_port: int
     ) -> bytes:
         """Build TCP RST packet."""
-        try:
-            ttl = 64
-            protocol = socket.IPPROTO_TCP
-
-            src_packed = socket.inet_aton(src_ip)
-            dst_packed = socket.inet_aton(dst_ip)
-
-            ip_version = 4
-            ip_header_length = 5
-            ip_header = struct.pack(
-                "!BBHHHBBH", (ip_version << 4) + ip_header_length, 0, 40, 0, 0, ttl, protocol, 0
-            ) + src_packed + dst_packed
-
-            tcp_flags = 0x04
-            window = 5840
-            tcp_header = struct.pack(
-                "!HHLLBBHHH", src_port, dst_port, 1000, 0, (5 << 4) + 0, tcp_flags, window, 0, 0
-            )
+        return self._tcp_packet("RST", RST, src_ip, dst_ip, src_port, dst_port, 1000)
+
+    def _tcp_packet(
+        self, kind: str, flags: int, src_ip: str, dst_ip: str, src_port: int, dst_port: int, seq: int
+    ) -> bytes:
+        """Build an IPv4/TCP packet from a cached per-address template.
 
-            checksum = self._checksum(ip_header + tcp_header)
-            ip_header_fixed = struct.pack(
-                "!BBHHHBBH",
-                (ip_version << 4) + ip_header_length,
-                0,
-                40,
-                0,
-                0,
-                ttl,
-                protocol,
-                checksum,
-            ) + src_packed + dst_packed
-
-            self.logger.debug("RST packet built successfully")
-            return ip_header_fixed + tcp_header
+        The IP checksum covers the IP header only and the TCP checksum the
+        segment plus pseudo-header; both come precomputed from the template.
+        """
+        try:
+            key = (src_ip, dst_ip, flags)
+            template = self._templates.get(key)
+            if template is None:
+                if len(self._templates) >= self.MAX_TEMPLATES:
+                    self._templates.clear()
+                template = self._templates[key] = TCPPacketTemplate(src_ip, dst_ip, flags=flags)
+            packet = bytes(template.packet(src_port, dst_port, seq))
+            self.logger.debug("%s packet built successfully", kind)
+            return packet
         except Exception as e:
-            self.logger.error("Failed to build RST packet", exc=e)
+            self.logger.error("Failed to build %s packet", kind, exc=e)
             raise
 
-    def build_dns_query(self, domain: str, record_type: str = "A") -> bytes:
+    def build_dns_query(
+        self, domain: str, record_type: str = "A", transaction_id: int = 0x1234
+    ) -> bytes:
         """Build DNS query packet."""
         try:
-            transaction_id = 0x1234
             flags = 0x0100
             questions = 1
 
@@ -174,15 +79,14 @@ class AdvancedPacketBuilder:
             )
 
             qname = b""
-            for label in domain.split("."):
+            for label in domain.rstrip(".").split("."):
                 qname += struct.pack("!B", len(label)) + label.encode()
             qname += b"\x00"
 
-            type_map = {"A": 1, "MX": 15, "NS": 2, "TXT": 16, "CNAME": 5}
-            qtype = type_map.get(record_type, 1)
+            qtype = DNS_TYPES.get(record_type, 1)
             question = struct.pack("!HH", qtype, 1)
 
-            self.logger.debug(f"DNS query packet built for {domain}")
+            self.logger.debug("DNS query packet built for %s", domain)
             return header + qname + question
         except Exception as e:
             self.logger.error("Failed to build DNS query", exc=e)
@@ -190,20 +94,8 @@ class AdvancedPacketBuilder:
 
     @staticmethod
     def _checksum(data: bytes) -> int:
-        """Calculate IP/TCP checksum."""
-        sum_val = 0
-        count_to = (len(data) // 2) * 2
-
-        for i in range(0, count_to, 2):
-            w = (data[i] << 8) + data[i + 1]
-            sum_val += w
-
-        if count_to < len(data):
-            sum_val += data[-1]
-
-        sum_val = (sum_val >> 16) + (sum_val & 0xFFFF)
-        sum_val += sum_val >> 16
-        return ~sum_val & 0xFFFF
+        """Calculate Internet checksum."""
+        return checksum(data)
 7QThk6unRP24wY8Ex90g8fPAUAXMYST9eIEKxRRpNfPZ
 lCohH6OgJYkrbbk
 NdVaKeOwH12pwcf0b9bdKTpyYoX4jU5QJ6J
@@ -0,0 +1,94 @@
+"""Asyncio helpers shared by the concurrent engines."""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
+
+
+async def bounded_as_completed(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    limit: int,
+) -> AsyncIterator[Any]:
+    """Run ``func`` over ``items`` with at most ``limit`` coroutines in flight.
+
+    Items are pulled from the iterable lazily, so arbitrarily large (or
+    infinite) inputs are processed in constant memory. Results are yielded
+    in completion order as soon as they are available.
+    """
+    iterator = iter(items)
+    pending = set()
+    finished: "asyncio.Queue[asyncio.Future]" = asyncio.Queue()
+    exhausted = False
+
+    def on_done(task: asyncio.Future):
+        pending.discard(task)
+        finished.put_nowait(task)
+
+    # Completions are collected through done-callbacks rather than
+    # asyncio.wait(), which re-registers every pending task on each call and
+    # turns one-at-a-time completion into O(limit) work per result.
+    try:
+        while True:
+            while not exhausted and len(pending) + finished.qsize() < limit:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(func(item))
+                pending.add(task)
+                task.add_done_callback(on_done)
+
+            if not pending and finished.empty():
+                return
+
+            task = await finished.get()
+            yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def iter_async(agen: AsyncIterator[Any], loop: Optional[asyncio.AbstractEventLoop] = None) -> Iterator[Any]:
+    """Drive an async iterator from synchronous code, yielding each item.
+
+    A private event loop is created (unless one is given) and only runs while
+    the caller is waiting for the next item, so results stream out as they
+    are produced.
+    """
+    own_loop = loop is None
+    loop = loop or asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        try:
+            loop.run_until_complete(agen.aclose())
+        except Exception:
+            pass
+        if own_loop:
+            _cancel_pending(loop)
+            loop.close()
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine to completion on a private event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        _cancel_pending(loop)
+        loop.close()
+
+
+def _cancel_pending(loop: asyncio.AbstractEventLoop):
+    """Cancel and reap any tasks still scheduled on a loop."""
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
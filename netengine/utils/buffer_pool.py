@@ -0,0 +1,154 @@
+"""Reusable receive buffers for allocation-free socket reads."""
+
+import socket
+import threading
+from typing import Any, List, Optional, Tuple
+
+
+class PooledBuffer:
+    """A buffer leased from a :class:`BufferPool`.
+
+    ``data`` is a memoryview of the bytes received so far; no copy is made
+    until tobytes() or decode() is called. Call release() (or use the buffer
+    as a context manager) when done so the memory is reused: views of a
+    released buffer see whatever is received into it next.
+    """
+
+    __slots__ = ("pool", "buffer", "view", "length", "address", "ancdata", "flags")
+
+    def __init__(self, pool: "BufferPool", size: int):
+        """Allocate size bytes owned by pool."""
+        self.pool = pool
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.length = 0
+        self.address: Any = None
+        self.ancdata: List[Tuple[int, int, bytes]] = []
+        self.flags = 0
+
+    @property
+    def data(self) -> memoryview:
+        """View of the received bytes."""
+        return self.view[: self.length]
+
+    @property
+    def capacity(self) -> int:
+        """Size of the underlying buffer."""
+        return len(self.buffer)
+
+    def tobytes(self) -> bytes:
+        """Copy the received bytes out of the pool."""
+        return self.view[: self.length].tobytes()
+
+    def decode(self, encoding: str = "utf-8", errors: str = "replace") -> str:
+        """Decode the received bytes (only when the text is actually needed)."""
+        return str(self.view[: self.length], encoding, errors)
+
+    def recv_into(self, sock: socket.socket, nbytes: int = 0, flags: int = 0) -> int:
+        """Refill this buffer from sock (for readers that keep one lease)."""
+        self.length = sock.recv_into(self.view, nbytes, flags)
+        return self.length
+
+    def release(self):
+        """Return the buffer to its pool."""
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool._put(self)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bytes__(self) -> bytes:
+        return self.tobytes()
+
+    def __enter__(self) -> "PooledBuffer":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class BufferPool:
+    """Pool of fixed-size bytearrays filled with ``recv_into`` and friends.
+
+    Receiving into a pooled buffer avoids allocating a new bytes object per
+    read; at most ``max_free`` idle buffers are kept, extra ones are left to
+    the garbage collector. Safe to share between threads.
+    """
+
+    _shared: Optional["BufferPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, buffer_size: int = 65536, max_free: int = 64):
+        """Initialize pool of buffer_size-byte buffers."""
+        self.buffer_size = buffer_size
+        self.max_free = max_free
+        self.allocated = 0
+        self._free: List[PooledBuffer] = []
+
+    @classmethod
+    def shared(cls) -> "BufferPool":
+        """Process-wide default pool used by the protocol handlers."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def acquire(self) -> PooledBuffer:
+        """Lease an empty buffer."""
+        # list.pop()/append() are atomic, so the free list needs no lock on
+        # this hot path; max_free may be overshot by a buffer under races.
+        try:
+            buffer = self._free.pop()
+        except IndexError:
+            self.allocated += 1
+            return PooledBuffer(self, self.buffer_size)
+        buffer.pool = self
+        return buffer
+
+    def _put(self, buffer: PooledBuffer):
+        buffer.length = 0
+        buffer.address = None
+        if buffer.ancdata:
+            buffer.ancdata = []
+        buffer.flags = 0
+        if len(self._free) < self.max_free:
+            self._free.append(buffer)
+
+    @property
+    def free(self) -> int:
+        """Idle buffers ready for reuse."""
+        return len(self._free)
+
+    def recv_into(self, sock: socket.socket, nbytes: int = 0, flags: int = 0) -> PooledBuffer:
+        """Receive up to nbytes (default: buffer size) into a pooled buffer."""
+        buffer = self.acquire()
+        try:
+            buffer.length = sock.recv_into(buffer.view, nbytes, flags)
+        except BaseException:
+            buffer.release()
+            raise
+        return buffer
+
+    def recvfrom_into(self, sock: socket.socket, nbytes: int = 0, flags: int = 0) -> PooledBuffer:
+        """Receive a datagram into a pooled buffer; the sender is in ``address``."""
+        buffer = self.acquire()
+        try:
+            buffer.length, buffer.address = sock.recvfrom_into(buffer.view, nbytes, flags)
+        except BaseException:
+            buffer.release()
+            raise
+        return buffer
+
+    def recvmsg_into(self, sock: socket.socket, ancbufsize: int = 0, flags: int = 0) -> PooledBuffer:
+        """Receive with recvmsg_into (POSIX), keeping ancillary data and flags."""
+        buffer = self.acquire()
+        try:
+            buffer.length, buffer.ancdata, buffer.flags, buffer.address = sock.recvmsg_into(
+                [buffer.view], ancbufsize, flags
+            )
+        except BaseException:
+            buffer.release()
+            raise
+        return buffer
@@ -0,0 +1,89 @@
+"""Internet checksum (RFC 1071) with incremental updates (RFC 1624)."""
+
+import socket
+import struct
+from typing import Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Buffers at least this large are summed with NumPy when it is installed;
+# below it the array setup costs more than it saves.
+NUMPY_THRESHOLD = 2048
+
+_PSEUDO = struct.Struct("!4s4sBBH")
+
+
+def ones_sum(data: Buffer, initial: int = 0) -> int:
+    """16-bit one's complement sum of data (not inverted).
+
+    The buffer is read as one big-endian integer and reduced modulo 0xFFFF:
+    since 2**16 == 1 (mod 0xFFFF) that equals the end-around-carry sum of
+    its 16-bit words, computed in C instead of a Python loop over words.
+    An odd trailing byte is padded with a zero byte, as RFC 1071 requires.
+    ``initial`` is a previous ones_sum() to continue from.
+    """
+    length = len(data)
+    if numpy is not None and length >= NUMPY_THRESHOLD:
+        even = length & ~1
+        total = int(numpy.frombuffer(data, dtype=">u2", count=even // 2).sum(dtype=numpy.uint64))
+        if length & 1:
+            total += data[-1] << 8
+    else:
+        total = int.from_bytes(data, "big")
+        if length & 1:
+            total <<= 8
+    total = (total + initial) % 0xFFFF
+    # A non-zero sum that is a multiple of 0xFFFF is one's complement
+    # "negative zero", 0xFFFF, not 0.
+    if total == 0 and (initial or any(data)):
+        return 0xFFFF
+    return total
+
+
+def checksum(data: Buffer, initial: int = 0) -> int:
+    """Internet checksum of data: the inverted one's complement sum."""
+    return ~ones_sum(data, initial) & 0xFFFF
+
+
+def pseudo_header_sum(src_ip: Union[str, bytes], dst_ip: Union[str, bytes], protocol: int, length: int) -> int:
+    """One's complement sum of the IPv4 pseudo-header for TCP/UDP checksums.
+
+    Pass the result as ``initial`` to checksum() over the segment.
+    """
+    if isinstance(src_ip, str):
+        src_ip = socket.inet_aton(src_ip)
+    if isinstance(dst_ip, str):
+        dst_ip = socket.inet_aton(dst_ip)
+    return ones_sum(_PSEUDO.pack(src_ip, dst_ip, 0, protocol, length))
+
+
+def update(old_checksum: int, old_word: int, new_word: int) -> int:
+    """Adjust a checksum after one 16-bit word changed (RFC 1624, eqn. 3).
+
+    HC' = ~(~HC + ~m + m'), without re-summing the rest of the packet.
+    """
+    total = (~old_checksum & 0xFFFF) + (~old_word & 0xFFFF) + new_word
+    total = (total & 0xFFFF) + (total >> 16)
+    total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def update_bytes(old_checksum: int, old: Buffer, new: Buffer) -> int:
+    """Adjust a checksum after a field changed from old to new bytes.
+
+    The field must start at an even offset in the checksummed data; an odd
+    length is treated as padded with a zero byte, like the data itself.
+    """
+    if len(old) != len(new):
+        raise ValueError("Old and new field values must be the same length")
+    # ~HC + ~m + m' folded over every word of the field at once: the sum of
+    # ~m over words is the one's complement of sum(m).
+    total = (~old_checksum & 0xFFFF) + (~ones_sum(old) & 0xFFFF) + ones_sum(new)
+    total = (total & 0xFFFF) + (total >> 16)
+    total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
@@ -0,0 +1,276 @@
+"""IPv4, TCP, UDP and ICMP encoders and decoders with correct checksums."""
+
+import socket
+import struct
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Union
+from .checksum import checksum, ones_sum, pseudo_header_sum
+
+FIN, SYN, RST, PSH, ACK, URG = 0x01, 0x02, 0x04, 0x08, 0x10, 0x20
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+_IP = struct.Struct("!BBHHHBBH4s4s")
+_TCP = struct.Struct("!HHLLBBHHH")
+_UDP = struct.Struct("!HHHH")
+_ICMP = struct.Struct("!BBHHH")
+_U16 = struct.Struct("!H")
+
+_IP_CHECKSUM = 10
+_TCP_CHECKSUM = 16
+_UDP_CHECKSUM = 6
+_ICMP_CHECKSUM = 2
+
+
+def _options_words(options: bytes, limit: int, name: str) -> int:
+    """Number of 32-bit words options occupy, validating their length."""
+    if len(options) % 4 or len(options) > limit:
+        raise ValueError(f"{name} options must be a multiple of 4 bytes, at most {limit}")
+    return len(options) // 4
+
+
+@dataclass
+class IPv4:
+    """IPv4 header and payload.
+
+    ``checksum`` is filled in by decode(); encode() computes it when it is
+    None and writes the given value otherwise (to craft bad packets).
+    """
+
+    src: str
+    dst: str
+    protocol: int
+    payload: bytes = b""
+    ttl: int = 64
+    ident: int = 0
+    tos: int = 0
+    flags: int = 0
+    fragment_offset: int = 0
+    options: bytes = b""
+    checksum: Optional[int] = field(default=None, compare=False)
+
+    @property
+    def header_length(self) -> int:
+        """Header size in bytes, options included."""
+        return _IP.size + len(self.options)
+
+    def encode(self) -> bytes:
+        """Serialize header and payload."""
+        ihl = 5 + _options_words(self.options, 40, "IPv4")
+        packet = bytearray(
+            _IP.pack(
+                0x40 | ihl,
+                self.tos,
+                ihl * 4 + len(self.payload),
+                self.ident,
+                (self.flags << 13) | self.fragment_offset,
+                self.ttl,
+                self.protocol,
+                0,
+                socket.inet_aton(self.src),
+                socket.inet_aton(self.dst),
+            )
+        )
+        packet += self.options
+        value = self.checksum if self.checksum is not None else checksum(packet)
+        _U16.pack_into(packet, _IP_CHECKSUM, value)
+        packet += self.payload
+        return bytes(packet)
+
+    @classmethod
+    def decode(cls, data: bytes, verify: bool = False) -> "IPv4":
+        """Parse an IPv4 packet; with verify, reject a bad header checksum."""
+        if len(data) < _IP.size:
+            raise ValueError("IPv4 packet too short")
+        (version_ihl, tos, total_length, ident, frag, ttl, protocol, value, src, dst) = _IP.unpack_from(data)
+        if version_ihl >> 4 != 4:
+            raise ValueError(f"Not an IPv4 packet (version {version_ihl >> 4})")
+        header_length = (version_ihl & 0x0F) * 4
+        if header_length < _IP.size or total_length < header_length or len(data) < total_length:
+            raise ValueError("IPv4 length fields exceed packet")
+        if verify and ones_sum(memoryview(data)[:header_length]) != 0xFFFF:
+            raise ValueError("IPv4 header checksum mismatch")
+        return cls(
+            src=socket.inet_ntoa(src),
+            dst=socket.inet_ntoa(dst),
+            protocol=protocol,
+            payload=bytes(data[header_length:total_length]),
+            ttl=ttl,
+            ident=ident,
+            tos=tos,
+            flags=frag >> 13,
+            fragment_offset=frag & 0x1FFF,
+            options=bytes(data[_IP.size : header_length]),
+            checksum=value,
+        )
+
+
+def _verify_transport(data: bytes, name: str, protocol: int, src_ip: Optional[str], dst_ip: Optional[str]):
+    """Check a TCP/UDP checksum when both addresses are known."""
+    if src_ip is None or dst_ip is None:
+        return
+    if ones_sum(data, pseudo_header_sum(src_ip, dst_ip, protocol, len(data))) != 0xFFFF:
+        raise ValueError(f"{name} checksum mismatch")
+
+
+@dataclass
+class TCP:
+    """TCP segment. The checksum covers the RFC 793 pseudo-header."""
+
+    src_port: int
+    dst_port: int
+    seq: int = 0
+    ack: int = 0
+    flags: int = SYN
+    window: int = 5840
+    urgent: int = 0
+    options: bytes = b""
+    payload: bytes = b""
+    checksum: Optional[int] = field(default=None, compare=False)
+
+    def encode(self, src_ip: str, dst_ip: str) -> bytes:
+        """Serialize the segment; src_ip/dst_ip feed the pseudo-header."""
+        offset = 5 + _options_words(self.options, 40, "TCP")
+        segment = bytearray(
+            _TCP.pack(
+                self.src_port, self.dst_port, self.seq, self.ack,
+                offset << 4, self.flags, self.window, 0, self.urgent,
+            )
+        )
+        segment += self.options
+        segment += self.payload
+        if self.checksum is not None:
+            value = self.checksum
+        else:
+            value = checksum(segment, pseudo_header_sum(src_ip, dst_ip, socket.IPPROTO_TCP, len(segment)))
+        _U16.pack_into(segment, _TCP_CHECKSUM, value)
+        return bytes(segment)
+
+    @classmethod
+    def decode(cls, data: bytes, src_ip: Optional[str] = None, dst_ip: Optional[str] = None) -> "TCP":
+        """Parse a segment; the checksum is verified when both addresses are given."""
+        if len(data) < _TCP.size:
+            raise ValueError("TCP segment too short")
+        src_port, dst_port, seq, ack, offset, flags, window, value, urgent = _TCP.unpack_from(data)
+        header_length = (offset >> 4) * 4
+        if header_length < _TCP.size or header_length > len(data):
+            raise ValueError("TCP data offset exceeds segment")
+        _verify_transport(data, "TCP", socket.IPPROTO_TCP, src_ip, dst_ip)
+        return cls(
+            src_port=src_port,
+            dst_port=dst_port,
+            seq=seq,
+            ack=ack,
+            flags=flags,
+            window=window,
+            urgent=urgent,
+            options=bytes(data[_TCP.size : header_length]),
+            payload=bytes(data[header_length:]),
+            checksum=value,
+        )
+
+
+@dataclass
+class UDP:
+    """UDP datagram. A computed checksum of 0 is sent as 0xFFFF (RFC 768)."""
+
+    src_port: int
+    dst_port: int
+    payload: bytes = b""
+    checksum: Optional[int] = field(default=None, compare=False)
+
+    def encode(self, src_ip: str, dst_ip: str) -> bytes:
+        """Serialize the datagram; src_ip/dst_ip feed the pseudo-header."""
+        length = _UDP.size + len(self.payload)
+        datagram = bytearray(_UDP.pack(self.src_port, self.dst_port, length, 0))
+        datagram += self.payload
+        if self.checksum is not None:
+            value = self.checksum
+        else:
+            value = checksum(datagram, pseudo_header_sum(src_ip, dst_ip, socket.IPPROTO_UDP, length)) or 0xFFFF
+        _U16.pack_into(datagram, _UDP_CHECKSUM, value)
+        return bytes(datagram)
+
+    @classmethod
+    def decode(cls, data: bytes, src_ip: Optional[str] = None, dst_ip: Optional[str] = None) -> "UDP":
+        """Parse a datagram; a non-zero checksum is verified when both addresses are given."""
+        if len(data) < _UDP.size:
+            raise ValueError("UDP datagram too short")
+        src_port, dst_port, length, value = _UDP.unpack_from(data)
+        if length < _UDP.size or length > len(data):
+            raise ValueError("UDP length field exceeds datagram")
+        if value:
+            _verify_transport(data[:length], "UDP", socket.IPPROTO_UDP, src_ip, dst_ip)
+        return cls(src_port=src_port, dst_port=dst_port, payload=bytes(data[_UDP.size : length]), checksum=value)
+
+
+@dataclass
+class ICMP:
+    """ICMP message with an echo-style identifier/sequence header."""
+
+    icmp_type: int = ICMP_ECHO_REQUEST
+    code: int = 0
+    identifier: int = 0
+    sequence: int = 0
+    payload: bytes = b""
+    checksum: Optional[int] = field(default=None, compare=False)
+
+    def encode(self) -> bytes:
+        """Serialize the message."""
+        message = bytearray(_ICMP.pack(self.icmp_type, self.code, 0, self.identifier, self.sequence))
+        message += self.payload
+        value = self.checksum if self.checksum is not None else checksum(message)
+        _U16.pack_into(message, _ICMP_CHECKSUM, value)
+        return bytes(message)
+
+    @classmethod
+    def decode(cls, data: bytes, verify: bool = False) -> "ICMP":
+        """Parse a message; with verify, reject a bad checksum."""
+        if len(data) < _ICMP.size:
+            raise ValueError("ICMP message too short")
+        icmp_type, code, value, identifier, sequence = _ICMP.unpack_from(data)
+        if verify and ones_sum(data) != 0xFFFF:
+            raise ValueError("ICMP checksum mismatch")
+        return cls(
+            icmp_type=icmp_type,
+            code=code,
+            identifier=identifier,
+            sequence=sequence,
+            payload=bytes(data[_ICMP.size :]),
+            checksum=value,
+        )
+
+
+Transport = Union[TCP, UDP, ICMP]
+
+_PROTOCOLS = {TCP: socket.IPPROTO_TCP, UDP: socket.IPPROTO_UDP, ICMP: socket.IPPROTO_ICMP}
+
+
+def encode_packet(ip: IPv4, transport: Transport) -> bytes:
+    """Encode transport inside ip, setting the protocol and payload."""
+    ip.protocol = _PROTOCOLS[type(transport)]
+    if isinstance(transport, ICMP):
+        ip.payload = transport.encode()
+    else:
+        ip.payload = transport.encode(ip.src, ip.dst)
+    return ip.encode()
+
+
+def decode_packet(data: bytes, verify: bool = True) -> Tuple[IPv4, Union[Transport, bytes]]:
+    """Decode an IPv4 packet and its TCP/UDP/ICMP payload.
+
+    Payloads of other protocols, and of fragments, are returned as raw
+    bytes. With verify, every checksum is checked.
+    """
+    ip = IPv4.decode(data, verify=verify)
+    if ip.fragment_offset or ip.flags & 0x1:
+        return ip, ip.payload
+    src, dst = (ip.src, ip.dst) if verify else (None, None)
+    if ip.protocol == socket.IPPROTO_TCP:
+        return ip, TCP.decode(ip.payload, src, dst)
+    if ip.protocol == socket.IPPROTO_UDP:
+        return ip, UDP.decode(ip.payload, src, dst)
+    if ip.protocol == socket.IPPROTO_ICMP:
+        return ip, ICMP.decode(ip.payload, verify=verify)
+    return ip, ip.payload
@@ -0,0 +1,29 @@
+"""Deferred imports for package __init__ modules (PEP 562)."""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def attach(package: str, exports: Dict[str, Iterable[str]]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return (__getattr__, __dir__) hooks that import exported names on first use.
+
+    ``exports`` maps a relative submodule (".logger") to the names it
+    provides. A submodule is only imported when one of its names is first
+    looked up on the package; the value is then stored on the package so
+    later lookups are plain attribute reads.
+    """
+    origins = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = origins.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origins))
+
+    return __getattr__, __dir__
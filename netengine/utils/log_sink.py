@@ -0,0 +1,191 @@
+"""Buffered, thread-backed log file writer with size-based rotation."""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+# Queue items are either a log line or a control Event (flush/stop marker).
+_Item = Union[str, threading.Event]
+
+
+class BufferedFileSink:
+    """Append log lines to a file from a single background writer thread.
+
+    The file handle stays open for the life of the sink. Callers only
+    enqueue lines onto a bounded queue (blocking when it is full, so nothing
+    is dropped); the writer thread drains it in batches, flushes to disk at
+    least every ``flush_interval`` seconds and rotates the file once it
+    grows past ``max_bytes`` (``path.1`` ... ``path.N``, like
+    logging.handlers.RotatingFileHandler). Because every line passes through
+    one FIFO queue and one writer, output keeps the order in which the
+    lines were logged, across all threads.
+    """
+
+    _sinks: Dict[str, "BufferedFileSink"] = {}
+    _sinks_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        flush_interval: float = 1.0,
+        max_bytes: int = 0,
+        backup_count: int = 3,
+        encoding: str = "utf-8",
+    ):
+        """Open path for appending and start the writer thread.
+
+        ``max_bytes`` of 0 disables rotation.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self._queue: "queue.Queue[_Item]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._closed = False
+        self._file = open(path, "a", encoding=encoding)
+        self._size = os.path.getsize(path)
+        self._thread = threading.Thread(target=self._run, name=f"log-sink:{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get(cls, path: str, **options) -> "BufferedFileSink":
+        """Return the process-wide sink for path, creating it on first use.
+
+        Loggers writing to the same file share one sink, and so one queue,
+        which is what keeps their lines ordered.
+        """
+        key = os.path.abspath(path)
+        sink = cls._sinks.get(key)
+        if sink is None or sink.closed:
+            with cls._sinks_lock:
+                sink = cls._sinks.get(key)
+                if sink is None or sink.closed:
+                    sink = cls._sinks[key] = cls(path, **options)
+        return sink
+
+    @classmethod
+    def close_all(cls):
+        """Flush and close every shared sink."""
+        with cls._sinks_lock:
+            sinks, cls._sinks = list(cls._sinks.values()), {}
+        for sink in sinks:
+            sink.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether close() has been called."""
+        return self._closed
+
+    def write(self, line: str):
+        """Queue one line (without trailing newline) for writing."""
+        if self._closed:
+            raise ValueError(f"Log sink for {self.path} is closed")
+        self._queue.put(line)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every line queued so far is on disk."""
+        if self._closed:
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Write out queued lines, stop the writer and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._queue.put(self._stop)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer thread: drain the queue in batches until stopped."""
+        last_flush = time.monotonic()
+        dirty = False
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush)) if dirty else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            batch: List[str] = []
+            markers: List[threading.Event] = []
+            while item is not None:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch:
+                self._write_batch(batch)
+                dirty = True
+            if dirty and (markers or time.monotonic() - last_flush >= self.flush_interval):
+                self._flush_file()
+                dirty = False
+                last_flush = time.monotonic()
+            for marker in markers:
+                marker.set()
+            if self._stop in markers:
+                self._file.close()
+                return
+
+    def _write_batch(self, lines: List[str]):
+        """Write lines, rotating first whenever the size limit is reached."""
+        chunk = "\n".join(lines) + "\n"
+        try:
+            if not self.max_bytes:
+                self._file.write(chunk)
+                return
+            size = len(chunk.encode(self.encoding, "replace"))
+            if self._size + size > self.max_bytes:
+                for line in lines:
+                    self._write_text(line + "\n")
+            else:
+                self._file.write(chunk)
+                self._size += size
+        except (OSError, ValueError) as e:
+            print(f"Error writing to log: {e}")
+
+    def _write_text(self, text: str):
+        """Write one piece of text, rotating if it would overflow the file."""
+        size = len(text.encode(self.encoding, "replace"))
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += size
+
+    def _flush_file(self):
+        """Push buffered data to the OS."""
+        try:
+            self._file.flush()
+        except (OSError, ValueError) as e:
+            print(f"Error writing to log: {e}")
+
+    def _rotate(self):
+        """Shift path -> path.1 -> ... -> path.N and reopen path."""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "a", encoding=self.encoding)
+        else:
+            self._file = open(self.path, "w", encoding=self.encoding)
+        self._size = 0
+
+
+atexit.register(BufferedFileSink.close_all)
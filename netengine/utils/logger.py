@@ -2,9 +2,10 @@
 
 import os
 import sys
-from enum import Enum
-from datetime import datetime
-from typing import Optional
+import time
+from enum import Enum, IntEnum
+from typing import Optional, Union
+from .log_sink import BufferedFileSink
 
 
 class Colors(Enum):
@@ -29,16 +30,73 @@ class Colors(Enum):
         return sys.stdout.isatty()
 
 
-class Logger:
-    """Colorful logging utility with error handling."""
+class LogLevel(IntEnum):
+    """Message severities, lowest first."""
+
+    DEBUG = 10
+    INFO = 20
+    SUCCESS = 25
+    WARNING = 30
+    ERROR = 40
+    SILENT = 100
+
+
+# Plain-int copies for the per-call level checks (IntEnum comparisons are slow).
+_DEBUG, _INFO, _SUCCESS, _WARNING, _ERROR = (
+    int(level) for level in (LogLevel.DEBUG, LogLevel.INFO, LogLevel.SUCCESS, LogLevel.WARNING, LogLevel.ERROR)
+)
+
 
-    def __init__(self, verbose: bool = False, log_file: Optional[str] = None):
-        """Initialize logger."""
+class Logger:
+    """Colorful logging utility with error handling.
+
+    Messages below the process-wide threshold (see :meth:`set_level`) are
+    dropped before any formatting happens. Messages take %-style arguments
+    that are only interpolated once a message is known to be emitted, so
+    hot paths can log as ``logger.info("sent %d bytes", n)`` at almost no
+    cost when that level is off.
+    """
+
+    # Process-wide threshold, stored as a plain int for cheap comparisons.
+    level: int = LogLevel.INFO.value
+
+    # (second, "HH:MM:SS") shared by all loggers; rebuilt once per second.
+    _timestamp_cache = (0, "")
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        log_file: Optional[str] = None,
+        flush_interval: float = 1.0,
+        max_bytes: int = 0,
+        backup_count: int = 3,
+    ):
+        """Initialize logger.
+
+        File output goes through a shared :class:`BufferedFileSink`, flushed
+        every ``flush_interval`` seconds and rotated past ``max_bytes``
+        (0 = never).
+        """
         self.verbose = verbose
         self.log_file = log_file
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._sink: Optional[BufferedFileSink] = None
         self.colors_enabled = Colors.is_supported()
         self._setup_windows_colors()
 
+    @classmethod
+    def set_level(cls, level: Union[LogLevel, int, str]):
+        """Set the process-wide threshold (a LogLevel, its value or its name)."""
+        if isinstance(level, str):
+            level = LogLevel[level.upper()]
+        cls.level = int(level)
+
+    def is_enabled(self, level: int) -> bool:
+        """Whether a message at level would be emitted by this logger."""
+        return level >= Logger.level or (self.verbose and level >= _DEBUG)
+
     def _setup_windows_colors(self):
         """Setup colors for Windows console."""
         if os.name == "nt":
@@ -55,50 +113,87 @@ class Logger:
             text = text.replace(color.value, "")
         return text
 
+    @classmethod
+    def _timestamp(cls) -> str:
+        """Current HH:MM:SS, formatted at most once per second."""
+        now = time.time()
+        second = int(now)
+        cached = cls._timestamp_cache
+        if cached[0] != second:
+            cached = cls._timestamp_cache = (second, time.strftime("%H:%M:%S", time.localtime(now)))
+        return cached[1]
+
     def _format(self, message: str, color: Colors, icon: str) -> str:
         """Format message with color and timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self._timestamp()
         if self.colors_enabled:
             return f"{color.value}[{timestamp}] {icon}{Colors.END.value} {message}"
         return f"[{timestamp}] {icon} {message}"
 
     def _write(self, message: str):
-        """Write message to console and log file."""
-        print(message)
+        """Write message to console and queue it for the log file."""
+        # One write call per line, so lines from different threads never interleave.
+        sys.stdout.write(message + "\n")
         if self.log_file:
             try:
-                with open(self.log_file, "a") as f:
-                    f.write(self._strip_colors(message) + "\n")
+                self._file_sink().write(self._strip_colors(message) if self.colors_enabled else message)
             except Exception as e:
                 print(f"Error writing to log: {e}")
+
+    def _file_sink(self) -> BufferedFileSink:
+        """Return the sink for the current log_file."""
+        sink = self._sink
+        if sink is None or sink.closed or sink.path != self.log_file:
+            sink = self._sink = BufferedFileSink.get(
+                self.log_file,
+                flush_interval=self.flush_interval,
+                max_bytes=self.max_bytes,
+                backup_count=self.backup_count,
+            )
+        return sink
+
+    def flush(self):
+        """Block until everything logged so far has been written out."""
+        sys.stdout.flush()
+        if self._sink is not None:
+            self._sink.flush()
   #iJ1wCk
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message."""
-        self._write(self._format(message, Colors.BLUE, "ℹ"))
+        if _INFO >= Logger.level or self.verbose:
+            self._write(self._format(message % args if args else message, Colors.BLUE, "ℹ"))
 
-    def success(self, message: str):
+    def success(self, message: str, *args):
         """Log success message."""
-        self._write(self._format(message, Colors.GREEN, "✓"))
+        if _SUCCESS >= Logger.level or self.verbose:
+            self._write(self._format(message % args if args else message, Colors.GREEN, "✓"))
 
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message."""
-        self._write(self._format(message, Colors.YELLOW, "⚠"))
+        if _WARNING >= Logger.level or self.verbose:
+            self._write(self._format(message % args if args else message, Colors.YELLOW, "⚠"))
 
-    def error(self, message: str, exc: Optional[Exception] = None):
+    def error(self, message: str, *args, exc: Optional[Exception] = None):
         """Log error message with optional exception."""
+        if not (_ERROR >= Logger.level or self.verbose):
+            return
+        if args:
+            message = message % args
         if exc:
             full_msg = f"{message} | {exc.__class__.__name__}: {exc}"
         else:
             full_msg = message
         self._write(self._format(full_msg, Colors.RED, "✗"))
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message if verbose."""
-        if self.verbose:
-            self._write(self._format(message, Colors.CYAN, "🐛"))
+        if self.verbose or _DEBUG >= Logger.level:
+            self._write(self._format(message % args if args else message, Colors.CYAN, "🐛"))
 
     def banner(self, text: str):
         """Display fancy banner."""
+        if not self.is_enabled(LogLevel.INFO):
+            return
         if self.colors_enabled:
             width = len(text) + 4
             print(f"{Colors.BOLD.value}{Colors.CYAN.value}")
@@ -1,7 +1,9 @@
 """Packet building utilities for various protocols."""
 
+import socket
 import struct
 from typing import Optional, Dict, Any
+from .codec import IPv4, SYN, TCP, encode_packet
 
 
 class PacketBuilder:
@@ -10,47 +12,7 @@ class PacketBuilder:
     @staticmethod
     def tcp_syn_packet(src_ip: str, dst_ip: str, src_port: int, dst_port: int) -> bytes:
         """Build TCP SYN packet."""
-        ip_version = 4
-        ip_header_length = 5
-        ttl = 64
-        protocol = 6
-
-        source_ip = struct.unpack("=L", __import__("socket").inet_aton(src_ip))[0]
-        dest_ip = struct.unpack("=L", __import__("socket").inet_aton(dst_ip))[0]
-
-        ip_header = struct.pack(
-            "!BBHHHBBH4s4s",
-            (ip_version << 4) + ip_header_length,
-            0,
-            40,
-            0,
-            0,
-            ttl,
-            protocol,
-            0,
-            __import__("socket").inet_aton(src_ip),
-            __import__("socket").inet_aton(dst_ip),
-        )
-
-        sequence_num = 0
-        ack_num = 0
-        flag_syn = 2
-        window = 5840
-
-        tcp_header = struct.pack(
-            "!HHLLBBHHH",
-            src_port,
-            dst_port,
-            sequence_num,
-            ack_num,
-            (5 << 4) + 0,
-            flag_syn,
-            window,
-            0,
-            0,
-        )
-
-        return ip_header + tcp_header
+        return encode_packet(IPv4(src_ip, dst_ip, socket.IPPROTO_TCP), TCP(src_port, dst_port, flags=SYN))
 
     @staticmethod
     def dns_query_packet(domain: str) -> bytes:
@@ -0,0 +1,149 @@
+"""Precompiled IPv4/TCP probe templates for allocation-free packet generation."""
+
+import socket
+import struct
+from typing import Iterable, Optional, Tuple, Union
+from .checksum import checksum, ones_sum, pseudo_header_sum
+from .codec import SYN
+
+_IP = struct.Struct("!BBHHHBBH4s4s")
+_TCP = struct.Struct("!HHLLBBHHH")
+_U16 = struct.Struct("!H")
+# Source port, destination port and sequence number: the per-probe fields.
+_PROBE = struct.Struct("!HHL")
+
+IP_HEADER_LEN = _IP.size
+TCP_HEADER_LEN = _TCP.size
+PACKET_LEN = IP_HEADER_LEN + TCP_HEADER_LEN
+
+_IP_CHECKSUM = 10
+_PROBE_OFFSET = IP_HEADER_LEN
+_TCP_CHECKSUM = IP_HEADER_LEN + 16
+
+Probe = Tuple[int, int, int]
+
+
+class TCPPacketTemplate:
+    """IPv4 + TCP header (no options) built once and patched per probe.
+
+    Everything that is the same for every probe (addresses, TTL, flags,
+    window, the IP header checksum and the pseudo-header sum) is computed at
+    construction time. Producing a packet only writes the ports, sequence
+    number and TCP checksum into a preallocated buffer with
+    ``Struct.pack_into``; the checksum is derived from the precomputed sum
+    of the constant words, so no bytes are re-summed and nothing is
+    allocated per packet.
+    """
+
+    def __init__(
+        self,
+        src_ip: str,
+        dst_ip: str,
+        flags: int = SYN,
+        window: int = 5840,
+        ttl: int = 64,
+        ip_id: int = 0,
+        ack: int = 0,
+    ):
+        """Build the constant header for src_ip -> dst_ip."""
+        self.flags = flags
+        self.window = window
+        self.ttl = ttl
+        self.ip_id = ip_id
+        self.ack = ack
+        self.buffer = bytearray(PACKET_LEN)
+        self._view = memoryview(self.buffer)
+        self.set_addresses(src_ip, dst_ip)
+
+    def set_addresses(self, src_ip: Union[str, bytes], dst_ip: Union[str, bytes]):
+        """Change source/destination address (recomputes the constant sums)."""
+        self.src_packed = socket.inet_aton(src_ip) if isinstance(src_ip, str) else bytes(src_ip)
+        self.dst_packed = socket.inet_aton(dst_ip) if isinstance(dst_ip, str) else bytes(dst_ip)
+
+        buffer = self.buffer
+        _IP.pack_into(
+            buffer, 0, 0x45, 0, PACKET_LEN, self.ip_id, 0, self.ttl, socket.IPPROTO_TCP, 0,
+            self.src_packed, self.dst_packed,
+        )
+        _U16.pack_into(buffer, _IP_CHECKSUM, checksum(self._view[:IP_HEADER_LEN]))
+
+        # Ports, sequence number and checksum are left zero: they are the
+        # only words that change, and get added to this sum per probe.
+        _TCP.pack_into(buffer, IP_HEADER_LEN, 0, 0, 0, self.ack, 5 << 4, self.flags, self.window, 0, 0)
+        pseudo = pseudo_header_sum(self.src_packed, self.dst_packed, socket.IPPROTO_TCP, TCP_HEADER_LEN)
+        self._base_sum = ones_sum(self._view[IP_HEADER_LEN:], pseudo)
+        self._header = bytes(buffer)
+
+    def tcp_checksum(self, src_port: int, dst_port: int, seq: int) -> int:
+        """TCP checksum for a probe with the given varying fields."""
+        total = self._base_sum + src_port + dst_port + (seq >> 16) + (seq & 0xFFFF)
+        total = (total & 0xFFFF) + (total >> 16)
+        total = (total & 0xFFFF) + (total >> 16)
+        return ~total & 0xFFFF
+
+    def packet(self, src_port: int, dst_port: int, seq: int = 0) -> bytearray:
+        """Return the template's own buffer filled in for one probe.
+
+        The same bytearray is reused (and overwritten) by the next call;
+        send it or copy it before asking for another packet.
+        """
+        buffer = self.buffer
+        _PROBE.pack_into(buffer, _PROBE_OFFSET, src_port, dst_port, seq)
+        _U16.pack_into(buffer, _TCP_CHECKSUM, self.tcp_checksum(src_port, dst_port, seq))
+        return buffer
+
+    def fill(self, out: Union[bytearray, memoryview], offset: int, src_port: int, dst_port: int, seq: int = 0):
+        """Write one complete packet into out at offset."""
+        out[offset : offset + PACKET_LEN] = self._header
+        _PROBE.pack_into(out, offset + _PROBE_OFFSET, src_port, dst_port, seq)
+        _U16.pack_into(out, offset + _TCP_CHECKSUM, self.tcp_checksum(src_port, dst_port, seq))
+
+    def fill_batch(self, probes: Iterable[Probe], out: Optional[bytearray] = None) -> memoryview:
+        """Fill packets for (src_port, dst_port, seq) probes back to back.
+
+        Packets are written contiguously, PACKET_LEN bytes apart, into
+        ``out`` (which must be large enough) or a newly allocated buffer;
+        passing the same ``out`` on every call makes batch generation
+        allocation-free. Returns a view of the filled part.
+        """
+        if out is None:
+            probes = list(probes)
+            out = bytearray(len(probes) * PACKET_LEN)
+        view = memoryview(out)
+        capacity = len(view) // PACKET_LEN
+        if capacity:
+            _stamp_headers(view, self._header, capacity)
+
+        pack_probe = _PROBE.pack_into
+        pack_checksum = _U16.pack_into
+        base = self._base_sum
+        offset = 0
+        count = 0
+        for src_port, dst_port, seq in probes:
+            if count == capacity:
+                raise ValueError("Output buffer too small for batch")
+            pack_probe(view, offset + _PROBE_OFFSET, src_port, dst_port, seq)
+            total = base + src_port + dst_port + (seq >> 16) + (seq & 0xFFFF)
+            total = (total & 0xFFFF) + (total >> 16)
+            total = (total & 0xFFFF) + (total >> 16)
+            pack_checksum(view, offset + _TCP_CHECKSUM, ~total & 0xFFFF)
+            offset += PACKET_LEN
+            count += 1
+        return view[:offset]
+
+
+def _stamp_headers(view: memoryview, header: bytes, count: int):
+    """Copy header into count consecutive slots with O(log count) memmoves."""
+    view[:PACKET_LEN] = header
+    filled = PACKET_LEN
+    total = count * PACKET_LEN
+    while filled < total:
+        chunk = min(filled, total - filled)
+        view[filled : filled + chunk] = view[:chunk]
+        filled += chunk
+
+
+def iter_packets(batch: memoryview):
+    """Yield each packet of a fill_batch() result as a memoryview slice."""
+    for offset in range(0, len(batch), PACKET_LEN):
+        yield batch[offset : offset + PACKET_LEN]
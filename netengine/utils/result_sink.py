@@ -0,0 +1,210 @@
+"""Streaming, machine-readable result writers (JSONL, CSV, msgpack)."""
+
+import csv
+import dataclasses
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def to_record(result: Any) -> Dict[str, Any]:
+    """Convert a result object into a flat, serializable dict.
+
+    Dataclasses and NamedTuples are expanded field by field; anything else
+    that is not already a dict is wrapped as ``{"value": result}``.
+    """
+    if isinstance(result, dict):
+        return result
+    if dataclasses.is_dataclass(result) and not isinstance(result, type):
+        return {field.name: getattr(result, field.name) for field in dataclasses.fields(result)}
+    if hasattr(result, "_asdict"):
+        return result._asdict()
+    return {"value": result}
+
+
+def _plain(value: Any) -> Any:
+    """JSON fallback for values json can't encode natively."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if dataclasses.is_dataclass(value) or hasattr(value, "_asdict"):
+        return to_record(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class ResultSink(ABC):
+    """Base class: write one record per result, in constant memory."""
+
+    extension = ""
+
+    def __init__(self, stream: IO, flush: bool = False):
+        """Initialize sink over an open stream.
+
+        With ``flush`` set every record is pushed to the OS as soon as it is
+        written, for consumers reading a pipe in real time.
+        """
+        self.stream = stream
+        self.flush_each = flush
+        self.count = 0
+        self._owns_stream = False
+
+    @classmethod
+    def open(cls, path: str) -> "ResultSink":
+        """Open path for writing ("-" means stdout)."""
+        if path == "-":
+            return cls(cls._stdout(), flush=True)
+        sink = cls(cls._open_file(path))
+        sink._owns_stream = True
+        return sink
+
+    @staticmethod
+    def _stdout() -> IO:
+        """Stream used for "-"."""
+        return sys.stdout
+
+    @staticmethod
+    def _open_file(path: str) -> IO:
+        """Open an output file in the mode this format needs."""
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def write(self, result: Any):
+        """Serialize and write one result."""
+        self._write_record(to_record(result))
+        self.count += 1
+        if self.flush_each:
+            self.stream.flush()
+
+    @abstractmethod
+    def _write_record(self, record: Dict[str, Any]):
+        """Encode one record onto the stream."""
+        pass
+
+    def close(self):
+        """Flush and close the underlying stream (unless it is stdout)."""
+        if self._owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def __enter__(self) -> "ResultSink":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, *exc):
+        """Context manager exit."""
+        self.close()
+
+
+class JSONLSink(ResultSink):
+    """One JSON object per line."""
+
+    extension = ".jsonl"
+
+    def _write_record(self, record: Dict[str, Any]):
+        """Write record as one JSON line."""
+        self.stream.write(json.dumps(record, default=_plain, separators=(",", ":")) + "\n")
+
+
+class CSVSink(ResultSink):
+    """CSV with a header taken from the first record's keys.
+
+    Keys that first appear in later records are dropped; list and dict
+    values are stored as JSON.
+    """
+
+    extension = ".csv"
+
+    def __init__(self, stream: IO, flush: bool = False):
+        """Initialize CSV sink."""
+        super().__init__(stream, flush)
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write_record(self, record: Dict[str, Any]):
+        """Write record as a CSV row, emitting the header first."""
+        if self._writer is None:
+            self._writer = csv.DictWriter(self.stream, fieldnames=list(record), extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow({key: self._cell(value) for key, value in record.items()})
+
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        """Render a value as a CSV cell."""
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if isinstance(value, (list, tuple, dict)):
+            return json.dumps(value, default=_plain, separators=(",", ":"))
+        return _plain(value)
+
+
+class MsgpackSink(ResultSink):
+    """Concatenated msgpack maps, readable with ``msgpack.Unpacker``.
+
+    Requires the optional ``msgpack`` package.
+    """
+
+    extension = ".msgpack"
+
+    def __init__(self, stream: IO, flush: bool = False):
+        """Initialize msgpack sink."""
+        _require_msgpack()
+        super().__init__(stream, flush)
+        self._packer = msgpack.Packer(default=_plain, use_bin_type=True)
+
+    @classmethod
+    def open(cls, path: str) -> "ResultSink":
+        """Open path for writing, failing before the file is created if msgpack is missing."""
+        _require_msgpack()
+        return super().open(path)
+
+    @staticmethod
+    def _stdout() -> IO:
+        """Binary stdout."""
+        return sys.stdout.buffer
+
+    @staticmethod
+    def _open_file(path: str) -> IO:
+        """Open output file in binary mode."""
+        return open(path, "wb")
+
+    def _write_record(self, record: Dict[str, Any]):
+        """Write record as one msgpack map."""
+        self.stream.write(self._packer.pack(record))
+
+
+def _require_msgpack():
+    """Raise a helpful error when the optional msgpack package is missing."""
+    if msgpack is None:
+        raise ImportError("msgpack output requires the msgpack package (pip install msgpack)")
+
+
+SINKS = {
+    "jsonl": JSONLSink,
+    "csv": CSVSink,
+    "msgpack": MsgpackSink,
+}
+
+FORMATS: List[str] = list(SINKS)
+
+
+def open_sink(path: str, fmt: Optional[str] = None) -> ResultSink:
+    """Open a result sink, inferring the format from the file extension.
+
+    ``fmt`` overrides the extension; unknown extensions and "-" (stdout)
+    default to JSONL.
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = next((name for name, sink in SINKS.items() if sink.extension == ext), "jsonl")
+    try:
+        sink_class = SINKS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {fmt} (choose from {', '.join(FORMATS)})") from None
+    return sink_class.open(path)
@@ -0,0 +1,300 @@
+"""Lazy target specification: hosts, ports and (host, port) expansion."""
+
+import bisect
+import ipaddress
+import random
+import socket
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+_U32 = struct.Struct("!I")
+
+Spec = Union[str, Iterable[str], None]
+
+
+class RangeSet:
+    """Sorted, non-overlapping set of inclusive integer ranges.
+
+    Supports len(), membership, iteration and random access by index without
+    ever materializing the individual values.
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        """Initialize from (start, end) pairs; overlapping pairs are merged."""
+        merged: List[List[int]] = []
+        for start, end in sorted(ranges):
+            if start > end:
+                raise ValueError(f"Invalid range: {start}-{end}")
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.ranges = [(start, end) for start, end in merged]
+        self._offsets = []
+        total = 0
+        for start, end in self.ranges:
+            self._offsets.append(total)
+            total += end - start + 1
+        self._size = total
+
+    def subtract(self, other: "RangeSet") -> "RangeSet":
+        """Return the ranges of this set that are not in other."""
+        result = []
+        for start, end in self.ranges:
+            for ex_start, ex_end in other.ranges:
+                if ex_end < start or ex_start > end:
+                    continue
+                if ex_start > start:
+                    result.append((start, ex_start - 1))
+                start = ex_end + 1
+                if start > end:
+                    break
+            if start <= end:
+                result.append((start, end))
+        return RangeSet(result)
+
+    def __len__(self) -> int:
+        """Number of integers in the set."""
+        return self._size
+
+    def __getitem__(self, index: int) -> int:
+        """Return the index-th integer in ascending order."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RangeSet index out of range")
+        slot = bisect.bisect_right(self._offsets, index) - 1
+        return self.ranges[slot][0] + index - self._offsets[slot]
+
+    def __contains__(self, value: int) -> bool:
+        """Check whether value falls in any range."""
+        slot = bisect.bisect_right(self.ranges, (value, float("inf"))) - 1
+        return slot >= 0 and self.ranges[slot][0] <= value <= self.ranges[slot][1]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over all integers in ascending order."""
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+
+class PortSpec(RangeSet):
+    """Port specification such as ``"22,80,443,8000-8100"``.
+
+    A bare ``"-"`` selects every port (1-65535).
+    """
+
+    def __init__(self, spec: Union[str, Iterable[int]], exclude: Union[str, Iterable[int], None] = None):
+        """Parse port specification, removing any excluded ports."""
+        ports = RangeSet(self._parse(spec))
+        if exclude:
+            ports = ports.subtract(RangeSet(self._parse(exclude)))
+        super().__init__(ports.ranges)
+
+    @staticmethod
+    def _parse(spec: Union[str, Iterable[int]]) -> List[Tuple[int, int]]:
+        """Parse a port spec into (start, end) pairs."""
+        if not isinstance(spec, str):
+            return [(_check_port(port), _check_port(port)) for port in spec]
+
+        ranges = []
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if part == "-":
+                ranges.append((1, 65535))
+            elif "-" in part:
+                start, end = part.split("-", 1)
+                ranges.append((_check_port(int(start or 1)), _check_port(int(end or 65535))))
+            else:
+                port = _check_port(int(part))
+                ranges.append((port, port))
+        return ranges
+
+
+class HostSpec:
+    """Host specification: CIDR blocks, IPv4 ranges, addresses and hostnames.
+
+    Accepted tokens (comma or whitespace separated, or given as an iterable):
+    ``10.0.0.0/24``, ``10.0.0.1-10.0.0.50``, ``10.0.0.1-50``, ``192.168.1.7``
+    and ``example.com``. IPv4 targets are stored as integer ranges, so large
+    blocks cost the same memory as a single address.
+    """
+
+    def __init__(self, spec: Spec, exclude: Spec = None):
+        """Parse host specification, removing any excluded hosts."""
+        addresses, names = self._parse(spec)
+        if exclude:
+            ex_addresses, ex_names = self._parse(exclude)
+            addresses = addresses.subtract(ex_addresses)
+            excluded = set(ex_names)
+            names = [name for name in names if name not in excluded]
+        self.addresses = addresses
+        self.names = names
+
+    @staticmethod
+    def _parse(spec: Spec) -> Tuple[RangeSet, List[str]]:
+        """Parse host tokens into an address RangeSet and a hostname list."""
+        if spec is None:
+            tokens: Iterable[str] = []
+        elif isinstance(spec, str):
+            tokens = spec.replace(",", " ").split()
+        else:
+            tokens = (token.strip() for token in spec)
+
+        ranges = []
+        names = []
+        seen = set()
+        for token in tokens:
+            if not token or token.startswith("#"):
+                continue
+            parsed = _parse_ipv4_token(token)
+            if parsed is not None:
+                ranges.append(parsed)
+            elif token not in seen:
+                seen.add(token)
+                names.append(token)
+        return RangeSet(ranges), names
+
+    def __len__(self) -> int:
+        """Number of hosts."""
+        return len(self.addresses) + len(self.names)
+
+    def __getitem__(self, index: int) -> str:
+        """Return the index-th host (addresses first, then hostnames)."""
+        if index < 0:
+            index += len(self)
+        if index < len(self.addresses):
+            return socket.inet_ntoa(_U32.pack(self.addresses[index]))
+        return self.names[index - len(self.addresses)]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over hosts."""
+        for address in self.addresses:
+            yield socket.inet_ntoa(_U32.pack(address))
+        yield from self.names
+
+
+class TargetSpec:
+    """Lazily expand hosts x ports into (host, port) pairs.
+
+    Nothing proportional to the number of pairs is ever allocated. With
+    ``randomize=True`` pairs come out in a pseudo-random order produced by
+    an O(1)-memory index permutation, which spreads probes across hosts.
+    """
+
+    def __init__(
+        self,
+        hosts: Union[Spec, HostSpec],
+        ports: Union[str, Iterable[int], PortSpec],
+        exclude_hosts: Spec = None,
+        exclude_ports: Union[str, Iterable[int], None] = None,
+        randomize: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """Initialize target specification."""
+        self.hosts = hosts if isinstance(hosts, HostSpec) else HostSpec(hosts, exclude_hosts)
+        self.ports = ports if isinstance(ports, PortSpec) else PortSpec(ports, exclude_ports)
+        self.randomize = randomize
+        self.seed = seed
+
+    @property
+    def host_count(self) -> int:
+        """Number of distinct hosts."""
+        return len(self.hosts)
+
+    @property
+    def port_count(self) -> int:
+        """Number of distinct ports."""
+        return len(self.ports)
+
+    def __len__(self) -> int:
+        """Total number of (host, port) pairs."""
+        return len(self.hosts) * len(self.ports)
+
+    def __iter__(self) -> Iterator[Tuple[str, int]]:
+        """Yield (host, port) pairs."""
+        if not self.randomize:
+            for host in self.hosts:
+                for port in self.ports:
+                    yield host, port
+            return
+
+        host_count = len(self.hosts)
+        for index in Permutation(len(self), self.seed):
+            yield self.hosts[index % host_count], self.ports[index // host_count]
+
+
+class Permutation:
+    """Pseudo-random permutation of range(size) in O(1) memory.
+
+    A full-period linear congruential generator over the next power of two
+    (Hull-Dobell: odd increment, multiplier = 1 mod 4) is passed through a
+    bijective bit mixer; values outside range(size) are skipped (cycle
+    walking). Not suitable for cryptographic purposes.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        """Initialize permutation."""
+        rng = random.Random(seed)
+        self.size = size
+        self.bits = max(2, (size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.multiplier = rng.randrange(0, 1 << (self.bits - 2)) * 4 + 1
+        self.increment = rng.randrange(0, 1 << (self.bits - 1)) * 2 + 1
+        self.mixer = rng.randrange(0, 1 << (self.bits - 1)) * 2 + 1
+        self.start = rng.randrange(0, 1 << self.bits)
+
+    def __len__(self) -> int:
+        """Number of values produced."""
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield every value in range(size) exactly once."""
+        if self.size <= 0:
+            return
+        shift = self.bits // 2 + 1
+        mask = self.mask
+        value = self.start
+        for _ in range(mask + 1):
+            value = (self.multiplier * value + self.increment) & mask
+            mixed = value ^ (value >> shift)
+            mixed = (mixed * self.mixer) & mask
+            mixed ^= mixed >> shift
+            if mixed < self.size:
+                yield mixed
+
+
+def _check_port(port: int) -> int:
+    """Validate a port number."""
+    if not 0 <= port <= 65535:
+        raise ValueError(f"Invalid port: {port}")
+    return port
+
+
+def _parse_ipv4_token(token: str) -> Optional[Tuple[int, int]]:
+    """Parse an IPv4 address, CIDR block or range token into (start, end)."""
+    try:
+        if "/" in token:
+            network = ipaddress.IPv4Network(token, strict=False)
+            start, end = int(network.network_address), int(network.broadcast_address)
+            if network.prefixlen < 31:
+                start, end = start + 1, end - 1
+            return start, end
+        if "-" in token:
+            first, last = token.split("-", 1)
+            start = int(ipaddress.IPv4Address(first))
+            if "." in last:
+                end = int(ipaddress.IPv4Address(last))
+            else:
+                octet = int(last)
+                if not 0 <= octet <= 255:
+                    raise ValueError(f"Invalid address range: {token}")
+                end = (start & 0xFFFFFF00) | octet
+            if end < start:
+                raise ValueError(f"Invalid address range: {token}")
+            return start, end
+        address = int(ipaddress.IPv4Address(token))
+        return address, address
+    except ipaddress.AddressValueError:
+        return None
@@ -1,6 +1,27 @@
 # Web modules
-from .http_client import HTTPClient
-from .websocket_handler import WebSocketHandler
-from .response_parser import ResponseParser
+from ..utils.lazy_import import attach
 
-__all__ = ["HTTPClient", "WebSocketHandler", "ResponseParser"]
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".http_client": ["HTTPClient"],
+        ".websocket_handler": ["WebSocketHandler"],
+        ".websocket_frames": ["Frame", "FrameParser"],
+        ".response_parser": ["ResponseParser"],
+        ".http_parser": ["HTTPResponseParser"],
+        ".connection_pool": ["ConnectionPool"],
+        ".status_checker": ["BatchStatusChecker", "StatusResult"],
+    },
+)
+
+__all__ = [
+    "HTTPClient",
+    "WebSocketHandler",
+    "Frame",
+    "FrameParser",
+    "ResponseParser",
+    "HTTPResponseParser",
+    "ConnectionPool",
+    "BatchStatusChecker",
+    "StatusResult",
+]
@@ -0,0 +1,213 @@
+"""Thread-safe HTTP/1.1 keep-alive connection pool."""
+
+import http.client
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+from ..utils.logger import Logger
+
+PoolKey = Tuple[str, str, int]
+
+# Errors raised when a kept-alive connection was closed by the server while idle.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class PooledResponse(NamedTuple):
+    """HTTP response with its body (capped when max_body was given)."""
+
+    status: int
+    reason: str
+    headers: http.client.HTTPMessage
+    body: bytes
+    url: str
+
+
+class ConnectionPool:
+    """Per-host pool of persistent HTTP/HTTPS connections.
+
+    Connections are keyed by (scheme, host, port), reused across requests and
+    threads, capped at ``max_per_host`` (idle + in use) and closed once they
+    have been idle for longer than ``idle_timeout`` seconds.
+    """
+
+    _shared: Optional["ConnectionPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_per_host: int = 10,
+        idle_timeout: float = 60.0,
+        timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize connection pool."""
+        self.logger = logger or Logger()
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle: Dict[PoolKey, Deque[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._slots: Dict[PoolKey, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    @classmethod
+    def shared(cls) -> "ConnectionPool":
+        """Return the process-wide default pool."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_body: Optional[int] = None,
+    ) -> PooledResponse:
+        """Send a request on a pooled connection and read the response.
+
+        At most ``max_body`` bytes of the body are read when given; a
+        connection whose body was left unread is closed instead of reused.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        if not parts.hostname:
+            raise ValueError(f"No host in URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        timeout = self.timeout if timeout is None else timeout
+
+        # Queueing for a busy host is not part of the request timeout; the
+        # requests holding the slots are themselves bounded by theirs.
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                response = self._send(conn, method, target, body, headers)
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                self.logger.debug("Stale pooled connection to %s:%d, reconnecting", parts.hostname, port)
+                conn = self._connect(key, timeout)
+                try:
+                    response = self._send(conn, method, target, body, headers)
+                except Exception:
+                    conn.close()
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+            try:
+                data = response.read() if max_body is None else response.read(max_body)
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close or not response.isclosed():
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return PooledResponse(response.status, response.reason, response.headers, data, url)
+        finally:
+            slot.release()
+
+    def evict_idle(self):
+        """Close connections that have been idle longer than idle_timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            self._last_sweep = time.monotonic()
+            for idle in self._idle.values():
+                while idle and idle[0][1] < cutoff:
+                    expired.append(idle.popleft()[0])
+        for conn in expired:
+            conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def _slot(self, key: PoolKey) -> threading.BoundedSemaphore:
+        """Return the per-host connection limiter."""
+        slot = self._slots.get(key)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.setdefault(key, threading.BoundedSemaphore(self.max_per_host))
+        return slot
+
+    def _checkout(self, key: PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take the most recently used live connection, or open a new one."""
+        cutoff = time.monotonic() - self.idle_timeout
+        conn = None
+        expired = []
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, last_used = idle.pop()
+                if last_used >= cutoff:
+                    conn = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            stale.close()
+
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        return self._connect(key, timeout), False
+
+    def _checkin(self, key: PoolKey, conn: http.client.HTTPConnection):
+        """Return a connection to the idle list."""
+        now = time.monotonic()
+        with self._lock:
+            self._idle.setdefault(key, deque()).append((conn, now))
+            sweep = now - self._last_sweep > self.idle_timeout
+        if sweep:
+            self.evict_idle()
+
+    def _connect(self, key: PoolKey, timeout: float) -> http.client.HTTPConnection:
+        """Open a new connection for key."""
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    @staticmethod
+    def _send(
+        conn: http.client.HTTPConnection,
+        method: str,
+        target: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+    ) -> http.client.HTTPResponse:
+        """Send one request and return the (unread) response."""
+        conn.request(method, target, body=body, headers=headers or {})
+        return conn.getresponse()
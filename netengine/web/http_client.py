@@ -1,31 +1,40 @@
 """HTTP client for web requests."""
 
+import io
 import urllib.request
 import urllib.error
 from typing import Dict, Optional
+from urllib.parse import urljoin, urlsplit
 from ..utils.logger import Logger
+from .connection_pool import ConnectionPool, PooledResponse
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
 
 
 class HTTPClient:
-    """HTTP request client."""
+    """HTTP request client.
+
+    Requests go through a keep-alive ConnectionPool (the process-wide shared
+    pool unless one is passed in), so repeated requests to the same host reuse
+    TCP/TLS connections across calls, client instances and threads.
+    """
 
-    def __init__(self, logger: Optional[Logger] = None):
+    def __init__(self, logger: Optional[Logger] = None, pool: Optional[ConnectionPool] = None):
         """Initialize HTTP client."""
         self.logger = logger or Logger()
         self.timeout = 10.0
+        self.pool = pool or ConnectionPool.shared()
+        self.max_redirects = 10
+        self.user_agent = "NetEngine/1.0"
+        self.proxies = urllib.request.getproxies()
 
     def get(self, url: str, headers: Optional[Dict] = None) -> str:
         """Perform GET request."""
         try:
-            req = urllib.request.Request(url)
-            if headers:
-                for key, value in headers.items():
-                    req.add_header(key, value)
-
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                data = response.read().decode()  #wmiKeN
-                self.logger.success(f"GET {url}")
-                return data
+            response = self.request("GET", url, headers=headers)
+            data = response.body.decode()  #wmiKeN
+            self.logger.success(f"GET {url}")
+            return data
         except Exception as e:
             self.logger.error(f"GET request failed: {e}")
             raise
@@ -33,15 +42,10 @@ class HTTPClient:
     def post(self, url: str, data: bytes, headers: Optional[Dict] = None) -> str:
         """Perform POST request."""
         try:
-            req = urllib.request.Request(url, data=data, method="POST")
-            if headers:
-                for key, value in headers.items():
-                    req.add_header(key, value)
-
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                response_data = response.read().decode()
-                self.logger.success(f"POST {url}")
-                return response_data  #r8YWpQ
+            response = self.request("POST", url, body=data, headers=headers)
+            response_data = response.body.decode()
+            self.logger.success(f"POST {url}")
+            return response_data  #r8YWpQ
         except Exception as e:
             self.logger.error(f"POST request failed: {e}")  #IMQDSo
             raise
@@ -49,17 +53,94 @@ class HTTPClient:
     def head(self, url: str, headers: Optional[Dict] = None) -> Dict:
         """Perform HEAD request."""
         try:
-            req = urllib.request.Request(url, method="HEAD")
-            if headers:
-                for key, value in headers.items():
-                    req.add_header(key, value)
-
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                self.logger.success(f"HEAD {url}")
-                return dict(response.headers)
+            response = self.request("HEAD", url, headers=headers)
+            self.logger.success(f"HEAD {url}")
+            return dict(response.headers)
         except Exception as e:
             self.logger.error(f"HEAD request failed: {e}")
             raise
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict] = None,
+        raise_for_status: bool = True,
+        max_body: Optional[int] = None,
+    ) -> PooledResponse:
+        """Perform a request, following redirects like urllib does.
+
+        Raises urllib.error.HTTPError for 4xx/5xx responses unless
+        ``raise_for_status`` is False, and when more than ``max_redirects``
+        redirects are followed. ``max_body`` caps the body bytes read.
+        """
+        request_headers = {"User-Agent": self.user_agent}
+        if headers:
+            request_headers.update(headers)
+
+        if self._use_proxy(url):
+            response = self._request_via_urllib(method, url, body, request_headers, max_body)
+        else:
+            response = self.pool.request(
+                method, url, body, request_headers, timeout=self.timeout, max_body=max_body
+            )
+            redirects = 0
+            while True:
+                location = response.headers.get("Location")
+                if response.status not in REDIRECT_CODES or not location:
+                    break
+                if response.status in (307, 308) and method not in ("GET", "HEAD"):
+                    break
+                if redirects == self.max_redirects:
+                    raise urllib.error.HTTPError(
+                        response.url,
+                        response.status,
+                        f"Too many redirects (more than {self.max_redirects})",
+                        response.headers,
+                        io.BytesIO(response.body),
+                    )
+                redirects += 1
+                if response.status in (301, 302, 303) and method not in ("GET", "HEAD"):
+                    method, body = "GET", None
+                    request_headers.pop("Content-Type", None)
+                    request_headers.pop("Content-Length", None)
+                url = urljoin(url, location)
+                response = self.pool.request(
+                    method, url, body, request_headers, timeout=self.timeout, max_body=max_body
+                )
+
+        if raise_for_status and response.status >= 400:
+            raise urllib.error.HTTPError(
+                response.url, response.status, response.reason, response.headers, io.BytesIO(response.body)
+            )
+        return response
+
+    def _use_proxy(self, url: str) -> bool:
+        """Check whether a configured proxy applies to url."""
+        if not self.proxies:
+            return False
+        parts = urlsplit(url)
+        return parts.scheme in self.proxies and not urllib.request.proxy_bypass(parts.hostname or "")
+
+    def _request_via_urllib(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Dict,
+        max_body: Optional[int] = None,
+    ) -> PooledResponse:
+        """Perform a request through urllib so environment proxies are honored."""
+        req = urllib.request.Request(url, data=body, headers=headers, method=method)
+        amount = -1 if max_body is None else max_body
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return PooledResponse(
+                    response.status, response.reason, response.headers, response.read(amount), response.url
+                )
+        except urllib.error.HTTPError as e:
+            return PooledResponse(e.code, e.reason, e.headers, e.read(amount), url)
 OJtce5OaCedHUUgdSDc0NL6
 RTIzCqCLszhrsOcIYeADtAbTmbzl7B1ysh5wQ5j
 a81n1qgJIwCtuvgESxAne5dB1z9FIlHcQBcl0T6cFFTN
@@ -0,0 +1,234 @@
+"""Incremental HTTP/1.1 response parser."""
+
+import socket
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Parser states.
+STATUS = "status"
+HEADERS = "headers"
+BODY = "body"
+BODY_UNTIL_CLOSE = "body-until-close"
+CHUNK_SIZE = "chunk-size"
+CHUNK_DATA = "chunk-data"
+CHUNK_END = "chunk-end"
+TRAILERS = "trailers"
+DONE = "done"
+
+_LINE_STATES = (STATUS, HEADERS, CHUNK_SIZE, CHUNK_END, TRAILERS)
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
+
+
+class HTTPResponseParser:
+    """State machine over the status line, headers and body of a response.
+
+    feed() takes bytes as they arrive from the socket and returns the body
+    chunks they complete; body bytes are passed through without being
+    buffered, so only a partial header or chunk-size line is ever held and
+    responses of any size are parsed in constant memory. The body may be
+    framed by Content-Length, chunked transfer encoding or the connection
+    closing (call feed_eof() then). Malformed input raises ValueError.
+    """
+
+    def __init__(self, method: str = "GET", max_line: int = 65536, max_headers: int = 100):
+        """Initialize parser for the response to a method request."""
+        self.method = method.upper()
+        self.max_line = max_line
+        self.max_headers = max_headers
+        self.state = STATUS
+        self._buffer = bytearray()
+        self.reset()
+
+    def reset(self):
+        """Prepare to parse the next response on the same connection.
+
+        Bytes already fed past the end of the previous response are kept;
+        feed(b"") parses them.
+        """
+        leftover = self.unconsumed
+        self.state = STATUS
+        self.version = ""
+        self.status = 0
+        self.reason = ""
+        self.headers: Dict[str, str] = {}
+        self.raw_headers: List[Tuple[str, str]] = []
+        self.trailers: Dict[str, str] = {}
+        self.raw_trailers: List[Tuple[str, str]] = []
+        self.content_length: Optional[int] = None
+        self.chunked = False
+        self.until_close = False
+        self.body_size = 0
+        self._remaining = 0
+        self._buffer = bytearray(leftover)
+
+    @property
+    def headers_complete(self) -> bool:
+        """True once the status line and headers have been parsed."""
+        return self.state not in (STATUS, HEADERS)
+
+    @property
+    def complete(self) -> bool:
+        """True once the whole response has been parsed."""
+        return self.state == DONE
+
+    @property
+    def keep_alive(self) -> bool:
+        """True if the connection can carry another request after this response."""
+        if self.until_close:
+            return False
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+    @property
+    def unconsumed(self) -> bytes:
+        """Bytes fed after the end of the response (the next response's start)."""
+        return bytes(self._buffer) if self.state == DONE else b""
+
+    def feed(self, data: Buffer) -> List[bytes]:
+        """Parse received bytes; return the body chunks they contain."""
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if self._buffer:
+            if self.state == DONE:
+                self._buffer += data
+                return []
+            data = bytes(self._buffer) + data
+            self._buffer.clear()
+        chunks: List[bytes] = []
+        pos = 0
+        end = len(data)
+        while pos < end:
+            state = self.state
+            if state in _LINE_STATES:
+                newline = data.find(b"\n", pos)
+                if newline < 0:
+                    if end - pos > self.max_line:
+                        raise ValueError(f"HTTP {state} line longer than {self.max_line} bytes")
+                    self._buffer += data[pos:]
+                    break
+                if newline - pos > self.max_line:
+                    raise ValueError(f"HTTP {state} line longer than {self.max_line} bytes")
+                line = data[pos:newline]
+                pos = newline + 1
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                self._line(line)
+            elif state == BODY or state == CHUNK_DATA:
+                size = min(self._remaining, end - pos)
+                chunks.append(data if size == end else data[pos : pos + size])
+                pos += size
+                self._remaining -= size
+                self.body_size += size
+                if not self._remaining:
+                    self.state = DONE if state == BODY else CHUNK_END
+            elif state == BODY_UNTIL_CLOSE:
+                chunks.append(data if pos == 0 else data[pos:])
+                self.body_size += end - pos
+                pos = end
+            else:
+                self._buffer += data[pos:]
+                break
+        return chunks
+
+    def feed_eof(self):
+        """The connection closed: end a close-delimited body.
+
+        Raises ValueError if the response was cut short.
+        """
+        if self.state == BODY_UNTIL_CLOSE:
+            self.state = DONE
+        elif self.state != DONE:
+            raise ValueError(f"Connection closed in HTTP {self.state} (after {self.body_size} body bytes)")
+
+    def _line(self, line: bytes):
+        """Consume one line of the status/header/chunk framing."""
+        state = self.state
+        if state == HEADERS or state == TRAILERS:
+            if not line:
+                if state == HEADERS:
+                    self._headers_done()
+                else:
+                    self.state = DONE
+                return
+            fields, raw = (self.headers, self.raw_headers) if state == HEADERS else (self.trailers, self.raw_trailers)
+            if line[:1] in (b" ", b"\t"):
+                # Obsolete line folding continues the previous field.
+                if not raw:
+                    raise ValueError("HTTP header continuation without a header")
+                name, value = raw[-1]
+                value = f"{value} {line.strip().decode('latin-1')}"
+                raw[-1] = (name, value)
+                fields[name.lower()] = value
+                return
+            name, sep, value = line.partition(b":")
+            name = name.decode("latin-1")
+            if not sep or not name or name != name.strip():
+                raise ValueError(f"Invalid HTTP header line: {line[:80]!r}")
+            value = value.strip().decode("latin-1")
+            if len(raw) >= self.max_headers:
+                raise ValueError(f"More than {self.max_headers} HTTP headers")
+            raw.append((name, value))
+            key = name.lower()
+            fields[key] = f"{fields[key]}, {value}" if key in fields else value
+        elif state == CHUNK_SIZE:
+            size = line.split(b";", 1)[0].strip()
+            if not size or size.strip(_HEX_DIGITS):
+                raise ValueError(f"Invalid HTTP chunk size: {size[:20]!r}")
+            self._remaining = int(size, 16)
+            self.state = CHUNK_DATA if self._remaining else TRAILERS
+        elif state == CHUNK_END:
+            if line:
+                raise ValueError("HTTP chunk data longer than its size")
+            self.state = CHUNK_SIZE
+        elif line:
+            parts = line.decode("latin-1").split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/") or len(parts[1]) != 3 or not parts[1].isdigit():
+                raise ValueError(f"Invalid HTTP status line: {line[:80]!r}")
+            self.version = parts[0]
+            self.status = int(parts[1])
+            self.reason = parts[2] if len(parts) > 2 else ""
+            self.state = HEADERS
+
+    def _headers_done(self):
+        """Pick the body framing (RFC 7230 section 3.3.3)."""
+        status = self.status
+        if 100 <= status < 200 and status != 101:
+            # Interim response (100 Continue, 103 Early Hints): the real
+            # one follows.
+            self.state = STATUS
+            self.headers = {}
+            self.raw_headers = []
+            return
+        if self.method == "HEAD" or status in (101, 204, 304):
+            self.state = DONE
+            return
+        encodings = [token.strip().lower() for token in self.headers.get("transfer-encoding", "").split(",")]
+        if encodings[-1] == "chunked":
+            self.chunked = True
+            self.state = CHUNK_SIZE
+            return
+        if "content-length" in self.headers and encodings == [""]:
+            values = {value.strip() for value in self.headers["content-length"].split(",")}
+            if len(values) != 1 or not next(iter(values)).isdigit():
+                raise ValueError(f"Invalid Content-Length: {self.headers['content-length']}")
+            self.content_length = self._remaining = int(values.pop())
+            self.state = BODY if self._remaining else DONE
+            return
+        self.until_close = True
+        self.state = BODY_UNTIL_CLOSE
+
+    def stream(self, sock: socket.socket, buffer_size: int = 65536) -> Iterator[bytes]:
+        """Read one response from sock, yielding body chunks as they arrive.
+
+        The status and headers are on the parser by the first chunk (or
+        when the generator finishes, for bodiless responses).
+        """
+        while not self.complete:
+            data = sock.recv(buffer_size)
+            if not data:
+                self.feed_eof()
+                break
+            yield from self.feed(data)
@@ -2,8 +2,9 @@
 
 import json
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from ..utils.logger import Logger
+from .http_parser import HTTPResponseParser
 
 
 class ResponseParser:
@@ -13,28 +14,37 @@ class ResponseParser:
         """Initialize response parser."""
         self.logger = logger or Logger()
 
-    def parse_http(self, response: str) -> Dict[str, Any]:
-        """Parse HTTP response."""
-        try:
-            lines = response.split("\r\n")
-            status_line = lines[0]
-            headers = {}
-            body_start = 0
-
-            for i, line in enumerate(lines[1:], 1):
-                if line == "":
-                    body_start = i + 1
-                    break
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    headers[key.strip()] = value.strip()
+    def parse_http(self, response: Union[str, bytes], method: str = "GET") -> Dict[str, Any]:
+        """Parse a complete HTTP response.
 
-            body = "\r\n".join(lines[body_start:])
+        bytes input gives a bytes body. str input gives a str body; it is
+        read as the response decoded as latin-1, which maps every byte to
+        one character and back, unless it holds characters beyond latin-1,
+        in which case it is taken to be UTF-8. Chunked bodies are decoded,
+        and a body cut short of its Content-Length is returned as far as it
+        got. For responses arriving in pieces, use HTTPResponseParser
+        directly.
+        """
+        try:
+            encoding = None
+            if isinstance(response, str):
+                try:
+                    response, encoding = response.encode("latin-1"), "latin-1"
+                except UnicodeEncodeError:
+                    response, encoding = response.encode("utf-8", "surrogateescape"), "utf-8"
+            parser = HTTPResponseParser(method)
+            body = b"".join(parser.feed(response))
+            try:
+                parser.feed_eof()
+            except ValueError:
+                if not parser.headers_complete:
+                    raise
+                self.logger.warning("HTTP response truncated after %d body bytes", parser.body_size)
             self.logger.success("HTTP response parsed")
             return {
-                "status": status_line,
-                "headers": headers,
-                "body": body,
+                "status": f"{parser.version} {parser.status} {parser.reason}".rstrip(),
+                "headers": dict(parser.raw_headers),
+                "body": body.decode(encoding, "surrogateescape") if encoding else body,
             }
         except Exception as e:
             self.logger.error(f"HTTP parse failed: {e}")
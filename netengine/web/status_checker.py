@@ -0,0 +1,162 @@
+"""Concurrent batch HTTP status checking."""
+
+import http.client
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from ..core.thread_manager import ThreadManager
+from ..utils.logger import Logger
+from .connection_pool import ConnectionPool, PoolKey
+from .http_client import HTTPClient
+
+# HEAD responses that mean "method not supported here", so retry with GET.
+_HEAD_UNSUPPORTED = (405, 501)
+
+
+@dataclass
+class StatusResult:
+    """Status check outcome for one URL."""
+
+    url: str
+    status: Optional[int] = None
+    reason: str = ""
+    method: str = "HEAD"
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether a status code was obtained."""
+        return self.error is None
+
+    @property
+    def status_line(self) -> str:
+        """Human-readable status, e.g. "200 OK" or "Error: ..."."""
+        if self.error is not None:
+            return f"Error: {self.error}"
+        return f"{self.status} {self.reason}"
+
+
+class BatchStatusChecker:
+    """Check HTTP status codes for many URLs concurrently.
+
+    Each URL is probed with HEAD, falling back to a GET that reads at most
+    ``max_body`` bytes when HEAD is rejected. At most ``workers`` checks run
+    at once and at most ``per_host`` connections are opened to any one host.
+    Results are yielded as they complete, and URLs are pulled from the input
+    iterable lazily so arbitrarily long lists run in constant memory.
+
+    URLs for a host that already has ``per_host`` checks running wait here
+    rather than in a worker, so one slow host never ties up the pool while
+    other hosts have work; up to ``workers * 4`` URLs are held back this way
+    before reading further input waits for a result.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        workers: int = 50,
+        per_host: int = 6,
+        max_body: int = 1024,
+        timeout: float = 10.0,
+    ):
+        """Initialize status checker."""
+        self.logger = logger or Logger()
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.max_body = max_body
+        self.pool = ConnectionPool(max_per_host=self.per_host, timeout=timeout, logger=self.logger)
+        self.client = HTTPClient(self.logger, pool=self.pool)
+        self.client.timeout = timeout
+
+    def check(self, urls: Iterable[str]) -> Iterator[StatusResult]:
+        """Check URLs, yielding results in completion order."""
+        manager = ThreadManager(max_workers=self.workers)
+        urls = (url.strip() for url in urls)
+        urls = (url for url in urls if url)
+        finished: "queue.Queue[Tuple[Optional[PoolKey], Future]]" = queue.Queue()
+        pending: Set[Future] = set()
+        active: Dict[Optional[PoolKey], int] = {}
+        waiting: Dict[Optional[PoolKey], Deque[str]] = {}
+        held = 0
+        exhausted = False
+
+        def launch(key: Optional[PoolKey], url: str):
+            active[key] = active.get(key, 0) + 1
+            future = manager.submit_task(self.check_one, url)
+            pending.add(future)
+            future.add_done_callback(lambda done: finished.put((key, done)))
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.workers and held < self.workers * 4:
+                    url = next(urls, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                    key = self._host_key(url)
+                    if active.get(key, 0) < self.per_host:
+                        launch(key, url)
+                    else:
+                        waiting.setdefault(key, deque()).append(url)
+                        held += 1
+                if not pending:
+                    break
+
+                key, future = finished.get()
+                pending.discard(future)
+                active[key] -= 1
+                queued = waiting.get(key)
+                if queued:
+                    launch(key, queued.popleft())
+                    held -= 1
+                    if not queued:
+                        del waiting[key]
+                elif not active[key]:
+                    del active[key]
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            manager.shutdown()
+            self.pool.close()
+
+    @staticmethod
+    def _host_key(url: str) -> Optional[PoolKey]:
+        """Pool key of the host url is checked on (None if it can't be parsed)."""
+        if not url.startswith(("http://", "https://")):
+            url = f"http://{url}"
+        try:
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            return scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80)
+        except ValueError:
+            return None
+
+    def check_one(self, url: str) -> StatusResult:
+        """Check a single URL."""
+        if not url.startswith(("http://", "https://")):
+            url = f"http://{url}"
+
+        start = time.monotonic()
+        method = "HEAD"
+        try:
+            try:
+                response = self.client.request("HEAD", url, raise_for_status=False)
+                if response.status in _HEAD_UNSUPPORTED:
+                    method = "GET"
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine):
+                method = "GET"
+            if method == "GET":
+                response = self.client.request(
+                    "GET", url, raise_for_status=False, max_body=self.max_body
+                )
+            return StatusResult(
+                url, response.status, response.reason, method, time.monotonic() - start
+            )
+        except Exception as e:
+            return StatusResult(url, method=method, elapsed=time.monotonic() - start, error=str(e))
@@ -0,0 +1,171 @@
+"""RFC 6455 frame encoding, masking and incremental parsing."""
+
+import os
+import struct
+from typing import List, NamedTuple, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+DATA_OPCODES = (OP_CONTINUATION, OP_TEXT, OP_BINARY)
+CONTROL_OPCODES = (OP_CLOSE, OP_PING, OP_PONG)
+
+# Payloads at least this large are masked with NumPy when it is installed;
+# below it the array setup costs more than it saves.
+NUMPY_THRESHOLD = 2048
+
+# Control frames carry at most 125 bytes (RFC 6455 section 5.5).
+MAX_CONTROL_PAYLOAD = 125
+
+_U16 = struct.Struct("!H")
+_U64 = struct.Struct("!Q")
+_HEADER_SHORT = struct.Struct("!BB")
+_HEADER_16 = struct.Struct("!BBH")
+_HEADER_64 = struct.Struct("!BBQ")
+
+
+class Frame(NamedTuple):
+    """One decoded frame (payload already unmasked)."""
+
+    fin: bool
+    opcode: int
+    payload: bytes
+
+
+def mask(payload: Buffer, key: bytes) -> bytes:
+    """XOR payload with the 4-byte masking key (masking and unmasking are the same).
+
+    The whole payload is XORed at once, as one little-endian integer against
+    the key repeated to the same length, or as uint32 words with NumPy, so
+    there is no Python loop over bytes.
+    """
+    length = len(payload)
+    if not length:
+        return b""
+    if numpy is not None and length >= NUMPY_THRESHOLD:
+        words = length // 4
+        head = numpy.frombuffer(payload, dtype="<u4", count=words) ^ numpy.frombuffer(key, dtype="<u4")[0]
+        tail = length - words * 4
+        if not tail:
+            return head.tobytes()
+        rest = int.from_bytes(bytes(payload[words * 4 :]), "little") ^ int.from_bytes(key[:tail], "little")
+        return head.tobytes() + rest.to_bytes(tail, "little")
+    keystream = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "little") ^ int.from_bytes(keystream, "little")).to_bytes(length, "little")
+
+
+def encode_frame(opcode: int, payload: Buffer = b"", fin: bool = True, masked: bool = True) -> bytes:
+    """Encode one frame; clients must send masked frames, servers unmasked."""
+    length = len(payload)
+    first = (0x80 if fin else 0) | opcode
+    mask_bit = 0x80 if masked else 0
+    if length < 126:
+        header = _HEADER_SHORT.pack(first, mask_bit | length)
+    elif length < 0x10000:
+        header = _HEADER_16.pack(first, mask_bit | 126, length)
+    else:
+        header = _HEADER_64.pack(first, mask_bit | 127, length)
+    if not masked:
+        return header + bytes(payload)
+    key = os.urandom(4)
+    return header + key + mask(payload, key)
+
+
+class FrameParser:
+    """Incremental frame decoder over a receive buffer.
+
+    feed() takes whatever the socket returned and gives back the frames it
+    completed; partial frames stay buffered until the rest arrives. Consumed
+    bytes are dropped lazily so a burst of small frames costs no per-frame
+    buffer shifting. Protocol violations raise ValueError.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024, expect_masked: bool = False):
+        """Initialize parser; frames over max_size bytes are rejected.
+
+        A client parses server frames, which must not be masked; pass
+        expect_masked=True on the server side.
+        """
+        self.max_size = max_size
+        self.expect_masked = expect_masked
+        self._buffer = bytearray()
+        self._pos = 0
+
+    @property
+    def buffered(self) -> int:
+        """Bytes received but not yet part of a complete frame."""
+        return len(self._buffer) - self._pos
+
+    def feed(self, data: Buffer) -> List[Frame]:
+        """Append received bytes and return the frames completed by them."""
+        buffer = self._buffer
+        buffer += data
+        frames: List[Frame] = []
+        pos = self._pos
+        end = len(buffer)
+        with memoryview(buffer) as view:
+            while end - pos >= 2:
+                first = buffer[pos]
+                second = buffer[pos + 1]
+                length = second & 0x7F
+                header = 2
+                if length == 126:
+                    if end - pos < 4:
+                        break
+                    length = _U16.unpack_from(buffer, pos + 2)[0]
+                    header = 4
+                elif length == 127:
+                    if end - pos < 10:
+                        break
+                    length = _U64.unpack_from(buffer, pos + 2)[0]
+                    header = 10
+                masked = second & 0x80
+                if masked:
+                    header += 4
+                if end - pos < header:
+                    break
+                self._check(first, masked, length)
+                start = pos + header
+                if end - start < length:
+                    break
+                payload = view[start : start + length].tobytes()
+                if masked:
+                    payload = mask(payload, view[start - 4 : start].tobytes())
+                frames.append(Frame(bool(first & 0x80), first & 0x0F, payload))
+                pos = start + length
+        if pos == end:
+            buffer.clear()
+            pos = 0
+        elif pos > 65536 and pos > end // 2:
+            del buffer[:pos]
+            pos = 0
+        self._pos = pos
+        return frames
+
+    def _check(self, first: int, masked: int, length: int):
+        """Validate a frame header before its payload is read."""
+        opcode = first & 0x0F
+        if first & 0x70:
+            raise ValueError("WebSocket frame has reserved bits set")
+        if opcode in CONTROL_OPCODES:
+            if not first & 0x80:
+                raise ValueError("Fragmented WebSocket control frame")
+            if length > MAX_CONTROL_PAYLOAD:
+                raise ValueError("WebSocket control frame too long")
+        elif opcode not in DATA_OPCODES:
+            raise ValueError(f"Unknown WebSocket opcode {opcode:#x}")
+        if bool(masked) != self.expect_masked:
+            raise ValueError("Unexpected WebSocket frame masking")
+        if length > self.max_size:
+            raise ValueError(f"WebSocket frame of {length} bytes exceeds {self.max_size}")
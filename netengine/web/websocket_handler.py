@@ -1,68 +1,397 @@
 """WebSocket handler for WebSocket connections."""
 
 import socket
+import ssl
 import hashlib
 import base64
-from typing import Optional
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
 from ..utils.logger import Logger  #q8dk2o
+from ..utils.buffer_pool import BufferPool
+from .websocket_frames import (
+    OP_BINARY,
+    OP_CLOSE,
+    OP_CONTINUATION,
+    OP_PING,
+    OP_PONG,
+    OP_TEXT,
+    Frame,
+    FrameParser,
+    encode_frame,
+)
+
+Message = Union[str, bytes]
+
+# Appended to the client key to form Sec-WebSocket-Accept (RFC 6455 section 1.3).
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_MAX_HANDSHAKE = 65536
+
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_INVALID_DATA = 1007
+CLOSE_TOO_BIG = 1009
+CLOSE_ABNORMAL = 1006
+
+
+def _valid_close_code(code: int) -> bool:
+    """Whether code may be sent in a close frame (RFC 6455 section 7.4)."""
+    return 1000 <= code <= 1014 and code not in (1004, 1005, 1006) or 3000 <= code <= 4999
+
+
+def accept_key(key: str) -> str:
+    """Sec-WebSocket-Accept value a server must answer key with."""
+    return base64.b64encode(hashlib.sha1(key.encode() + _GUID).digest()).decode()
 
 
 class WebSocketHandler:
-    """WebSocket connection handler."""
+    """WebSocket (RFC 6455) client connection.
 
-    def __init__(self, logger: Optional[Logger] = None):
+    send() masks and, if asked, fragments messages; receive() returns whole
+    messages (str for text, bytes for binary), reassembling fragments and
+    answering pings and the closing handshake along the way. Sending from
+    one thread while another receives is safe.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        max_message_size: int = 64 * 1024 * 1024,
+        pool: Optional[BufferPool] = None,
+    ):
         """Initialize WebSocket handler."""
         self.logger = logger or Logger()
         self.socket: Optional[socket.socket] = None
+        self.max_message_size = max_message_size
+        self.pool = pool or BufferPool.shared()
+        self.close_code: Optional[int] = None
+        self.close_reason = ""
+        self.last_pong: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self._parser = FrameParser(self.max_message_size)
+        self._messages: Deque[Message] = deque()
+        self._fragments: List[bytes] = []
+        self._fragment_opcode = 0
+        self._fragment_size = 0
+        self._send_lock = threading.Lock()
+        self._close_sent = False
+        self._close_received = False
+        self._closed = False
+        self._timeout: Optional[float] = None
 
-    def connect(self, url: str, port: int = 80):
-        """Connect to WebSocket server."""
+    @property
+    def connected(self) -> bool:
+        """True until the connection is closed by either side."""
+        return self.socket is not None and not self._closed
+
+    def connect(
+        self,
+        url: str,
+        port: int = 80,
+        path: str = "/",
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        """Connect to WebSocket server.
+
+        url is a host name (with port and path given separately) or a
+        ws:// or wss:// URL. The server's handshake response is validated,
+        including Sec-WebSocket-Accept.
+        """
+        host = url
+        secure = False
+        if "://" in url:
+            parts = urlsplit(url)
+            if parts.scheme not in ("ws", "wss"):
+                raise ValueError(f"Unsupported WebSocket URL scheme: {parts.scheme}")
+            if not parts.hostname:
+                raise ValueError(f"No host in URL: {url}")
+            secure = parts.scheme == "wss"
+            host = parts.hostname
+            port = parts.port or (443 if secure else 80)
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((url, port))
+            self._reset()
+            self.close_code = None
+            self.close_reason = ""
+            sock = socket.create_connection((host, port), timeout=timeout)
+            if secure:
+                sock = (ssl_context or ssl.create_default_context()).wrap_socket(sock, server_hostname=host)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket = sock
+            self._timeout = timeout
 
-            key = base64.b64encode(b"netengine" * 4)[:16].decode()
+            key = base64.b64encode(os.urandom(16)).decode()
+            default_port = 443 if secure else 80
+            host_header = host if port == default_port else f"{host}:{port}"
+            extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
             handshake = (
-                f"GET / HTTP/1.1\r\n"
-                f"Host: {url}\r\n"
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {host_header}\r\n"
                 f"Upgrade: websocket\r\n"
                 f"Connection: Upgrade\r\n"
                 f"Sec-WebSocket-Key: {key}\r\n"
-                f"Sec-WebSocket-Version: 13\r\n\r\n"
+                f"Sec-WebSocket-Version: 13\r\n{extra}\r\n"
             )  #hnhekA
-            self.socket.send(handshake.encode())
-            response = self.socket.recv(1024)
-            self.logger.success(f"WebSocket connected to {url}:{port}")
+            self.socket.sendall(handshake.encode())
+            self._check_handshake(self._read_handshake(), key)
+            self.logger.success("WebSocket connected to %s:%d", host, port)
         except Exception as e:
             self.logger.error(f"WebSocket connect failed: {e}")
+            if self.socket is not None:
+                self.socket.close()
+                self.socket = None
             raise
 
-    def send(self, data: str):  #3AWJmF
-        """Send data over WebSocket."""
+    def _read_handshake(self) -> bytes:
+        """Read the handshake response; bytes after it go to the frame parser."""
+        data = b""
+        while True:
+            end = data.find(b"\r\n\r\n")
+            if end >= 0:
+                break
+            if len(data) > _MAX_HANDSHAKE:
+                raise ConnectionError("WebSocket handshake response too long")
+            chunk = self.socket.recv(4096)
+            if not chunk:
+                raise ConnectionError("Connection closed during WebSocket handshake")
+            data += chunk
+        leftover = data[end + 4 :]
+        if leftover:
+            self._feed(leftover)
+        return data[:end]
+
+    @staticmethod
+    def _check_handshake(response: bytes, key: str):
+        """Raise ConnectionError unless response accepts the upgrade for key."""
+        lines = response.decode("latin-1").split("\r\n")
+        status = lines[0].split(None, 2)
+        if len(status) < 2 or status[1] != "101":
+            raise ConnectionError(f"WebSocket handshake rejected: {lines[0]}")
+        fields: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            fields[name.strip().lower()] = value.strip()
+        if fields.get("upgrade", "").lower() != "websocket":
+            raise ConnectionError("WebSocket handshake missing Upgrade: websocket")
+        if "upgrade" not in [token.strip().lower() for token in fields.get("connection", "").split(",")]:
+            raise ConnectionError("WebSocket handshake missing Connection: Upgrade")
+        if fields.get("sec-websocket-accept") != accept_key(key):
+            raise ConnectionError("WebSocket handshake has a wrong Sec-WebSocket-Accept")
+
+    def send(self, data: Message, fragment_size: Optional[int] = None):  #3AWJmF
+        """Send data over WebSocket.
+
+        str is sent as a text message, bytes-like data as binary. With
+        fragment_size the message is split into frames of at most that many
+        payload bytes.
+        """
         try:
-            payload = data.encode()
-            frame = b"\x81" + bytes([len(payload)]) + payload
-            self.socket.send(frame)
-            self.logger.info(f"WebSocket sent: {len(payload)} bytes")
+            if isinstance(data, str):
+                opcode, payload = OP_TEXT, data.encode()
+            else:
+                opcode, payload = OP_BINARY, data
+            if not fragment_size or len(payload) <= fragment_size:
+                frames = [encode_frame(opcode, payload)]
+            else:
+                view = memoryview(payload)
+                last = len(payload) - fragment_size
+                frames = [
+                    encode_frame(opcode if offset == 0 else OP_CONTINUATION, view[offset : offset + fragment_size], fin=offset >= last)
+                    for offset in range(0, len(payload), fragment_size)
+                ]
+            self._send_frames(frames)
+            self.logger.debug("WebSocket sent: %d bytes", len(payload))
         except Exception as e:
             self.logger.error(f"WebSocket send failed: {e}")
             raise  #lJV8iw
 
-    def receive(self) -> str:
-        """Receive data from WebSocket."""
+    def _send_frames(self, frames: List[bytes]):
+        if self.socket is None or self._close_sent or self._closed:
+            raise ConnectionError("WebSocket is not connected")
+        with self._send_lock:
+            if len(frames) == 1:
+                self.socket.sendall(frames[0])
+            else:
+                self.socket.sendall(b"".join(frames))
+
+    def ping(self, payload: bytes = b""):
+        """Send a ping; the matching pong's arrival time lands in last_pong."""
+        self._send_frames([encode_frame(OP_PING, payload)])
+
+    def receive(self, timeout: Optional[float] = None) -> Message:
+        """Receive the next message (str for text, bytes for binary).
+
+        Raises socket.timeout if no message completes within timeout seconds
+        (None waits forever) and ConnectionError once the connection is
+        closed; close_code and close_reason then say why.
+        """
         try:
-            data = self.socket.recv(4096)
-            self.logger.info(f"WebSocket received: {len(data)} bytes")
-            return data.decode()
+            while not self._messages:
+                self._read(timeout)
+            message = self._messages.popleft()
+            self.logger.debug("WebSocket received: %d bytes", len(message))
+            return message
+        except ConnectionError:
+            raise
         except Exception as e:
             self.logger.error(f"WebSocket receive failed: {e}")
             raise
 
-    def close(self):
-        """Close WebSocket connection."""
-        if self.socket:
+    def messages(self, timeout: Optional[float] = None) -> Iterator[Message]:
+        """Yield messages until the server closes the connection."""
+        while True:
+            try:
+                yield self.receive(timeout)
+            except ConnectionError:
+                if self._close_received:
+                    return
+                raise
+
+    def _read(self, timeout: Optional[float]):
+        """Read once from the socket and process the frames it completes."""
+        if self._closed or self.socket is None:
+            raise ConnectionError(f"WebSocket closed ({self.close_code}) {self.close_reason}".rstrip())
+        if timeout != self._timeout:
+            self.socket.settimeout(timeout)
+            self._timeout = timeout
+        try:
+            buffer = self.pool.recv_into(self.socket)
+        except socket.timeout:
+            raise
+        except OSError as e:
+            self._abort(CLOSE_ABNORMAL, str(e))
+            raise
+        with buffer:
+            if not buffer.length:
+                self._abort(CLOSE_ABNORMAL, "connection lost")
+                raise ConnectionError("WebSocket connection closed without a close frame")
+            self._feed(buffer.data)
+
+    def _feed(self, data):
+        """Parse received bytes and process the frames they complete."""
+        try:
+            frames = self._parser.feed(data)
+        except ValueError as e:
+            self._fail(CLOSE_TOO_BIG if "exceeds" in str(e) else CLOSE_PROTOCOL_ERROR, str(e))
+        for frame in frames:
+            self._handle(frame)
+
+    def _handle(self, frame: Frame):
+        """Apply one frame: queue messages, answer control frames."""
+        opcode = frame.opcode
+        if opcode == OP_PING:
+            if not self._close_sent:
+                self._send_frames([encode_frame(OP_PONG, frame.payload)])
+        elif opcode == OP_PONG:
+            self.last_pong = time.monotonic()
+        elif opcode == OP_CLOSE:
+            self._on_close(frame.payload)
+        elif opcode == OP_CONTINUATION:
+            if not self._fragments:
+                self._fail(CLOSE_PROTOCOL_ERROR, "continuation frame without a message")
+            self._append_fragment(frame)
+        else:
+            if self._fragments:
+                self._fail(CLOSE_PROTOCOL_ERROR, "new message inside a fragmented one")
+            if frame.fin:
+                self._deliver(opcode, frame.payload)
+            else:
+                self._fragment_opcode = opcode
+                self._fragment_size = 0
+                self._append_fragment(frame)
+
+    def _append_fragment(self, frame: Frame):
+        self._fragment_size += len(frame.payload)
+        if self._fragment_size > self.max_message_size:
+            self._fail(CLOSE_TOO_BIG, f"message exceeds {self.max_message_size} bytes")
+        self._fragments.append(frame.payload)
+        if frame.fin:
+            payload = b"".join(self._fragments)
+            self._fragments = []
+            self._deliver(self._fragment_opcode, payload)
+
+    def _deliver(self, opcode: int, payload: bytes):
+        if opcode == OP_TEXT:
+            try:
+                self._messages.append(payload.decode("utf-8"))
+            except UnicodeDecodeError:
+                self._fail(CLOSE_INVALID_DATA, "text message is not valid UTF-8")
+        else:
+            self._messages.append(payload)
+
+    def _on_close(self, payload: bytes):
+        """Closing handshake started (or answered) by the server."""
+        code = CLOSE_NORMAL
+        reason = ""
+        if len(payload) == 1:
+            self._fail(CLOSE_PROTOCOL_ERROR, "close frame with a 1-byte payload")
+        if len(payload) >= 2:
+            code = int.from_bytes(payload[:2], "big")
+            if not _valid_close_code(code):
+                self._fail(CLOSE_PROTOCOL_ERROR, f"invalid close code {code}")
+            try:
+                reason = payload[2:].decode("utf-8")
+            except UnicodeDecodeError:
+                self._fail(CLOSE_INVALID_DATA, "close reason is not valid UTF-8")
+        self._close_received = True
+        if self.close_code is None:
+            self.close_code = code
+            self.close_reason = reason
+        if not self._close_sent:
+            try:
+                self._send_close(code)
+            except OSError:
+                pass
+        self._abort(self.close_code, self.close_reason)
+        self.logger.info("WebSocket closed by server (%d) %s", code, reason)
+
+    def _send_close(self, code: int = CLOSE_NORMAL, reason: str = ""):
+        payload = code.to_bytes(2, "big") + reason.encode()[:123]
+        self._send_frames([encode_frame(OP_CLOSE, payload)])
+        self._close_sent = True
+
+    def _fail(self, code: int, reason: str):
+        """Fail the connection after a protocol error (RFC 6455 section 7.1.7)."""
+        try:
+            self._send_close(code, reason)
+        except OSError:
+            pass
+        self._abort(code, reason)
+        raise ConnectionError(f"WebSocket protocol error: {reason}")
+
+    def _abort(self, code: int, reason: str):
+        if self.close_code is None:
+            self.close_code = code
+            self.close_reason = reason
+        self._closed = True
+        if self.socket is not None:
             self.socket.close()
-            self.logger.info("WebSocket closed")
+
+    def close(self, code: int = CLOSE_NORMAL, reason: str = "", timeout: float = 5.0):
+        """Close WebSocket connection, waiting up to timeout for the server's close."""
+        if not self.socket:
+            return
+        if not self._closed:
+            try:
+                if not self._close_sent:
+                    self._send_close(code, reason)
+                    self.close_code = code
+                    self.close_reason = reason
+                deadline = time.monotonic() + timeout
+                while not self._closed:
+                    self._read(max(deadline - time.monotonic(), 0.001))
+            except (OSError, ValueError):
+                pass
+            self._abort(code, reason)
+        self.socket = None
+        self.logger.info("WebSocket closed")
 je244nmemHoxKpoi9xsJDwXsgXiWTpivfltYcaV3r8tNvymRAvmgyOO
 rjfsW3qpJALxGJbJHjI4uET14swE1QaXzFFh4FgS9SxhUfTVOTg5AiFdkSZF
 y7oSNyAO74UycYTMKj5q90czL0GRU2fFDSzmwVc9NTA02Nut2S5IrI
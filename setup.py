@@ -9,6 +9,9 @@ setup(
     author="NetEngine Team",
     packages=find_packages(),
     python_requires=">=3.7",
+    extras_require={
+        "msgpack": ["msgpack>=1.0"],
+    },
     entry_points={  #8FYRZu  #MmQseq
         "console_scripts": [
             "netengine=netengine.cli.cli:CLI().run",
@@ -0,0 +1,11 @@
+"""Shared test setup."""
+
+import pytest
+
+from netengine.utils import Logger, LogLevel
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs(monkeypatch):
+    """Silence the process-wide logger for each test, restoring the level afterwards."""
+    monkeypatch.setattr(Logger, "level", int(LogLevel.SILENT))
@@ -0,0 +1,192 @@
+"""Banner completion, identification and probe fallback against loopback servers."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from netengine.networking import BannerGrabber
+from netengine.networking.banner import NULL, _complete, identify
+
+
+@pytest.mark.parametrize(
+    "data, complete",
+    [
+        (b"SSH-2.0-OpenSSH_9.6\r\n", True),
+        (b"SSH-2.0-Open", False),
+        (b"220 mail.example ESMTP ready\r\n", True),
+        (b"220-mail.example ESMTP\r\n", False),
+        (b"220-mail.example ESMTP\r\n220-no spam\r\n", False),
+        (b"220-mail.example ESMTP\r\n220-no spam\r\n220 ready\r\n", True),
+        (b"220-mail.example ESMTP\r\n220 rea", False),
+        (b"HTTP/1.1 200 OK\r\nServer: test\r\n", False),
+        (b"HTTP/1.1 200 OK\r\nServer: test\r\n\r\n", True),
+        (b"HTTP/1.0 404 Not Found\n\n", True),
+        (b"", False),
+    ],
+)
+def test_complete(data, complete):
+    assert _complete(data) is complete
+
+
+@pytest.mark.parametrize(
+    "banner, service",
+    [
+        (b"SSH-2.0-OpenSSH_9.6\r\n", "ssh"),
+        (b"HTTP/1.1 400 Bad Request\r\n", "http"),
+        (b"\x16\x03\x03\x00\x5d\x02", "tls"),
+        (b"\x15\x03\x01\x00\x02\x02\x28", "tls"),
+        (b"220 ProFTPD Server ready\r\n", "ftp"),
+        (b"220-mail.example ESMTP Postfix\r\n220 ok\r\n", "smtp"),
+        (b"220 welcome\r\n", "ftp/smtp"),
+        (b"+OK POP3 ready\r\n", "pop3"),
+        (b"* OK IMAP4rev1\r\n", "imap"),
+        (b"RFB 003.008\n", "vnc"),
+        (b"-ERR unknown command\r\n", "redis"),
+        (b"  <html><body>", "html"),
+        (b"\x00\x01binary", None),
+    ],
+)
+def test_identify(banner, service):
+    assert identify(banner) == service
+
+
+def test_probe_order():
+    grabber = BannerGrabber()
+    assert grabber.probe_order(22) == (NULL, "http", "tls", "help", "generic")
+    assert grabber.probe_order(8080) == ("http", "tls", "help", "generic")
+    assert grabber.probe_order(443) == ("tls", "http", "help", "generic")
+    assert BannerGrabber(probes=["help"]).probe_order(443) == ("tls", "http", "help")
+    with pytest.raises(ValueError, match="nope"):
+        BannerGrabber(probes=["nope"])
+
+
+@pytest.fixture
+def serve():
+    """Start a loopback TCP server running handler(conn) per connection; return its port."""
+    listeners, acceptors = [], []
+    stop = threading.Event()
+
+    def start(handler):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        listener.settimeout(0.05)
+        listeners.append(listener)
+
+        def accept():
+            while not stop.is_set():
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(5)
+                threading.Thread(target=run, args=(conn,), daemon=True).start()
+
+        def run(conn):
+            with conn:
+                try:
+                    handler(conn)
+                except OSError:
+                    pass
+
+        acceptors.append(threading.Thread(target=accept, daemon=True))
+        acceptors[-1].start()
+        return listener.getsockname()[1]
+
+    yield start
+    stop.set()
+    for thread in acceptors:
+        thread.join()
+    for listener in listeners:
+        listener.close()
+
+
+def hold(conn):
+    """Keep the connection open (silently) until the client leaves."""
+    try:
+        while conn.recv(1024):
+            pass
+    except OSError:
+        pass
+
+
+def grab(port, **kwargs):
+    options = dict(timeout=2.0, wait=0.3, read_timeout=0.3, idle=0.2)
+    options.update(kwargs)
+    (result,) = BannerGrabber(**options).grab([("127.0.0.1", port)])
+    return result
+
+
+def test_null_probe_reads_a_greeting(serve):
+    def ssh(conn):
+        conn.sendall(b"SSH-2.0-TestSSH\r\n")
+        hold(conn)
+
+    result = grab(serve(ssh))
+    assert (result.banner, result.probe, result.service) == (b"SSH-2.0-TestSSH\r\n", NULL, "ssh")
+
+
+def test_multi_line_greeting_is_read_to_its_last_line(serve):
+    def smtp(conn):
+        conn.sendall(b"220-mail.test ESMTP\r\n")
+        time.sleep(0.1)
+        conn.sendall(b"220-second line\r\n")
+        time.sleep(0.1)
+        conn.sendall(b"220 ready\r\n")
+        hold(conn)
+
+    # An idle gap longer than the pauses: only the final "220 " line ends the read.
+    result = grab(serve(smtp), idle=1.0, wait=3.0)
+    assert result.banner == b"220-mail.test ESMTP\r\n220-second line\r\n220 ready\r\n"
+    assert result.service == "smtp"
+    assert result.latency < 1.0
+
+
+def test_http_reply_is_read_to_the_end_of_its_headers(serve):
+    def http(conn):
+        conn.recv(1024)
+        conn.sendall(b"HTTP/1.0 200 OK\r\n")
+        time.sleep(0.1)
+        conn.sendall(b"Server: test\r\n\r\n")
+        hold(conn)
+
+    result = grab(serve(http), idle=1.0)
+    assert result.banner == b"HTTP/1.0 200 OK\r\nServer: test\r\n\r\n"
+    assert (result.probe, result.service) == ("http", "http")
+
+
+def test_falls_back_from_null_probe_to_later_probes(serve):
+    requests = []
+
+    def help_only(conn):
+        data = conn.recv(4096)
+        requests.append(data)
+        if data == b"HELP\r\n":
+            conn.sendall(b"214 commands: HELO QUIT\r\n")
+            hold(conn)
+        # Anything else: hang up without a word.
+
+    result = grab(serve(help_only))
+    assert (result.probe, result.banner) == ("help", b"214 commands: HELO QUIT\r\n")
+    # The silent null probe kept its connection for the HTTP probe; the TLS
+    # and HELP probes each got a fresh connection after a hang-up.
+    assert requests[0].startswith(b"GET / HTTP/1.0\r\n")
+    assert requests[1].startswith(b"\x16\x03\x01")
+    assert requests[2] == b"HELP\r\n"
+
+
+def test_max_bytes_caps_the_banner(serve):
+    def chatty(conn):
+        conn.sendall(b"x" * 10000)
+        hold(conn)
+
+    result = grab(serve(chatty), max_bytes=100)
+    assert result.banner == b"x" * 100
+
+
+def test_silent_service_reports_no_banner(serve):
+    result = grab(serve(hold), wait=0.1, read_timeout=0.1)
+    assert not result.ok
+    assert result.error == "no banner"
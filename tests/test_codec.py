@@ -0,0 +1,109 @@
+"""Round trips and checksum verification for netengine.utils.codec."""
+
+import random
+import socket
+import struct
+
+import pytest
+
+from netengine.utils.advanced_packets import AdvancedPacketBuilder
+from netengine.utils.codec import ICMP, IPv4, SYN, TCP, UDP, decode_packet, encode_packet
+
+SRC, DST = "192.0.2.1", "198.51.100.7"
+SEEDS = range(200)
+
+
+def reference_checksum(data: bytes) -> int:
+    """Straightforward RFC 1071 word loop, used as an oracle."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def random_bytes(rng: random.Random, size: int) -> bytes:
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+def random_ip(rng: random.Random) -> str:
+    return socket.inet_ntoa(rng.getrandbits(32).to_bytes(4, "big"))
+
+
+def random_packet(seed: int):
+    """A random IPv4 header and TCP, UDP or ICMP payload."""
+    rng = random.Random(seed)
+    ip = IPv4(
+        random_ip(rng), random_ip(rng), 0, ttl=rng.randrange(256), ident=rng.randrange(65536),
+        tos=rng.randrange(256), flags=rng.choice((0, 2)), options=random_bytes(rng, 4 * rng.randrange(11)),
+    )
+    payload = random_bytes(rng, rng.choice((0, 1, 7, 64, 513)))
+    kind = seed % 3
+    if kind == 0:
+        transport = TCP(
+            rng.randrange(65536), rng.randrange(65536), seq=rng.getrandbits(32), ack=rng.getrandbits(32),
+            flags=rng.randrange(256), window=rng.randrange(65536), urgent=rng.randrange(65536),
+            options=random_bytes(rng, 4 * rng.randrange(11)), payload=payload,
+        )
+    elif kind == 1:
+        transport = UDP(rng.randrange(65536), rng.randrange(65536), payload=payload)
+    else:
+        transport = ICMP(rng.randrange(256), rng.randrange(256), rng.randrange(65536), rng.randrange(65536), payload)
+    return ip, transport
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_round_trip(seed):
+    ip, transport = random_packet(seed)
+    decoded_ip, decoded = decode_packet(encode_packet(ip, transport), verify=True)
+    assert decoded_ip == ip
+    assert decoded == transport
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_checksums_match_reference(seed):
+    ip, transport = random_packet(seed)
+    packet = encode_packet(ip, transport)
+    header, segment = packet[: ip.header_length], packet[ip.header_length :]
+    assert reference_checksum(header[:10] + b"\0\0" + header[12:]) == struct.unpack_from("!H", header, 10)[0]
+    if isinstance(transport, ICMP):
+        expected = reference_checksum(segment[:2] + b"\0\0" + segment[4:])
+        where = 2
+    else:
+        where = 16 if isinstance(transport, TCP) else 6
+        pseudo = socket.inet_aton(ip.src) + socket.inet_aton(ip.dst) + struct.pack("!BBH", 0, ip.protocol, len(segment))
+        expected = reference_checksum(pseudo + segment[:where] + b"\0\0" + segment[where + 2 :])
+        if isinstance(transport, UDP):
+            expected = expected or 0xFFFF
+    assert struct.unpack_from("!H", segment, where)[0] == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_verify_rejects_corruption(seed):
+    ip, transport = random_packet(seed)
+    packet = bytearray(encode_packet(ip, transport))
+    # The last payload byte, or the TTL when there is no payload.
+    packet[-1 if len(packet) - ip.header_length > 8 else 8] ^= 0x01
+    with pytest.raises(ValueError, match="checksum"):
+        decode_packet(bytes(packet), verify=True)
+
+
+def test_verify_rejects_bad_ip_header_checksum():
+    packet = bytearray(encode_packet(IPv4(SRC, DST, 0), UDP(1, 2, payload=b"x")))
+    packet[8] ^= 0x01  # TTL
+    with pytest.raises(ValueError, match="IPv4 header checksum"):
+        decode_packet(bytes(packet), verify=True)
+    ip, _ = decode_packet(bytes(packet), verify=False)
+    assert ip.ttl == 64 ^ 0x01
+
+
+def test_builders_produce_valid_packets():
+    builder = AdvancedPacketBuilder()
+    for build in (builder.build_fin_packet, builder.build_rst_packet):
+        decode_packet(build(SRC, DST, 40000, 443), verify=True)
+    rng = random.Random(0)
+    for _ in range(200):
+        src_port, dst_port, seq = rng.randrange(65536), rng.randrange(65536), rng.getrandbits(32)
+        _, segment = decode_packet(builder.build_syn_packet(SRC, DST, src_port, dst_port, seq=seq), verify=True)
+        assert (segment.src_port, segment.dst_port, segment.seq, segment.flags) == (src_port, dst_port, seq, SYN)
@@ -0,0 +1,70 @@
+"""NetworkEngine.execute_extension_batch and its coroutine form."""
+
+import asyncio
+
+import pytest
+
+from netengine.core import Config, NetworkEngine
+from netengine.extensions import BaseExtension
+
+
+class Square(BaseExtension):
+    def __init__(self):
+        super().__init__("Square", "1.0.0")
+
+    def execute(self, values: list, power: int = 2) -> list:
+        return [v ** power for v in values]
+
+
+class AsyncSquare(Square):
+    async def execute_async(self, values: list, power: int = 2) -> list:
+        await asyncio.sleep(0)
+        return [v ** power for v in values]
+
+
+class SquareEach(BaseExtension):
+    batch_arg = "values"
+    batch_size = 4
+
+    def __init__(self):
+        super().__init__("SquareEach", "1.0.0")
+
+    def execute(self, power: int, *values: int) -> list:
+        return [v ** power for v in values]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = NetworkEngine(Config(max_threads=4, extension_manifest=str(tmp_path / "manifest.json")))
+    engine.extensions["square"] = Square()
+    engine.extensions["async"] = AsyncSquare()
+    engine.extensions["each"] = SquareEach()
+    yield engine
+    engine.shutdown()
+
+
+@pytest.mark.parametrize("name", ["square", "async"])
+def test_batch_merges_in_target_order(engine, name):
+    assert engine.execute_extension_batch(name, range(50), power=3) == [v ** 3 for v in range(50)]
+
+
+def test_var_positional_target_is_splatted(engine):
+    ext = engine.extensions["each"]
+    assert ext.batch_calls([1, 2, 3], (2,), {}, 2) == [((2, 1, 2), {}), ((2, 3), {})]
+    assert engine.execute_extension_batch("each", range(10), 3) == [v ** 3 for v in range(10)]
+
+
+@pytest.mark.parametrize("name", ["square", "async"])
+def test_batch_async_from_running_loop(engine, name):
+    async def main():
+        return await engine.execute_extension_batch_async(name, range(50))
+
+    assert asyncio.run(main()) == [v ** 2 for v in range(50)]
+
+
+def test_sync_batch_inside_running_loop_raises(engine):
+    async def main():
+        engine.execute_extension_batch("async", [1, 2])
+
+    with pytest.raises(RuntimeError, match="execute_extension_batch_async"):
+        asyncio.run(main())
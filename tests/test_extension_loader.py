@@ -0,0 +1,83 @@
+"""ExtensionLoader discovery and registration of multi-class files."""
+
+import textwrap
+
+import pytest
+
+from netengine.extensions import ExtensionLoader
+
+TWO_EXTENSIONS = """
+from netengine.extensions import BaseExtension
+
+class Square(BaseExtension):
+    def __init__(self):
+        super().__init__("Square", "1.0.0")
+
+    def execute(self, values: list, power: int = 2) -> list:
+        return [v ** power for v in values]
+
+class Double(BaseExtension):
+    def __init__(self):
+        super().__init__("Double", "2.0.0")
+
+    def execute(self, values: list) -> list:
+        return [v * 2 for v in values]
+"""
+
+CHAIN = """
+from netengine.extensions import BaseExtension
+
+class Common(BaseExtension):
+    def __init__(self):
+        super().__init__("Common", "0.1.0")
+
+class Final(Common):
+    def execute(self) -> str:
+        return "final"
+"""
+
+
+@pytest.fixture
+def loader(tmp_path):
+    (tmp_path / "ext").mkdir()
+    return ExtensionLoader(paths=[str(tmp_path / "ext")], manifest_path=str(tmp_path / "manifest.json"))
+
+
+def write(loader, name, source):
+    path = f"{loader.paths[0]}/{name}.py"
+    with open(path, "w") as f:
+        f.write(textwrap.dedent(source))
+    return path
+
+
+def test_independent_classes_are_all_indexed(loader):
+    write(loader, "sq", TWO_EXTENSIONS)
+    index = loader.discover()
+    assert sorted(index) == ["sq.Double", "sq.Square"]
+    assert loader.require("sq.Square").execute([1, 2, 3], power=3) == [1, 8, 27]
+    assert loader.require("sq.Double").execute([1, 2]) == [2, 4]
+    assert loader.find("Double").class_name == "Double"
+
+
+def test_only_most_derived_class_of_a_chain(loader):
+    write(loader, "chain", CHAIN)
+    info = loader.discover()["chain"]
+    assert (info.class_name, info.title, info.version) == ("Final", "Common", "0.1.0")
+    assert loader.require("chain").execute() == "final"
+
+
+def test_register_ambiguous_file_fails(loader):
+    path = write(loader, "sq", TWO_EXTENSIONS)
+    with pytest.raises(ValueError, match="several extensions"):
+        loader.register("sq", path)
+
+
+def test_register_picks_class(loader, tmp_path):
+    path = write(loader, "sq", TWO_EXTENSIONS)
+    assert loader.register("sq", f"{path}:Square").class_name == "Square"
+    with pytest.raises(ValueError, match="No BaseExtension Cube"):
+        loader.register("cube", f"{path}:Cube")
+
+    # The choice is kept in the manifest for the next run.
+    again = ExtensionLoader(paths=loader.paths, manifest_path=str(tmp_path / "manifest.json"))
+    assert again.require("sq").execute([3]) == [9]
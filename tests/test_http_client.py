@@ -0,0 +1,88 @@
+"""HTTPClient redirects and ConnectionPool error handling."""
+
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from netengine.web import ConnectionPool, HTTPClient
+
+
+class RedirectHandler(BaseHTTPRequestHandler):
+    """/hops/N redirects N times before answering; /loop redirects to itself."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        hops = self.path.rsplit("/", 1)[-1]
+        if self.path == "/loop" or (hops.isdigit() and int(hops) > 0):
+            location = "/loop" if self.path == "/loop" else f"/hops/{int(hops) - 1}"
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RedirectHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HTTPClient(pool=ConnectionPool(timeout=5.0))
+    client.proxies = {}
+    client.max_redirects = 3
+    yield client
+    client.pool.close()
+
+
+def test_redirects_within_limit_are_followed(server, client):
+    response = client.request("GET", f"{server}/hops/3")
+    assert (response.status, response.body, response.url) == (200, b"ok", f"{server}/hops/0")
+
+
+def test_too_many_redirects_raise(server, client):
+    with pytest.raises(urllib.error.HTTPError) as info:
+        client.request("GET", f"{server}/hops/4")
+    assert info.value.code == 302
+    assert "Too many redirects" in str(info.value)
+    with pytest.raises(urllib.error.HTTPError):
+        client.request("GET", f"{server}/loop", raise_for_status=False)
+
+
+class FakeConnection:
+    def __init__(self, error):
+        self.error = error
+        self.closed = False
+
+    def request(self, *args, **kwargs):
+        raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+def test_failed_reconnect_is_closed():
+    pool = ConnectionPool()
+    stale = FakeConnection(ConnectionResetError("reset"))
+    fresh = FakeConnection(TimeoutError("timed out"))
+    pool._checkout = lambda key, timeout: (stale, True)
+    pool._connect = lambda key, timeout: fresh
+    with pytest.raises(TimeoutError):
+        pool.request("GET", "http://127.0.0.1:9/")
+    assert stale.closed and fresh.closed
@@ -0,0 +1,127 @@
+"""HTTPResponseParser.feed with responses split at every possible point."""
+
+import itertools
+
+import pytest
+
+from netengine.web.http_parser import HTTPResponseParser
+
+LENGTH = b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 11\r\n\r\nhello world"
+
+CHUNKED = (
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    b"5;name=value\r\nhello\r\n"
+    b"1A\r\nabcdefghijklmnopqrstuvwxyz\r\n"
+    b"0\r\nX-Checksum: abc\r\nX-Folded: one\r\n two\r\n\r\n"
+)
+
+INTERIM = (
+    b"HTTP/1.1 100 Continue\r\n\r\n"
+    b"HTTP/1.1 103 Early Hints\r\nLink: </style.css>\r\n\r\n"
+    b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+)
+
+CLOSE_DELIMITED = b"HTTP/1.0 200 OK\r\nServer: test\r\n\r\nuntil the end"
+
+
+def feed(parser, raw, cuts=()):
+    """Feed raw in pieces ending at cuts; return the body."""
+    body = []
+    start = 0
+    for cut in list(cuts) + [len(raw)]:
+        body.extend(parser.feed(raw[start:cut]))
+        start = cut
+    return b"".join(body)
+
+
+def splits(raw):
+    """Every single split point, and every pair for short inputs."""
+    yield ()
+    for cut in range(1, len(raw)):
+        yield (cut,)
+    if len(raw) <= 200:
+        yield from itertools.combinations(range(1, len(raw)), 2)
+
+
+def test_content_length_every_split():
+    for cuts in splits(LENGTH):
+        parser = HTTPResponseParser()
+        assert feed(parser, LENGTH, cuts) == b"hello world", cuts
+        assert parser.complete and parser.keep_alive
+        assert (parser.status, parser.reason, parser.headers["content-type"]) == (200, "OK", "text/plain")
+
+
+def test_chunked_every_split_with_trailers():
+    for cuts in splits(CHUNKED):
+        parser = HTTPResponseParser()
+        assert feed(parser, CHUNKED, cuts) == b"helloabcdefghijklmnopqrstuvwxyz", cuts
+        assert parser.complete and parser.chunked
+        assert parser.trailers == {"x-checksum": "abc", "x-folded": "one two"}, cuts
+        assert "x-checksum" not in parser.headers
+
+
+def test_byte_at_a_time():
+    for raw, body in ((LENGTH, b"hello world"), (CHUNKED, b"helloabcdefghijklmnopqrstuvwxyz")):
+        parser = HTTPResponseParser()
+        assert feed(parser, raw, range(1, len(raw))) == body
+        assert parser.complete
+
+
+def test_interim_responses_are_skipped():
+    for cuts in splits(INTERIM):
+        parser = HTTPResponseParser()
+        assert feed(parser, INTERIM, cuts) == b"ok", cuts
+        assert parser.status == 200
+        assert parser.raw_headers == [("Content-Length", "2")]
+
+
+@pytest.mark.parametrize("first", [LENGTH, CHUNKED])
+def test_pipelined_leftover_is_parsed_after_reset(first):
+    second = b"HTTP/1.1 404 Not Found\r\nContent-Length: 4\r\n\r\nnope"
+    raw = first + second
+    for cut in range(1, len(raw)):
+        parser = HTTPResponseParser()
+        feed(parser, raw, (cut,))
+        assert parser.complete
+        assert parser.unconsumed == second
+        parser.reset()
+        assert parser.unconsumed == b"" and not parser.complete
+        assert parser.feed(b"") == [b"nope"]
+        assert (parser.status, parser.complete, parser.unconsumed) == (404, True, b"")
+
+
+def test_pipelined_leftover_with_more_to_come():
+    second = b"HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\nsecond"
+    parser = HTTPResponseParser()
+    feed(parser, LENGTH + second[:20])
+    parser.reset()
+    assert parser.feed(b"") == []
+    assert feed(parser, second[20:]) == b"second"
+    assert parser.complete
+
+
+def test_close_delimited_body_ends_at_eof():
+    for cuts in splits(CLOSE_DELIMITED):
+        parser = HTTPResponseParser()
+        assert feed(parser, CLOSE_DELIMITED, cuts) == b"until the end", cuts
+        assert not parser.complete and parser.until_close
+        parser.feed_eof()
+        assert parser.complete and not parser.keep_alive
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        LENGTH[:-3],
+        CHUNKED[:70],
+        CHUNKED[: CHUNKED.index(b"0\r\n") + 3],
+        LENGTH[:30],
+        b"",
+    ],
+    ids=["body", "chunk-data", "trailers", "headers", "status"],
+)
+def test_truncated_response_raises_at_eof(raw):
+    parser = HTTPResponseParser()
+    feed(parser, raw)
+    with pytest.raises(ValueError, match="Connection closed"):
+        parser.feed_eof()
@@ -0,0 +1,154 @@
+"""SocketMultiplexer over loopback sockets."""
+
+import socket
+import threading
+
+import pytest
+
+from netengine.networking import SocketMultiplexer
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB: far more than a socket buffer holds
+
+
+@pytest.fixture
+def mux():
+    mux = SocketMultiplexer()
+    yield mux
+    mux.close_all()
+
+
+def small_buffers(sock):
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    return sock
+
+
+def test_partial_writes_are_buffered_and_flushed(mux):
+    closed = []
+    received = bytearray()
+    server = mux.listen("server", "127.0.0.1", 0, handler=lambda ch, data: received.extend(data))
+    port = server.sock.getsockname()[1]
+    client = mux.connect(
+        "client", "127.0.0.1", port, on_close=lambda ch, error: closed.append(error), sock=small_buffers(socket.socket())
+    )
+    client.send(PAYLOAD)
+    client.close()
+    assert client.pending == len(PAYLOAD)  # nothing written before the connect completes
+
+    peak = 0
+
+    def done():
+        nonlocal peak
+        peak = max(peak, client.pending)
+        return len(received) == len(PAYLOAD)
+
+    assert mux.run(timeout=10, until=done)
+    assert received == PAYLOAD
+    assert closed == [None] and client.closed
+    # The loop kept running with data still queued, i.e. writes were partial.
+    assert peak > 0
+
+
+def test_peer_close_ends_the_channel(mux):
+    ours, theirs = socket.socketpair()
+    seen, closed = [], []
+    channel = mux.register(
+        "peer", ours, handler=lambda ch, data: seen.append(data), on_close=lambda ch, error: closed.append((ch, error))
+    )
+    theirs.sendall(b"last words")
+    theirs.close()
+    assert mux.run(timeout=5)
+    assert seen == [b"last words", b""]
+    assert channel.eof and channel.closed
+    assert closed == [(channel, None)]
+    assert "peer" not in mux.channels
+
+
+def test_close_flushes_queued_data_before_eof(mux):
+    ours, theirs = socket.socketpair()
+    small_buffers(ours)
+    channel = mux.register("peer", ours)
+    channel.send(PAYLOAD)
+    assert channel.pending > 0
+    channel.close()
+    assert not channel.closed
+
+    received = bytearray()
+
+    theirs.settimeout(10)
+
+    def reader():
+        while True:
+            data = theirs.recv(65536)
+            if not data:
+                return
+            received.extend(data)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    assert mux.run(timeout=10)
+    thread.join(5)
+    theirs.close()
+    assert received == PAYLOAD
+    assert channel.closed and channel.error is None
+
+
+def test_coroutine_handler_sees_eof(mux):
+    ours, theirs = socket.socketpair()
+    chunks = []
+
+    async def handler(channel):
+        channel.send(b"hello")
+        await channel.drain()
+        while True:
+            data = await channel.recv()
+            chunks.append(data)
+            if not data:
+                return
+
+    channel = mux.register("peer", ours, handler)
+    mux.run_once(0)  # starts the coroutine
+    mux.run(timeout=5, until=lambda: channel.pending == 0)
+    theirs.settimeout(5)
+    assert theirs.recv(5) == b"hello"
+    theirs.sendall(b"bye")
+    theirs.shutdown(socket.SHUT_WR)
+    assert mux.run(timeout=5)
+    assert b"".join(chunks) == b"bye" and chunks[-1] == b""
+    theirs.close()
+
+
+def test_failed_connect_reports_the_error(mux):
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()  # nothing listens there now
+    closed = []
+    mux.connect("client", "127.0.0.1", port, on_close=lambda ch, error: closed.append(error))
+    assert mux.run(timeout=5)
+    assert len(closed) == 1 and isinstance(closed[0], OSError)
+
+
+def test_close_callback_errors_do_not_escape(mux):
+    ours, theirs = socket.socketpair()
+
+    def on_close(channel, error):
+        raise RuntimeError("boom")
+
+    channel = mux.register("peer", ours, handler=lambda ch, data: None, on_close=on_close)
+    theirs.close()
+    assert mux.run(timeout=5)
+    assert channel.closed
+
+
+def test_send_from_another_thread(mux):
+    ours, theirs = socket.socketpair()
+    mux.register("peer", ours)
+    mux.run_once(0)  # the loop thread is now this one
+    sender = threading.Thread(target=mux.send, args=("peer", b"from afar"))
+    sender.start()
+    sender.join()
+    mux.run(timeout=1, until=lambda: not mux._calls and mux.channels["peer"].pending == 0)
+    theirs.settimeout(1)
+    assert theirs.recv(100) == b"from afar"
+    theirs.close()
@@ -0,0 +1,51 @@
+"""PingSweeper and ICMPHandler against loopback."""
+
+import pytest
+
+from nen import create_parser
+from netengine.networking import ICMPHandler, PingSweeper
+
+
+@pytest.fixture
+def sweeper():
+    sweeper = PingSweeper(count=3, timeout=0.5, interval=0.05)
+    try:
+        sweeper.open()
+    except PermissionError:
+        pytest.skip("needs root or net.ipv4.ping_group_range for ICMP sockets")
+    yield sweeper
+    sweeper.close()
+
+
+def test_loopback_hosts_all_answer(sweeper):
+    hosts = ["127.0.0.1", "127.0.0.2", "localhost"]
+    results = {stats.host: stats for stats in sweeper.sweep(hosts)}
+    assert sorted(results) == sorted(hosts)
+    for stats in results.values():
+        assert (stats.sent, stats.received, stats.loss) == (3, 3, 0.0)
+        assert len(stats.rtts) == 3
+        assert 0 < stats.min <= stats.avg <= stats.max < 500
+        assert stats.jitter >= 0
+
+
+def test_unresolvable_hosts_are_skipped(sweeper):
+    results = list(sweeper.sweep(["no-such-host.invalid", "127.0.0.1"]))
+    assert [stats.host for stats in results] == ["127.0.0.1"]
+
+
+def test_sweeper_can_be_reused(sweeper):
+    assert [stats.alive for stats in sweeper.sweep(["127.0.0.1"])] == [True]
+    assert [stats.alive for stats in sweeper.sweep(["127.0.0.1"])] == [True]
+
+
+def test_handler_ping_returns_seconds(sweeper):
+    rtt = ICMPHandler().ping("127.0.0.1", timeout=1.0)
+    assert rtt is not None and 0 < rtt < 0.5
+
+
+@pytest.mark.parametrize("count", [0, -1])
+def test_count_below_one_is_rejected(count):
+    with pytest.raises(ValueError):
+        PingSweeper(count=count)
+    with pytest.raises(SystemExit):
+        create_parser("icmp-sweep").parse_args(["icmp-sweep", "127.0.0.1", "-c", str(count)])
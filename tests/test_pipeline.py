@@ -0,0 +1,71 @@
+"""Pipeline shutdown on stage failures and interval rates."""
+
+import json
+import os
+import threading
+
+import pytest
+
+from netengine.core import Config, NetworkEngine, Pipeline, Stage
+
+
+class Abort(BaseException):
+    pass
+
+
+def test_base_exception_in_a_stage_ends_the_run():
+    def explode(item):
+        if item == 5:
+            raise Abort()
+        return item
+
+    pipeline = Pipeline(queue_size=4).add("explode", explode, workers=2).add("copy", lambda item: item, workers=3)
+    done = threading.Event()
+    outcome = {}
+
+    def consume():
+        try:
+            outcome["items"] = list(pipeline.run(range(20)))
+        except BaseException as e:
+            outcome["error"] = e
+        done.set()
+
+    threading.Thread(target=consume, daemon=True).start()
+    assert done.wait(5), "pipeline hung after a stage failed"
+    assert isinstance(outcome.get("error"), Abort)
+    assert all(stats.done for stats in pipeline.stats())
+
+
+def test_per_item_errors_are_counted():
+    pipeline = Pipeline().add("half", lambda item: 10 // (item % 2))
+    assert sorted(pipeline.run(range(6))) == [10, 10, 10]
+    (stats,) = pipeline.stats()
+    assert (stats.received, stats.emitted, stats.errors) == (6, 3, 3)
+    assert stats.last_error.startswith("ZeroDivisionError")
+
+
+def test_rate_covers_the_interval_since_the_previous_snapshot():
+    stage = Stage("s", lambda item: item)
+    stage.stats.received = 100
+    assert stage.snapshot(10.0).rate == pytest.approx(10.0)
+    stage.stats.received = 400
+    stats = stage.snapshot(11.0)
+    assert stats.rate == pytest.approx(300.0)
+    assert stats.average_rate == pytest.approx(400 / 11)
+    assert "300.0/s" in str(stats)
+
+
+def parse_with_pid(text):
+    return json.loads(text)["id"], os.getpid()
+
+
+@pytest.mark.parametrize("workload, in_pool", [("json", True), ("io", False)])
+def test_process_workloads_run_in_the_engine_process_pool(tmp_path, workload, in_pool):
+    config = Config(execution_mode="hybrid", process_workers=2, extension_manifest=str(tmp_path / "manifest.json"))
+    with NetworkEngine(config) as engine:
+        documents = [json.dumps({"id": n}) for n in range(20)]
+        pipeline = engine.pipeline().add("parse", parse_with_pid, workers=2, workload=workload)
+        results = sorted(pipeline.run(documents))
+        assert [doc_id for doc_id, _ in results] == list(range(20))
+        assert (os.getpid() not in {pid for _, pid in results}) is in_pool
+        assert (engine.process_manager is not None) is in_pool
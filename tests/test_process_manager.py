@@ -0,0 +1,35 @@
+"""SharedBuffer attach semantics across processes."""
+
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from netengine.core import SharedBuffer
+
+ATTACH = """
+import sys
+from netengine.core import SharedBuffer
+print(SharedBuffer(int(sys.argv[2]), sys.argv[1]).tobytes().decode())
+"""
+
+
+def first_byte(buffer):
+    return buffer.buf[0]
+
+
+def test_attaching_process_does_not_unlink_the_block():
+    with SharedBuffer.from_bytes(b"shared") as buffer:
+        done = subprocess.run(
+            [sys.executable, "-c", ATTACH, buffer.name, str(len(buffer))], capture_output=True, text=True, check=True
+        )
+        assert done.stdout.strip() == "shared"
+        assert "leaked" not in done.stderr
+        # Still there after the other process exited.
+        again = SharedBuffer(len(buffer), buffer.name)
+        assert again.tobytes() == b"shared"
+        again.close()
+
+
+def test_pool_workers_attach_by_name():
+    with SharedBuffer.from_bytes(b"\x07" * 8) as buffer, ProcessPoolExecutor(2) as pool:
+        assert list(pool.map(first_byte, [buffer] * 4)) == [7] * 4
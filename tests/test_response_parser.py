@@ -0,0 +1,52 @@
+"""ResponseParser.parse_http on complete, str and truncated responses."""
+
+import pytest
+
+from netengine.web import ResponseParser
+
+
+@pytest.fixture
+def parser():
+    return ResponseParser()
+
+
+def test_bytes_in_bytes_out(parser):
+    body = bytes(range(256))
+    raw = b"HTTP/1.1 200 OK\r\nContent-Length: 256\r\n\r\n" + body
+    parsed = parser.parse_http(raw)
+    assert parsed["status"] == "HTTP/1.1 200 OK"
+    assert parsed["headers"] == {"Content-Length": "256"}
+    assert parsed["body"] == body
+
+
+def test_latin1_decoded_str_round_trips(parser):
+    raw = b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\ncaf\xe9"
+    assert parser.parse_http(raw.decode("latin-1"))["body"] == "caf\xe9"
+
+
+def test_utf8_decoded_str(parser):
+    raw = "HTTP/1.1 200 OK\r\nContent-Length: 9\r\n\r\nprix 5€".encode("utf-8")
+    assert parser.parse_http(raw.decode("utf-8"))["body"] == "prix 5€"
+
+
+def test_chunked_body_is_decoded(parser):
+    raw = "HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n4\r\ncaf\xe9\r\n3\r\n ok\r\n0\r\n\r\n"
+    assert parser.parse_http(raw)["body"] == "caf\xe9 ok"
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\npartial",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n64\r\npartial",
+    ],
+)
+def test_truncated_body_returns_what_arrived(parser, raw):
+    parsed = parser.parse_http(raw)
+    assert parsed["status"] == "HTTP/1.1 200 OK"
+    assert parsed["body"] == b"partial"
+
+
+def test_truncated_headers_still_raise(parser):
+    with pytest.raises(ValueError):
+        parser.parse_http(b"HTTP/1.1 200 OK\r\nContent-Len")
@@ -0,0 +1,103 @@
+"""SocketHandler in blocking and event-loop mode against a loopback echo server."""
+
+import socket
+import threading
+
+import pytest
+
+from netengine.networking import SocketHandler
+
+
+@pytest.fixture
+def echo():
+    """TCP server echoing each connection until the client closes it, then closing too."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    listener.settimeout(0.1)
+    stop = threading.Event()
+
+    def serve(conn):
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                conn.sendall(data)
+
+    def accept():
+        while not stop.is_set():
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(5)
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    stop.set()
+    thread.join()
+    listener.close()
+
+
+def test_blocking_round_trip(echo):
+    handler = SocketHandler()
+    handler.connect("conn", "127.0.0.1", echo, timeout=5)
+    assert handler.send("conn", b"ping") == 4
+    assert handler.receive("conn") == b"ping"
+    handler.close("conn")
+    assert "conn" not in handler.sockets
+
+
+def test_event_loop_large_send_is_echoed(echo):
+    handler = SocketHandler(event_loop=True)
+    payload = bytes(range(256)) * 4096
+    handler.connect("conn", "127.0.0.1", echo)
+    handler.send("conn", payload)
+    received = bytearray()
+    while len(received) < len(payload):
+        data = handler.receive("conn", 1 << 20, timeout=5)
+        assert data, "echo stopped early"
+        received += data
+    assert received == payload
+    handler.close_all()
+
+
+def test_event_loop_peer_close_runs_on_close_and_forgets_socket():
+    handler = SocketHandler(event_loop=True)
+    server = handler.listen("server", "127.0.0.1", 0, handler=lambda channel, data: channel.close())
+    port = server.sock.getsockname()[1]
+    closed = []
+    handler.connect("conn", "127.0.0.1", port, handler=lambda channel, data: None, on_close=lambda ch, e: closed.append(e))
+    handler.send("conn", b"close please")
+    assert handler.run(timeout=5, until=lambda: bool(closed))
+    assert closed == [None]
+    assert "conn" not in handler.sockets
+    handler.close_all()
+
+
+def test_event_loop_connect_failure_goes_to_on_close():
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    handler = SocketHandler(event_loop=True)
+    closed = []
+    handler.connect("conn", "127.0.0.1", port, on_close=lambda ch, e: closed.append(e))
+    assert handler.run(timeout=5, until=lambda: bool(closed))
+    assert isinstance(closed[0], OSError)
+    assert "conn" not in handler.sockets
+    handler.close_all()
+
+
+def test_receive_returns_empty_at_eof():
+    handler = SocketHandler(event_loop=True)
+    ours, theirs = socket.socketpair()
+    handler.multiplexer.register("pair", ours)
+    theirs.sendall(b"tail")
+    theirs.close()
+    assert handler.receive("pair", timeout=5) == b"tail"
+    assert handler.receive("pair", timeout=5) == b""
+    handler.close_all()
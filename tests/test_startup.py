@@ -0,0 +1,58 @@
+"""Startup budget for nen.py, measured with ``python -X importtime``.
+
+Each command's help runs in a fresh interpreter. The import time of the
+top-level modules is summed and the best of a few runs must stay within
+the budget (NETENGINE_STARTUP_BUDGET_MS, default 150 ms). Commands must
+also not import modules that only other commands need.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Set, Tuple
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = float(os.environ.get("NETENGINE_STARTUP_BUDGET_MS", "150"))
+RUNS = 3
+
+# command line -> modules it is not expected to import
+COMMANDS = {
+    ("icmp-ping", "-h"): ["asyncio", "ssl", "http.client", "concurrent.futures", "netengine.networking.tcp_udp"],
+    ("tcp-scan", "-h"): ["ssl", "http.client", "netengine.web", "netengine.networking.icmp"],
+    ("http-get", "-h"): ["asyncio", "netengine.networking.tcp_udp", "netengine.networking.icmp"],
+    ("--help",): [],
+}
+
+
+def measure(argv: Tuple[str, ...]) -> Tuple[float, Set[str]]:
+    """Total top-level import time in ms, and every module imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(ROOT, "nen.py"), *argv],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    total = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+@pytest.mark.parametrize("argv", list(COMMANDS), ids=" ".join)
+def test_startup_budget(argv):
+    runs = [measure(argv) for _ in range(RUNS)]
+    best = min(total for total, _ in runs)
+    loaded = set().union(*(modules for _, modules in runs))
+    assert [name for name in COMMANDS[argv] if name in loaded] == []
+    assert best <= BUDGET_MS, f"{' '.join(argv)} imports took {best:.1f} ms (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,68 @@
+"""BatchStatusChecker against a local HTTP server."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from netengine.web import BatchStatusChecker
+
+DELAY = 0.2
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(delay):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    httpd.daemon_threads = True
+    httpd.delay = delay
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    yield from serve(DELAY)
+
+
+@pytest.fixture
+def fast_server():
+    yield from serve(0)
+
+
+def test_urls_queued_behind_busy_host_are_not_errors(server):
+    # 20 requests over 2 connections take ~10 * DELAY, far past the timeout,
+    # but each request on its own finishes well within it.
+    checker = BatchStatusChecker(workers=20, per_host=2, timeout=DELAY * 4)
+    results = list(checker.check(f"{server}/{n}" for n in range(20)))
+    assert len(results) == 20
+    assert [r.status_line for r in results if not r.ok] == []
+    assert {r.status for r in results} == {200}
+
+
+def test_busy_host_does_not_hold_up_other_hosts(server, fast_server):
+    # Every worker could be taken by the slow host; its extra URLs have to
+    # wait without a worker so the fast host's URL is checked straight away.
+    checker = BatchStatusChecker(workers=4, per_host=1, timeout=DELAY * 20)
+    urls = [f"{server}/{n}" for n in range(8)] + [f"{fast_server}/"]
+    start = time.monotonic()
+    results = checker.check(urls)
+    first = next(results)
+    assert first.url == f"{fast_server}/"
+    assert time.monotonic() - start < DELAY
+    assert len(list(results)) == 8
@@ -0,0 +1,119 @@
+"""SubdomainEnumerator and DNSResolver against a local UDP name server."""
+
+import socket
+import struct
+import threading
+
+import pytest
+
+from netengine.networking import DNSResolver, SubdomainEnumerator
+from netengine.networking.dns import _parse_nameserver
+
+ZONE = "example.test"
+RECORDS = {f"www.{ZONE}": "10.0.0.1", f"mail.{ZONE}": "10.0.0.2"}
+
+
+def answer(query: bytes) -> bytes:
+    """A reply for an A query: the address in RECORDS, or NXDOMAIN."""
+    (qid,) = struct.unpack_from("!H", query)
+    offset, labels = 12, []
+    while query[offset]:
+        length = query[offset]
+        labels.append(query[offset + 1 : offset + 1 + length].decode())
+        offset += 1 + length
+    question = query[12 : offset + 5]
+    address = RECORDS.get(".".join(labels).lower())
+    if address is None:
+        return struct.pack("!HHHHHH", qid, 0x8183, 1, 0, 0, 0) + question
+    record = struct.pack("!HHHLH", 0xC00C, 1, 1, 60, 4) + socket.inet_aton(address)
+    return struct.pack("!HHHHHH", qid, 0x8180, 1, 1, 0, 0) + question + record
+
+
+def serve(family, address):
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    sock.bind((address, 0))
+    sock.settimeout(0.1)
+    stop = threading.Event()
+
+    def reply():
+        while not stop.is_set():
+            try:
+                data, addr = sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            sock.sendto(answer(data), addr)
+
+    thread = threading.Thread(target=reply, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1]
+    stop.set()
+    thread.join()
+    sock.close()
+
+
+@pytest.fixture
+def nameserver():
+    for port in serve(socket.AF_INET, "127.0.0.1"):
+        yield f"127.0.0.1:{port}"
+
+
+@pytest.fixture
+def nameserver6():
+    for port in serve(socket.AF_INET6, "::1"):
+        yield port
+
+
+def test_enumerate_streams_hits_and_closes_the_socket(nameserver):
+    resolver = DNSResolver(nameservers=[nameserver], timeout=0.5, retries=0, use_hosts_file=False)
+    enumerator = SubdomainEnumerator(resolver=resolver)
+    results = list(enumerator.enumerate(ZONE, ["www", "ftp", "mail", "dev"]))
+    assert sorted((r.name, r.addresses) for r in results) == [
+        (f"mail.{ZONE}", ["10.0.0.2"]),
+        (f"www.{ZONE}", ["10.0.0.1"]),
+    ]
+    assert enumerator.stats.resolved == 4
+    assert resolver._transport is None
+
+    # A second run opens a new socket on its own event loop.
+    assert [r.name for r in enumerator.enumerate(ZONE, ["www"])] == [f"www.{ZONE}"]
+
+
+def test_resolve_many(nameserver):
+    resolver = DNSResolver(nameservers=[nameserver], timeout=0.5, retries=0, use_hosts_file=False)
+    answers = {a.name: a.values() for a in resolver.resolve_many([f"www.{ZONE}", f"nope.{ZONE}"])}
+    assert answers == {f"www.{ZONE}": ["10.0.0.1"], f"nope.{ZONE}": []}
+    assert resolver._transport is None
+
+
+@pytest.mark.parametrize(
+    "entry, expected",
+    [
+        ("10.0.0.53", ("10.0.0.53", 53)),
+        ("10.0.0.53:5353", ("10.0.0.53", 5353)),
+        (("10.0.0.53", "5353"), ("10.0.0.53", 5353)),
+        ("::1", ("::1", 53)),
+        ("2001:db8:0::1", ("2001:db8::1", 53)),
+        ("[::1]", ("::1", 53)),
+        ("[::1]:5353", ("::1", 5353)),
+        ("localhost:5353", ("127.0.0.1", 5353)),
+    ],
+)
+def test_parse_nameserver(entry, expected):
+    assert _parse_nameserver(entry) == expected
+
+
+@pytest.mark.parametrize("entry", ["[::1]x", "no-such-host.invalid"])
+def test_parse_nameserver_rejects(entry):
+    with pytest.raises(ValueError):
+        _parse_nameserver(entry)
+
+
+def test_ipv6_and_mapped_ipv4_nameservers(nameserver, nameserver6):
+    resolver = DNSResolver(nameservers=[f"[::1]:{nameserver6}"], timeout=0.5, retries=0, use_hosts_file=False)
+    assert resolver.resolve(f"www.{ZONE}").values() == ["10.0.0.1"]
+
+    # With an IPv6 server in the list the socket is dual-stack, and the
+    # IPv4 server's reply arrives from a mapped address.
+    servers = [nameserver, f"[::1]:{nameserver6}"]
+    resolver = DNSResolver(nameservers=servers, timeout=0.5, retries=0, use_hosts_file=False)
+    assert resolver.resolve(f"mail.{ZONE}").values() == ["10.0.0.2"]
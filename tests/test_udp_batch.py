@@ -0,0 +1,52 @@
+"""UDPEndpoint.probe against a local UDP echo server."""
+
+import socket
+import threading
+
+import pytest
+
+from netengine.networking import UDPEndpoint
+from netengine.networking import udp_batch
+
+
+@pytest.fixture
+def echo():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.1)
+    stop = threading.Event()
+
+    def reply():
+        while not stop.is_set():
+            try:
+                data, addr = sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            sock.sendto(data, addr)
+
+    thread = threading.Thread(target=reply, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1]
+    stop.set()
+    thread.join()
+    sock.close()
+
+
+def test_names_are_resolved_through_a_bounded_cache(echo, monkeypatch):
+    lookups = []
+
+    def gethostbyname(host):
+        lookups.append(host)
+        if host.endswith(".invalid"):
+            raise socket.gaierror("no such host")
+        return "127.0.0.1"
+
+    monkeypatch.setattr(udp_batch.socket, "gethostbyname", gethostbyname)
+    hosts = ["127.0.0.1", "a.test", "a.test", "b.test", "a.test", "gone.invalid", "127.0.0.1"]
+    probes = [((host, echo), f"{n}".encode()) for n, host in enumerate(hosts)]
+    with UDPEndpoint(batch_size=4) as endpoint:
+        endpoint.resolve_cache_size = 1
+        results = list(endpoint.probe(probes, timeout=1.0, key=lambda data: data))
+    # Literals skip the lookup; with room for one name, a.test is looked up again after b.test.
+    assert lookups == ["a.test", "b.test", "a.test", "gone.invalid"]
+    assert sorted(int(r.payload) for r in results) == [0, 1, 2, 3, 4, 6]
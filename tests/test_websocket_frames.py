@@ -0,0 +1,195 @@
+"""WebSocket frame encoding, masking and parsing, and message handling over a socketpair."""
+
+import os
+import random
+import socket
+
+import pytest
+
+from netengine.web import websocket_frames
+from netengine.web.websocket_frames import (
+    OP_BINARY,
+    OP_CLOSE,
+    OP_CONTINUATION,
+    OP_PING,
+    OP_PONG,
+    OP_TEXT,
+    Frame,
+    FrameParser,
+    encode_frame,
+    mask,
+)
+from netengine.web.websocket_handler import WebSocketHandler
+
+
+def reference_mask(payload: bytes, key: bytes) -> bytes:
+    return bytes(byte ^ key[i % 4] for i, byte in enumerate(payload))
+
+
+@pytest.mark.parametrize("length", [0, 1, 3, 4, 5, 125, 2047, 2048, 2049, 4099, 65536])
+def test_mask_matches_reference(length):
+    rng = random.Random(length)
+    payload = rng.randbytes(length)
+    key = rng.randbytes(4)
+    assert mask(payload, key) == reference_mask(payload, key)
+    assert mask(mask(payload, key), key) == payload
+    assert mask(memoryview(payload), key) == reference_mask(payload, key)
+
+
+@pytest.mark.parametrize("length", [2048, 2049, 2050, 2051, 100003])
+def test_numpy_and_pure_python_masking_agree(length, monkeypatch):
+    numpy = pytest.importorskip("numpy")
+    payload = os.urandom(length)
+    key = os.urandom(4)
+    monkeypatch.setattr(websocket_frames, "numpy", numpy)
+    with_numpy = mask(payload, key)
+    monkeypatch.setattr(websocket_frames, "numpy", None)
+    assert with_numpy == mask(payload, key) == reference_mask(payload, key)
+
+
+@pytest.mark.parametrize(
+    "length, header",
+    [(0, 2), (125, 2), (126, 4), (65535, 4), (65536, 10), (70000, 10)],
+    ids=["empty", "7-bit max", "16-bit min", "16-bit max", "64-bit min", "64-bit"],
+)
+@pytest.mark.parametrize("masked", [False, True])
+def test_length_encodings_round_trip(length, header, masked):
+    payload = os.urandom(length)
+    frame = encode_frame(OP_BINARY, payload, masked=masked)
+    assert len(frame) == header + (4 if masked else 0) + length
+    assert frame[1] & 0x80 == (0x80 if masked else 0)
+    assert frame[1] & 0x7F == {2: length, 4: 126, 10: 127}[header]
+
+    # Fed a byte at a time for the header, so every length field is split.
+    parser = FrameParser(expect_masked=masked)
+    frames = []
+    for offset in range(header + 4):
+        frames += parser.feed(frame[offset : offset + 1])
+    frames += parser.feed(frame[header + 4 :])
+    assert frames == [Frame(True, OP_BINARY, payload)]
+    assert parser.buffered == 0
+
+
+def test_burst_of_frames_and_partial_tail():
+    frames = [encode_frame(OP_TEXT, f"message {n}".encode(), masked=False) for n in range(100)]
+    data = b"".join(frames)
+    parser = FrameParser()
+    parsed = parser.feed(data[:-3])
+    assert len(parsed) == 99 and parser.buffered == len(frames[-1]) - 3
+    assert parser.feed(data[-3:]) == [Frame(True, OP_TEXT, b"message 99")]
+
+
+@pytest.mark.parametrize(
+    "frame, error",
+    [
+        (bytes([0x80 | OP_CLOSE, 126]) + (200).to_bytes(2, "big") + b"x" * 200, "control frame too long"),
+        (bytes([OP_CLOSE, 2]) + b"\x03\xe8", "Fragmented WebSocket control frame"),
+        (bytes([0x80 | OP_PING | 0x40, 0]), "reserved bits"),
+        (bytes([0x80 | 0x3, 0]), "Unknown WebSocket opcode"),
+        (bytes([0x80 | OP_TEXT, 0x80 | 1]) + b"keyx", "masking"),
+    ],
+)
+def test_invalid_frames_are_rejected(frame, error):
+    with pytest.raises(ValueError, match=error):
+        FrameParser().feed(frame)
+
+
+def test_oversized_frame_rejected_before_payload_arrives():
+    parser = FrameParser(max_size=1000)
+    with pytest.raises(ValueError, match="exceeds"):
+        parser.feed(encode_frame(OP_BINARY, b"x" * 1001, masked=False)[:10])
+
+
+@pytest.fixture
+def pair():
+    """A WebSocketHandler whose socket's other end plays the server."""
+    ours, theirs = socket.socketpair()
+    handler = WebSocketHandler()
+    handler.socket = ours
+    theirs.settimeout(5)
+    yield handler, theirs
+    ours.close()
+    theirs.close()
+
+
+def server_frames(sock, count):
+    """Read count client frames (which must be masked)."""
+    parser = FrameParser(expect_masked=True)
+    frames = []
+    while len(frames) < count:
+        frames += parser.feed(sock.recv(65536))
+    return frames
+
+
+def test_fragmented_message_with_interleaved_ping(pair):
+    handler, server = pair
+    server.sendall(
+        encode_frame(OP_TEXT, "héllo ".encode()[:2], fin=False, masked=False)
+        + encode_frame(OP_PING, b"are you there", masked=False)
+        + encode_frame(OP_CONTINUATION, "héllo ".encode()[2:], fin=False, masked=False)
+        + encode_frame(OP_CONTINUATION, b"world", masked=False)
+        + encode_frame(OP_BINARY, b"\x00\x01", masked=False)
+    )
+    assert handler.receive(timeout=5) == "héllo world"
+    assert handler.receive(timeout=5) == b"\x00\x01"
+    assert server_frames(server, 1) == [Frame(True, OP_PONG, b"are you there")]
+
+
+def test_send_fragments(pair):
+    handler, server = pair
+    handler.send(b"abcdefghij", fragment_size=4)
+    assert server_frames(server, 3) == [
+        Frame(False, OP_BINARY, b"abcd"),
+        Frame(False, OP_CONTINUATION, b"efgh"),
+        Frame(True, OP_CONTINUATION, b"ij"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "frames, reason",
+    [
+        ([encode_frame(OP_CONTINUATION, b"orphan", masked=False)], "continuation frame without a message"),
+        (
+            [encode_frame(OP_TEXT, b"one", fin=False, masked=False), encode_frame(OP_TEXT, b"two", masked=False)],
+            "new message inside a fragmented one",
+        ),
+    ],
+)
+def test_fragmentation_errors_fail_the_connection(pair, frames, reason):
+    handler, server = pair
+    server.sendall(b"".join(frames))
+    with pytest.raises(ConnectionError, match=reason):
+        handler.receive(timeout=5)
+    assert handler.close_code == 1002
+    (close,) = server_frames(server, 1)
+    assert close.opcode == OP_CLOSE and close.payload[:2] == (1002).to_bytes(2, "big")
+
+
+def test_close_from_server_is_answered(pair):
+    handler, server = pair
+    server.sendall(encode_frame(OP_CLOSE, (1001).to_bytes(2, "big") + "bye ✓".encode(), masked=False))
+    assert list(handler.messages(timeout=5)) == []
+    assert (handler.close_code, handler.close_reason) == (1001, "bye ✓")
+    (close,) = server_frames(server, 1)
+    assert close == Frame(True, OP_CLOSE, (1001).to_bytes(2, "big"))
+
+
+@pytest.mark.parametrize(
+    "payload, code",
+    [
+        (b"\x03", 1002),
+        ((1005).to_bytes(2, "big"), 1002),
+        ((999).to_bytes(2, "big"), 1002),
+        ((2000).to_bytes(2, "big"), 1002),
+        ((1000).to_bytes(2, "big") + b"\xff\xfe", 1007),
+    ],
+    ids=["1-byte", "reserved 1005", "below 1000", "unassigned", "bad utf-8"],
+)
+def test_invalid_close_frames_fail_the_connection(pair, payload, code):
+    handler, server = pair
+    server.sendall(encode_frame(OP_CLOSE, payload, masked=False))
+    with pytest.raises(ConnectionError, match="protocol error"):
+        list(handler.messages(timeout=5))
+    assert handler.close_code == code
+    (close,) = server_frames(server, 1)
+    assert close.payload[:2] == code.to_bytes(2, "big")